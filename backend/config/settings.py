@@ -47,6 +47,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "ordering.api.instrumentation.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -98,6 +99,26 @@ else:
         }
     }
 
+API_CACHE_REDIS_URL = os.getenv("API_CACHE_REDIS_URL", "")
+
+if API_CACHE_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": API_CACHE_REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "menu-calc",
+        }
+    }
+
+API_CACHE_ALIAS = "default"
+API_CACHE_TIMEOUT = get_int_env("API_CACHE_TIMEOUT", 300)
+
 AUTH_PASSWORD_VALIDATORS = []
 
 LANGUAGE_CODE = "en-us"
@@ -113,11 +134,32 @@ REST_FRAMEWORK = {
         "rest_framework.renderers.JSONRenderer",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
-    "DEFAULT_PAGINATION_CLASS": "ordering.api.pagination.DefaultLimitOffsetPagination",
+    "DEFAULT_PAGINATION_CLASS": "ordering.api.pagination.OptionalCursorPagination",
     "PAGE_SIZE": get_int_env("API_DEFAULT_LIMIT", 20),
     "MAX_LIMIT": get_int_env("API_MAX_LIMIT", 100),
 }
 
+ORDER_GENERATION_ENGINE = os.getenv("ORDER_GENERATION_ENGINE", "python").lower()
+ORDER_PRODUCT_BATCH_SIZE = get_int_env("ORDER_PRODUCT_BATCH_SIZE", 500)
+ORDER_DETAIL_MODE = os.getenv("ORDER_DETAIL_MODE", "text").lower()
+ORDER_COMPUTATION_CACHE_SIZE = get_int_env("ORDER_COMPUTATION_CACHE_SIZE", 128)
+ORDER_DOCUMENT_CACHE_TIMEOUT = get_int_env("ORDER_DOCUMENT_CACHE_TIMEOUT", 86400)
+ORDER_JOB_WORKERS = get_int_env("ORDER_JOB_WORKERS", 2)
+ORDER_JOB_STALE_AFTER = get_int_env("ORDER_JOB_STALE_AFTER", 600)
+IDEMPOTENCY_KEY_TTL = get_int_env("IDEMPOTENCY_KEY_TTL", 86400)
+IDEMPOTENCY_LOCK_TIMEOUT = get_int_env("IDEMPOTENCY_LOCK_TIMEOUT", 30)
+ASSET_STORAGE_DIR = os.getenv("ASSET_STORAGE_DIR") or str(BASE_DIR / "media" / "assets")
+CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", str(BASE_DIR / "media" / "catalog.snapshot"))
+
+API_METRICS_ENABLED = get_bool_env("API_METRICS_ENABLED", True)
+API_METRICS_ALLOWED_IPS = get_csv_env("API_METRICS_ALLOWED_IPS", "127.0.0.1,::1")
+API_SERVER_TIMING = get_bool_env("API_SERVER_TIMING", True)
+API_QUERY_BUDGET_DEFAULT = get_int_env("API_QUERY_BUDGET_DEFAULT", 0)
+API_QUERY_BUDGETS = {
+    view.strip(): int(budget)
+    for view, _, budget in (item.partition("=") for item in get_csv_env("API_QUERY_BUDGETS"))
+}
+
 CORS_ALLOW_ALL_ORIGINS = get_bool_env("CORS_ALLOW_ALL_ORIGINS", False)
 CORS_ALLOWED_ORIGINS = get_csv_env("CORS_ALLOWED_ORIGINS", "http://localhost:5173")
 
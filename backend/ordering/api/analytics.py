@@ -0,0 +1,40 @@
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import serializers as drf_serializers
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from ordering.infrastructure.consumption import consumption_rows
+
+from .serializers import ConsumptionQuerySerializer, ConsumptionRowSerializer
+
+
+class AnalyticsViewSet(viewsets.ViewSet):
+    """Consumption totals over the order history, read from the weekly and monthly rollups."""
+
+    @extend_schema(
+        parameters=[ConsumptionQuerySerializer],
+        responses={
+            200: inline_serializer(
+                name="ConsumptionResponse",
+                fields={
+                    "period": drf_serializers.CharField(),
+                    "group_by": drf_serializers.CharField(),
+                    "results": ConsumptionRowSerializer(many=True),
+                },
+            )
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="consumption")
+    def consumption(self, request):
+        serializer = ConsumptionQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        rows = consumption_rows(**query)
+        return Response(
+            {
+                "period": query["period"],
+                "group_by": query["group_by"],
+                "results": ConsumptionRowSerializer(rows, many=True).data,
+            }
+        )
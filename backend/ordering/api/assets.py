@@ -0,0 +1,83 @@
+import re
+
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_safe
+
+from ordering.infrastructure.assets import AssetStore
+from ordering.models import Asset
+
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """Returns the inclusive byte range of a single-range ``Range`` header, or None to serve the whole blob.
+
+    Raises ValueError when the range cannot be satisfied.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+@require_safe
+def asset_view(request, sha256: str):
+    """Serves a stored template image with immutable cache headers and single-range support."""
+    asset = Asset.objects.filter(sha256=sha256).only("content_type", "size").first()
+    if asset is None:
+        raise Http404("Asset not found.")
+
+    etag = f'"{sha256}"'
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return _with_asset_headers(not_modified, etag)
+
+    path = AssetStore().path_for(sha256)
+    if not path.exists():
+        raise Http404("Asset not found.")
+
+    byte_range = None
+    range_header = request.headers.get("Range", "")
+    if range_header and request.headers.get("If-Range", etag) == etag:
+        try:
+            byte_range = _parse_range(range_header, asset.size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{asset.size}"
+            return _with_asset_headers(response, etag)
+
+    blob = path.open("rb")
+    if byte_range is None:
+        response = FileResponse(blob, content_type=asset.content_type)
+        return _with_asset_headers(response, etag)
+
+    start, end = byte_range
+    blob.seek(start)
+    response = HttpResponse(blob.read(end - start + 1), status=206, content_type=asset.content_type)
+    blob.close()
+    response["Content-Range"] = f"bytes {start}-{end}/{asset.size}"
+    return _with_asset_headers(response, etag)
+
+
+def _with_asset_headers(response, etag: str):
+    response["ETag"] = etag
+    response["Cache-Control"] = ASSET_CACHE_CONTROL
+    response["Accept-Ranges"] = "bytes"
+    response["X-Content-Type-Options"] = "nosniff"
+    response["Content-Security-Policy"] = "default-src 'none'; style-src 'unsafe-inline'; sandbox"
+    return response
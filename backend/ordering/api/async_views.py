@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db.models import Prefetch
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework.request import Request
+
+from ordering.application.use_cases import AsyncGenerateOrderUseCase
+from ordering.domain.entities import OrderGenerationInput
+from ordering.domain.services import OrderGenerationService
+from ordering.infrastructure.async_repositories import (
+    AsyncDjangoDayRepository,
+    AsyncDjangoOrderRepository,
+    AsyncDjangoProductQuantityRepository,
+    AsyncProductTotalRepository,
+    in_worker_thread,
+)
+from ordering.infrastructure.computation_cache import order_computation_cache
+from ordering.infrastructure.repositories import PRODUCT_TOTAL_READERS
+from ordering.infrastructure.versions import catalog_version
+from ordering.models import Order, OrderProduct
+
+from .pagination import DefaultLimitOffsetPagination
+from .serializers import GenerateOrderSerializer, OrderSerializer
+from .views import DayViewSet, OrderViewSet, ProductViewSet, RecipeViewSet
+
+
+ASYNC_LIST_VIEWSETS = {
+    "products": ProductViewSet,
+    "recipes": RecipeViewSet,
+    "days": DayViewSet,
+    "orders": OrderViewSet,
+}
+
+
+def build_async_generate_use_case(engine: str) -> AsyncGenerateOrderUseCase:
+    total_reader_class = PRODUCT_TOTAL_READERS.get(engine)
+    return AsyncGenerateOrderUseCase(
+        quantity_reader=AsyncDjangoProductQuantityRepository(),
+        order_writer=AsyncDjangoOrderRepository(),
+        day_repository=AsyncDjangoDayRepository(),
+        service=OrderGenerationService(detail_mode=settings.ORDER_DETAIL_MODE),
+        total_reader=AsyncProductTotalRepository(total_reader_class()) if total_reader_class else None,
+        computation_cache=order_computation_cache,
+        catalog_version=sync_to_async(catalog_version),
+        engine=engine,
+    )
+
+
+@csrf_exempt
+@require_POST
+async def generate_order(request):
+    """Async counterpart of ``POST /api/orders/generate/``, with the same payload and responses."""
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"detail": "Invalid JSON body."}, status=400)
+
+    serializer = GenerateOrderSerializer(data=data)
+    if not await sync_to_async(serializer.is_valid)():
+        return JsonResponse(serializer.errors, status=400)
+
+    validated_data = dict(serializer.validated_data)
+    use_case = build_async_generate_use_case(validated_data.pop("engine"))
+    try:
+        order_id = await use_case.execute(OrderGenerationInput(**validated_data))
+    except ValueError as exc:
+        return JsonResponse({"detail": str(exc)}, status=400)
+    return JsonResponse({"order_id": order_id}, status=201)
+
+
+@require_GET
+async def order_detail(request, pk: int):
+    lines = OrderProduct.objects.defer("detail", "breakdown")
+    queryset = Order.objects.select_related("template").prefetch_related(Prefetch("products", queryset=lines))
+    try:
+        order = await queryset.aget(pk=pk)
+    except Order.DoesNotExist:
+        return JsonResponse({"detail": "No Order matches the given query."}, status=404)
+    return JsonResponse(OrderSerializer(order).data)
+
+
+@require_GET
+async def resource_list(request, resource: str):
+    """Async counterpart of the list endpoints, with the same ``?fields=``/``?expand=``/``?search=`` handling.
+
+    The total count runs in a worker thread while the page is read through the
+    async ORM, so the two queries overlap and the event loop stays free.
+    Responses are not served from the versioned response cache.
+    """
+    drf_request = Request(request)
+    view = ASYNC_LIST_VIEWSETS[resource](request=drf_request, args=(), kwargs={}, action="list", format_kwarg=None)
+    queryset = view.filter_queryset(view.get_queryset())
+
+    paginator = DefaultLimitOffsetPagination()
+    paginator.request = drf_request
+    paginator.limit = paginator.get_limit(drf_request)
+    paginator.offset = paginator.get_offset(drf_request)
+    page = queryset[paginator.offset:paginator.offset + paginator.limit]
+    paginator.count, rows = await asyncio.gather(in_worker_thread(queryset.count), _fetch(page))
+
+    data = view.get_serializer(rows, many=True).data
+    return JsonResponse(paginator.get_paginated_response(data).data)
+
+
+async def _fetch(queryset) -> list:
+    return [instance async for instance in queryset]
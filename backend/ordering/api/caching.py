@@ -0,0 +1,84 @@
+import hashlib
+from collections.abc import Iterable, Iterator
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from ordering.infrastructure.versions import get_versions
+
+
+class VersionedCacheMixin:
+    """ETags, ``Last-Modified`` and a response cache for read endpoints.
+
+    The validators are derived from the versions of ``cache_resources``, which
+    are bumped on every write and m2m change, so a matching ``If-None-Match``
+    gets a 304 before any queryset or serializer runs. Serialized bodies are
+    stored under the same key in the ``API_CACHE_ALIAS`` cache; a write changes
+    the key, so stale entries are never read and simply expire.
+    """
+
+    cache_resources: tuple[str, ...] = ()
+
+    def list(self, request, *args, **kwargs):
+        return self._versioned_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._versioned_response(request, super().retrieve, *args, **kwargs)
+
+    def _versioned_response(self, request, handler, *args, **kwargs):
+        versions = get_versions(self.cache_resources)
+        fingerprint = "|".join(
+            [request.build_absolute_uri(), *(f"{resource}:{version}" for resource, (version, _) in sorted(versions.items()))]
+        )
+        digest = hashlib.sha256(fingerprint.encode()).hexdigest()[:32]
+        etag = f'"{digest}"'
+        modified = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+        last_modified = int(max(modified).timestamp()) if modified else None
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return self._with_validators(not_modified, etag, last_modified)
+
+        cache = caches[settings.API_CACHE_ALIAS]
+        cache_key = f"api-response:{digest}"
+        data = cache.get(cache_key)
+        if data is not None:
+            return self._with_validators(Response(data), etag, last_modified)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code != 200:
+            return response
+        cache.set(cache_key, response.data, settings.API_CACHE_TIMEOUT)
+        return self._with_validators(response, etag, last_modified)
+
+    @staticmethod
+    def _with_validators(response, etag: str, last_modified: int | None):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = "no-cache"
+        return response
+
+
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def stream_and_cache(chunks: Iterable[str], cache_key: str, timeout: int) -> Iterator[str]:
+    """Yields ``chunks`` in buffers of about 64 KB and caches the whole body once it is complete."""
+    parts: list[str] = []
+    buffer: list[str] = []
+    buffered = 0
+    for chunk in chunks:
+        parts.append(chunk)
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= STREAM_BUFFER_SIZE:
+            yield "".join(buffer)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield "".join(buffer)
+    caches[settings.API_CACHE_ALIAS].set(cache_key, "".join(parts), timeout)
@@ -0,0 +1,91 @@
+import csv
+import io
+from dataclasses import asdict
+
+from django.http import StreamingHttpResponse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, inline_serializer
+from rest_framework import serializers as drf_serializers
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from ordering.infrastructure.catalog_transfer import (
+    FILE_FORMATS,
+    CatalogImporter,
+    export_rows,
+    read_rows,
+    write_rows,
+)
+
+
+TRANSFER_RESOURCES = {
+    "products": "product",
+    "product-quantities": "product_quantity",
+    "recipes": "recipe",
+    "days": "day",
+}
+CONTENT_TYPES = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson; charset=utf-8"}
+FILE_FORMAT_PARAMETER = OpenApiParameter("file_format", str, enum=list(FILE_FORMATS), description="csv (default) or jsonl.")
+
+
+class CatalogTransferViewSet(viewsets.ViewSet):
+    """Bulk import and streaming export of products, product quantities, recipes and days."""
+
+    lookup_field = "resource"
+    lookup_value_regex = "|".join(TRANSFER_RESOURCES)
+
+    @extend_schema(parameters=[FILE_FORMAT_PARAMETER], responses={(200, "text/csv"): OpenApiTypes.STR})
+    @action(detail=True, methods=["get"], url_path="export")
+    def export(self, request, resource=None):
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in FILE_FORMATS:
+            return Response({"detail": f"Invalid file_format '{file_format}'."}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(
+            write_rows(export_rows(TRANSFER_RESOURCES[resource]), TRANSFER_RESOURCES[resource], file_format),
+            content_type=CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{resource}.{file_format}"'
+        return response
+
+    @extend_schema(
+        parameters=[
+            FILE_FORMAT_PARAMETER,
+            OpenApiParameter("dry_run", bool, description="Validate the rows without saving them."),
+        ],
+        request={"text/csv": OpenApiTypes.BINARY, "application/x-ndjson": OpenApiTypes.BINARY},
+        responses=inline_serializer(
+            name="CatalogImportReport",
+            fields={
+                "resource": drf_serializers.CharField(),
+                "dry_run": drf_serializers.BooleanField(),
+                "created": drf_serializers.IntegerField(),
+                "updated": drf_serializers.IntegerField(),
+                "errors": inline_serializer(
+                    name="CatalogImportRowError",
+                    fields={"row": drf_serializers.IntegerField(), "message": drf_serializers.CharField()},
+                    many=True,
+                ),
+            },
+        ),
+    )
+    @action(detail=True, methods=["post"], url_path="import")
+    def import_rows(self, request, resource=None):
+        default_format = "jsonl" if "json" in (request.content_type or "") else "csv"
+        file_format = request.query_params.get("file_format", default_format)
+        if file_format not in FILE_FORMATS:
+            return Response({"detail": f"Invalid file_format '{file_format}'."}, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = request.query_params.get("dry_run", "").lower() in {"1", "true", "yes"}
+
+        try:
+            report = CatalogImporter(TRANSFER_RESOURCES[resource]).run(
+                read_rows(request.stream or io.BytesIO(), file_format), dry_run=dry_run
+            )
+        except (csv.Error, UnicodeDecodeError) as exc:
+            return Response({"detail": f"Could not read the file: {exc}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {**asdict(report), "errors": [asdict(error) for error in report.errors]},
+            status=status.HTTP_200_OK if report.ok else status.HTTP_400_BAD_REQUEST,
+        )
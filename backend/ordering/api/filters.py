@@ -0,0 +1,33 @@
+from rest_framework.filters import BaseFilterBackend
+
+from ordering.infrastructure.search import SearchIndex
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """``?search=`` backed by the full-text index of ``view.search_resource``.
+
+    Matching objects get a ``search_rank`` and are ordered by it, best first.
+    """
+
+    search_param = "search"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+
+        queryset = SearchIndex().filter_queryset(queryset, view.search_resource, query)
+        if "search_rank" not in queryset.query.annotations:
+            return queryset
+        return queryset.order_by("-search_rank", *queryset.query.order_by)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search; every word is matched as an accent-insensitive prefix.",
+                "schema": {"type": "string"},
+            }
+        ]
@@ -0,0 +1,82 @@
+from functools import wraps
+
+from django.db import transaction
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import status
+from rest_framework.response import Response
+
+from ordering.infrastructure.idempotency import (
+    IdempotencyConflict,
+    IdempotencyInProgress,
+    StoredResponse,
+    idempotency_store,
+    request_fingerprint,
+)
+
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+REPLAYED_RESPONSE_HEADERS = ("Location",)
+MAX_KEY_LENGTH = 255
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    IDEMPOTENCY_HEADER,
+    str,
+    OpenApiParameter.HEADER,
+    description="Repeats with the same key and body within the TTL get the stored response instead of running again.",
+)
+
+
+def idempotent(view_method):
+    """Makes a POST action honor the ``Idempotency-Key`` header.
+
+    The action and the storing of its response run in one transaction, so a
+    response is stored exactly when its writes are committed. Server errors
+    and errors raised as exceptions, such as serializer validation errors, are
+    not stored; they release the key so a retry runs again.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return view_method(self, request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"{IDEMPOTENCY_HEADER} must be at most {MAX_KEY_LENGTH} characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        scope = f"{request.method} {request.path}"
+        try:
+            stored = idempotency_store.begin(key, scope, request_fingerprint(request.method, request.path, request.data))
+        except IdempotencyConflict as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+        except IdempotencyInProgress as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_409_CONFLICT)
+        if stored is not None:
+            return _replay(stored)
+
+        response = None
+        try:
+            with transaction.atomic():
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code < 500:
+                    idempotency_store.complete(key, scope, _to_stored(response))
+        finally:
+            if response is None or response.status_code >= 500:
+                idempotency_store.release(key, scope)
+        return response
+
+    return wrapper
+
+
+def _to_stored(response: Response) -> StoredResponse:
+    headers = {name: response[name] for name in REPLAYED_RESPONSE_HEADERS if response.has_header(name)}
+    return StoredResponse(response.status_code, response.data, headers)
+
+
+def _replay(stored: StoredResponse) -> Response:
+    response = Response(stored.data, status=stored.status_code, headers=stored.headers)
+    response[REPLAYED_HEADER] = "true"
+    return response
@@ -0,0 +1,106 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseForbidden
+
+from ordering.infrastructure.metrics import (
+    end_request_metrics,
+    install_query_counter,
+    metrics_registry,
+    start_request_metrics,
+)
+
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class RequestMetricsMiddleware:
+    """Records query count, DB time and stage timings of every request.
+
+    The numbers are added to the response as a ``Server-Timing`` header,
+    aggregated per view for ``GET /metrics/`` and checked against the query
+    budget of the view (``API_QUERY_BUDGETS``, falling back to
+    ``API_QUERY_BUDGET_DEFAULT``; 0 disables the check). The middleware runs
+    in async mode under ASGI, so it does not force async views into a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.API_METRICS_ENABLED:
+            return self.get_response(request)
+
+        for connection in connections.all():
+            install_query_counter(connection)
+        metrics, token = start_request_metrics()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            end_request_metrics(token)
+        return self._finish(request, response, metrics, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        if not settings.API_METRICS_ENABLED:
+            return await self.get_response(request)
+
+        metrics, token = start_request_metrics()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            end_request_metrics(token)
+        return self._finish(request, response, metrics, time.perf_counter() - started)
+
+    @staticmethod
+    def _finish(request, response, metrics, seconds: float):
+        match = request.resolver_match
+        view = match.view_name if match is not None else "unmatched"
+        budget = settings.API_QUERY_BUDGETS.get(view, settings.API_QUERY_BUDGET_DEFAULT)
+        budget_exceeded = bool(budget) and metrics.queries > budget
+        if budget_exceeded:
+            logger.warning(
+                "Query budget exceeded for %s %s (%s): %d queries, budget %d",
+                request.method,
+                request.path,
+                view,
+                metrics.queries,
+                budget,
+            )
+        metrics_registry.observe(view, request.method, response.status_code, seconds, metrics, budget_exceeded)
+
+        if settings.API_SERVER_TIMING:
+            entries = [
+                f"total;dur={seconds * 1000:.1f}",
+                f'db;dur={metrics.db_seconds * 1000:.1f};desc="{metrics.queries} queries"',
+                *(f"{stage};dur={stage_seconds * 1000:.1f}" for stage, stage_seconds in metrics.stages.items()),
+            ]
+            response["Server-Timing"] = ", ".join(entries)
+        return response
+
+
+@receiver(connection_created)
+def count_queries_on_new_connection(sender, connection, **kwargs):
+    """Covers connections opened outside the request thread, e.g. by ``sync_to_async`` under ASGI."""
+    install_query_counter(connection)
+
+
+def metrics_view(request):
+    if request.META.get("REMOTE_ADDR") not in settings.API_METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+    return HttpResponse(metrics_registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,7 +1,133 @@
 from django.conf import settings
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.utils.urls import replace_query_param
 
 
 class DefaultLimitOffsetPagination(LimitOffsetPagination):
     default_limit = settings.REST_FRAMEWORK.get("PAGE_SIZE", 20)
     max_limit = settings.REST_FRAMEWORK.get("MAX_LIMIT", 100)
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.count_query_param, "").lower() not in {"false", "0", "no"}:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+
+        self.offset = self.get_offset(request)
+        self.count = None
+        rows = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(rows) > self.limit
+        return rows[:self.limit]
+
+    def get_next_link(self):
+        if self.count is not None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(url, self.offset_query_param, self.offset + self.limit)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"]["nullable"] = True
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to false to skip the total count.",
+                "schema": {"type": "boolean"},
+            },
+        ]
+
+
+class KeysetCursorPagination(CursorPagination):
+    """Keyset pagination on ``id`` or another field the view lists in ``cursor_ordering_fields``.
+
+    Pages are read with ``WHERE field < position`` instead of ``OFFSET``, so deep
+    pages cost the same as the first one and no total count is run.
+    """
+
+    ordering = "-id"
+    page_size = settings.REST_FRAMEWORK.get("PAGE_SIZE", 20)
+    page_size_query_param = "limit"
+    max_page_size = settings.REST_FRAMEWORK.get("MAX_LIMIT", 100)
+    ordering_query_param = "ordering"
+
+    def get_ordering(self, request, queryset, view):
+        requested = request.query_params.get(self.ordering_query_param, self.ordering)
+        field = requested.lstrip("-")
+        allowed = getattr(view, "cursor_ordering_fields", ("id",))
+        model_fields = {model_field.name for model_field in queryset.model._meta.concrete_fields}
+        if field not in allowed or field not in model_fields:
+            return (self.ordering,)
+        if field == "id":
+            return (requested,)
+        return (requested, "-id" if requested.startswith("-") else "id")
+
+
+class OptionalCursorPagination(DefaultLimitOffsetPagination):
+    """Limit/offset pagination that switches to keyset pagination on request.
+
+    Send ``?pagination=cursor`` (and then follow the ``next`` links, which
+    carry ``?cursor=``) to page large lists without ``COUNT(*)`` or ``OFFSET``.
+    """
+
+    mode_query_param = "pagination"
+
+    def __init__(self) -> None:
+        self._cursor_paginator: KeysetCursorPagination | None = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if request.query_params.get(self.mode_query_param) == "cursor" or "cursor" in request.query_params:
+            self._cursor_paginator = KeysetCursorPagination()
+            return self._cursor_paginator.paginate_queryset(queryset, request, view)
+
+        self._cursor_paginator = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self._cursor_paginator is not None:
+            return self._cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["required"] = ["results"]
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *super().get_schema_operation_parameters(view),
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to cursor to use keyset pagination.",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            },
+            {
+                "name": "cursor",
+                "required": False,
+                "in": "query",
+                "description": "Cursor returned in the next/previous links of a cursor page.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": KeysetCursorPagination.ordering_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor ordering field, optionally prefixed with '-'.",
+                "schema": {"type": "string"},
+            },
+        ]
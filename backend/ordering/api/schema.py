@@ -0,0 +1,41 @@
+from drf_spectacular.extensions import OpenApiSerializerExtension
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+
+
+def field_selection_parameters(*expandable: str) -> list[OpenApiParameter]:
+    """``?fields=``/``?expand=`` query parameters for a catalog read endpoint."""
+    return [
+        OpenApiParameter(
+            "fields",
+            str,
+            description="Comma-separated top-level fields to render. All fields are rendered when omitted.",
+        ),
+        OpenApiParameter(
+            "expand",
+            str,
+            description=f"Comma-separated nested fields to render, left out by default: {', '.join(expandable)}.",
+        ),
+    ]
+
+
+def field_selection_views(*expandable: str) -> dict:
+    """``extend_schema_view`` arguments adding the field selection parameters to ``list`` and ``retrieve``."""
+    parameters = field_selection_parameters(*expandable)
+    return {"list": extend_schema(parameters=parameters), "retrieve": extend_schema(parameters=parameters)}
+
+
+class DynamicFieldsSerializerExtension(OpenApiSerializerExtension):
+    """Documents ``Meta.expandable_fields`` as optional, since they are only rendered with ``?expand=``."""
+
+    target_class = "ordering.api.serializers.DynamicFieldsMixin"
+    match_subclasses = True
+
+    def map_serializer(self, auto_schema, direction):
+        schema = auto_schema._map_serializer(self.target, direction, bypass_extensions=True)
+        expandable = set(getattr(self.target.Meta, "expandable_fields", ()))
+        required = [name for name in schema.get("required", []) if name not in expandable]
+        if required:
+            schema["required"] = required
+        else:
+            schema.pop("required", None)
+        return schema
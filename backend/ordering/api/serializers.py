@@ -1,15 +1,103 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 
-from ordering.models import AgeGroup, Day, Order, OrderProduct, Product, ProductQuantity, Recipe, Template
+from ordering.domain.calendar import cycle_day_ids
+from ordering.domain.services import OrderGenerationService
+from ordering.infrastructure.assets import absolute_asset_urls
+from ordering.infrastructure.consumption import GROUPINGS
+from ordering.infrastructure.order_export import EXPORT_FORMATS
+from ordering.infrastructure.metrics import record_stage
+from ordering.infrastructure.repositories import PRODUCT_TOTAL_READERS, DjangoMenuCycleRepository
+from ordering.models import (
+    AgeGroup,
+    ConsumptionRollup,
+    Day,
+    Holiday,
+    MenuCycle,
+    MenuCycleSlot,
+    Order,
+    OrderJob,
+    OrderProduct,
+    Product,
+    ProductQuantity,
+    Recipe,
+    Template,
+)
 
 
-class AgeGroupSerializer(serializers.ModelSerializer):
+MAX_CYCLE_LENGTH = 366
+MAX_RANGE_DAYS = 731
+
+
+def parse_field_selection(query_params) -> tuple[set[str] | None, set[str]]:
+    """Returns the ``?fields=`` names (``None`` when absent) and the ``?expand=`` paths.
+
+    Expanding ``a.b`` also expands ``a``.
+    """
+    raw_fields = query_params.get("fields")
+    requested = {name.strip() for name in raw_fields.split(",") if name.strip()} if raw_fields else None
+
+    expand: set[str] = set()
+    for path in query_params.get("expand", "").split(","):
+        parts = [part.strip() for part in path.split(".") if part.strip()]
+        expand.update(".".join(parts[:depth]) for depth in range(1, len(parts) + 1))
+    return requested, expand
+
+
+class TimedSerializationMixin:
+    """Charges ``to_representation`` to the ``serialize`` stage of the request metrics."""
+
+    def to_representation(self, instance):
+        with record_stage("serialize"):
+            return super().to_representation(instance)
+
+
+class DynamicFieldsMixin:
+    """Sparse fieldsets for nested catalog serializers.
+
+    Fields listed in ``Meta.expandable_fields`` are left out unless requested
+    with ``?expand=`` (dotted paths reach nested serializers), and ``?fields=``
+    limits the top-level fields. Writes, serializers used without a request
+    and schema generation render every field.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is None or request.method not in SAFE_METHODS:
+            return fields
+        if getattr(self.context.get("view"), "swagger_fake_view", False):
+            return fields
+
+        requested, expand = parse_field_selection(request.query_params)
+        path = self._field_path()
+        prefix = f"{path}." if path else ""
+        for name in getattr(self.Meta, "expandable_fields", ()):
+            if f"{prefix}{name}" not in expand:
+                fields.pop(name, None)
+        if requested is not None and not path:
+            fields = {name: field for name, field in fields.items() if name in requested}
+        return fields
+
+    def _field_path(self) -> str:
+        names = []
+        node = self
+        while node.parent is not None:
+            if node.field_name:
+                names.append(node.field_name)
+            node = node.parent
+        return ".".join(reversed(names))
+
+
+class AgeGroupSerializer(TimedSerializationMixin, serializers.ModelSerializer):
     class Meta:
         model = AgeGroup
         fields = ["id", "name", "quantity"]
 
 
-class ProductQuantitySerializer(serializers.ModelSerializer):
+class ProductQuantitySerializer(TimedSerializationMixin, DynamicFieldsMixin, serializers.ModelSerializer):
     product_name = serializers.CharField(source="product.name", read_only=True)
     age_groups = serializers.PrimaryKeyRelatedField(queryset=AgeGroup.objects.all(), many=True)
     age_group_profiles = AgeGroupSerializer(source="age_groups", many=True, read_only=True)
@@ -26,14 +114,17 @@ class ProductQuantitySerializer(serializers.ModelSerializer):
             "quantity",
             "package_type",
         ]
+        expandable_fields = ["age_group_profiles"]
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class ProductSerializer(TimedSerializationMixin, DynamicFieldsMixin, serializers.ModelSerializer):
     quantities = ProductQuantitySerializer(many=True, read_only=True)
+    search_rank = serializers.FloatField(read_only=True)
 
     class Meta:
         model = Product
-        fields = ["id", "name", "category", "quantities"]
+        fields = ["id", "name", "category", "quantities", "search_rank"]
+        expandable_fields = ["quantities"]
 
 
 class ProductSummarySerializer(serializers.ModelSerializer):
@@ -42,52 +133,218 @@ class ProductSummarySerializer(serializers.ModelSerializer):
         fields = ["id", "name", "category"]
 
 
-class RecipeSerializer(serializers.ModelSerializer):
+class RecipeSerializer(TimedSerializationMixin, DynamicFieldsMixin, serializers.ModelSerializer):
     products = serializers.PrimaryKeyRelatedField(queryset=Product.objects.all(), many=True)
     product_details = ProductSummarySerializer(source="products", many=True, read_only=True)
+    search_rank = serializers.FloatField(read_only=True)
 
     class Meta:
         model = Recipe
-        fields = ["id", "name", "products", "product_details"]
+        fields = ["id", "name", "products", "product_details", "search_rank"]
+        expandable_fields = ["product_details"]
 
 
-class DaySerializer(serializers.ModelSerializer):
+class DaySerializer(TimedSerializationMixin, DynamicFieldsMixin, serializers.ModelSerializer):
     recipes = serializers.PrimaryKeyRelatedField(queryset=Recipe.objects.all(), many=True)
     recipe_details = RecipeSerializer(source="recipes", many=True, read_only=True)
 
     class Meta:
         model = Day
         fields = ["id", "name", "recipes", "recipe_details"]
+        expandable_fields = ["recipe_details"]
+
+
+class MenuCycleSerializer(serializers.ModelSerializer):
+    day_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1, allow_null=True),
+        allow_empty=False,
+        max_length=MAX_CYCLE_LENGTH,
+        help_text="Day served on each day of the cycle, starting at start_date; null for no menu.",
+    )
+
+    class Meta:
+        model = MenuCycle
+        fields = ["id", "name", "start_date", "day_ids"]
+
+    def to_representation(self, instance):
+        slots = sorted(instance.slots.all(), key=lambda slot: slot.position)
+        return {
+            "id": instance.id,
+            "name": instance.name,
+            "start_date": self.fields["start_date"].to_representation(instance.start_date),
+            "day_ids": [slot.day_id for slot in slots],
+        }
+
+    def validate_day_ids(self, value):
+        requested = {day_id for day_id in value if day_id is not None}
+        missing = requested - set(Day.objects.filter(id__in=requested).values_list("id", flat=True))
+        if missing:
+            raise serializers.ValidationError(f"Days not found: {', '.join(map(str, sorted(missing)))}.")
+        return value
+
+    def create(self, validated_data):
+        day_ids = validated_data.pop("day_ids")
+        with transaction.atomic():
+            cycle = super().create(validated_data)
+            self._set_slots(cycle, day_ids)
+        return cycle
+
+    def update(self, instance, validated_data):
+        day_ids = validated_data.pop("day_ids", None)
+        with transaction.atomic():
+            cycle = super().update(instance, validated_data)
+            if day_ids is not None:
+                cycle.slots.all().delete()
+                self._set_slots(cycle, day_ids)
+        return cycle
+
+    @staticmethod
+    def _set_slots(cycle: MenuCycle, day_ids: list[int | None]) -> None:
+        MenuCycleSlot.objects.bulk_create(
+            [MenuCycleSlot(cycle=cycle, position=position, day_id=day_id) for position, day_id in enumerate(day_ids)]
+        )
+        if hasattr(cycle, "_prefetched_objects_cache"):
+            cycle._prefetched_objects_cache.pop("slots", None)
+
+
+class HolidaySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Holiday
+        fields = ["id", "date", "name"]
 
 
-class OrderProductSerializer(serializers.ModelSerializer):
+class OrderProductSerializer(TimedSerializationMixin, serializers.ModelSerializer):
     class Meta:
         model = OrderProduct
-        fields = ["id", "name", "package_type", "unit_of_measure", "quantity", "total", "qty_package", "detail"]
+        fields = ["id", "name", "package_type", "unit_of_measure", "quantity", "total", "qty_package"]
+
+
+class OrderProductExplainSerializer(OrderProductSerializer):
+    detail = serializers.SerializerMethodField()
+
+    class Meta(OrderProductSerializer.Meta):
+        fields = [*OrderProductSerializer.Meta.fields, "detail"]
+
+    def get_detail(self, obj) -> str:
+        if not obj.breakdown:
+            return obj.detail
+        service = OrderGenerationService()
+        return service.format_detail(
+            service.breakdown_from_primitive(obj.breakdown),
+            obj.quantity,
+            obj.total,
+            obj.package_type,
+            obj.qty_package,
+        )
 
 
-class OrderSerializer(serializers.ModelSerializer):
+class OrderProductPreviewSerializer(TimedSerializationMixin, serializers.Serializer):
+    name = serializers.CharField()
+    package_type = serializers.CharField()
+    unit_of_measure = serializers.CharField()
+    quantity = serializers.DecimalField(max_digits=12, decimal_places=2)
+    total = serializers.IntegerField()
+    qty_package = serializers.IntegerField()
+    detail = serializers.SerializerMethodField()
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self.context.get("include_detail"):
+            fields.pop("detail")
+        return fields
+
+    def get_detail(self, obj) -> str:
+        if not obj.breakdown:
+            return obj.detail
+        return OrderGenerationService().format_detail(
+            obj.breakdown,
+            obj.quantity,
+            obj.total,
+            obj.package_type,
+            obj.qty_package,
+        )
+
+
+class OrderSerializer(TimedSerializationMixin, DynamicFieldsMixin, serializers.ModelSerializer):
     products = OrderProductSerializer(many=True, read_only=True)
     template_title = serializers.SerializerMethodField()
 
     class Meta:
         model = Order
-        fields = ["id", "name", "date", "template", "template_title", "products"]
+        fields = [
+            "id",
+            "name",
+            "date",
+            "template",
+            "template_title",
+            "day_ids",
+            "product_category",
+            "revision",
+            "products",
+        ]
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get("include_detail"):
+            fields["products"] = OrderProductExplainSerializer(many=True, read_only=True)
+        return fields
 
     def get_template_title(self, obj) -> str | None:
         return obj.template.title if obj.template else None
 
 
-class GenerateOrderSerializer(serializers.Serializer):
+class OrderInputSerializer(serializers.Serializer):
+    """Order inputs; the days come either as ``day_ids`` or as a menu cycle over a date range.
+
+    A date range is expanded into the day served on each date, skipping
+    holidays and ``skip_dates``, so ``day_ids`` can list a day many times.
+    """
+
+    CYCLE_FIELDS = ("cycle_id", "start_date", "end_date")
+
     name = serializers.CharField(max_length=120)
     date = serializers.DateField()
     day_ids = serializers.ListField(
         child=serializers.IntegerField(min_value=1),
         allow_empty=False,
+        required=False,
     )
+    cycle_id = serializers.IntegerField(min_value=1, required=False)
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    skip_dates = serializers.ListField(child=serializers.DateField(), required=False)
     product_category = serializers.CharField(max_length=80, required=False, allow_blank=True)
     template_id = serializers.IntegerField(min_value=1, required=False, allow_null=True)
 
+    def validate(self, attrs):
+        cycle_fields = [name for name in [*self.CYCLE_FIELDS, "skip_dates"] if name in attrs]
+        if "day_ids" in attrs:
+            if cycle_fields:
+                raise serializers.ValidationError("Send either day_ids or a cycle with a date range, not both.")
+            return attrs
+        if not all(name in attrs for name in self.CYCLE_FIELDS):
+            raise serializers.ValidationError("Send day_ids, or cycle_id with start_date and end_date.")
+
+        cycle_id, start_date, end_date = (attrs.pop(name) for name in self.CYCLE_FIELDS)
+        skip_dates = set(attrs.pop("skip_dates", []))
+        if (end_date - start_date).days >= MAX_RANGE_DAYS:
+            raise serializers.ValidationError(f"The date range can span at most {MAX_RANGE_DAYS} days.")
+
+        repository = DjangoMenuCycleRepository()
+        cycle = repository.get_cycle(cycle_id)
+        if cycle is None:
+            raise serializers.ValidationError({"cycle_id": "Menu cycle not found."})
+        try:
+            day_ids = cycle_day_ids(
+                cycle, start_date, end_date, skip_dates | repository.holidays_between(start_date, end_date)
+            )
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+        if not day_ids:
+            raise serializers.ValidationError("The menu cycle serves no days in the selected date range.")
+        attrs["day_ids"] = day_ids
+        return attrs
+
     def validate_template_id(self, value):
         if value is None:
             return value
@@ -96,7 +353,158 @@ class GenerateOrderSerializer(serializers.Serializer):
         return value
 
 
-class TemplateSerializer(serializers.ModelSerializer):
+class GenerateOrderSerializer(OrderInputSerializer):
+    engine = serializers.ChoiceField(
+        choices=["python", *PRODUCT_TOTAL_READERS],
+        required=False,
+        default=settings.ORDER_GENERATION_ENGINE,
+    )
+
+
+class OrderJobSerializer(serializers.ModelSerializer):
+    order_id = serializers.IntegerField(read_only=True, allow_null=True)
+
+    class Meta:
+        model = OrderJob
+        fields = [
+            "id",
+            "status",
+            "stage",
+            "stage_timings",
+            "order_id",
+            "error",
+            "attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+
+
+class GenerateOrderBatchSerializer(serializers.Serializer):
+    orders = OrderInputSerializer(many=True, allow_empty=False)
+
+
+class RefreshOrdersSerializer(serializers.Serializer):
+    order_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000)
+
+
+class OrderRefreshResultSerializer(serializers.Serializer):
+    order_id = serializers.IntegerField()
+    created = serializers.IntegerField()
+    updated = serializers.IntegerField()
+    deleted = serializers.IntegerField()
+    unchanged = serializers.IntegerField()
+    error = serializers.CharField(allow_null=True)
+
+
+class IdListField(serializers.CharField):
+    """Comma-separated ids in a query parameter, e.g. ``?products=1,2``."""
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        try:
+            ids = [int(item) for item in value.split(",") if item.strip()]
+        except ValueError:
+            raise serializers.ValidationError("Enter comma-separated ids.")
+        if any(item < 1 for item in ids):
+            raise serializers.ValidationError("Ids must be positive.")
+        return ids
+
+
+class AffectedOrdersQuerySerializer(serializers.Serializer):
+    products = IdListField(required=False)
+    product_quantities = IdListField(required=False)
+    age_groups = IdListField(required=False)
+    recipes = IdListField(required=False)
+    days = IdListField(required=False)
+
+    def validate(self, attrs):
+        if not any(attrs.values()):
+            raise serializers.ValidationError(f"Pass at least one of: {', '.join(self.fields)}.")
+        return attrs
+
+
+class OrderExportFormatSerializer(serializers.Serializer):
+    file_format = serializers.ChoiceField(choices=EXPORT_FORMATS, default="csv")
+
+
+class OrderExportQuerySerializer(OrderExportFormatSerializer):
+    ids = IdListField(required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if not any(attrs.get(name) for name in ("ids", "start", "end")):
+            raise serializers.ValidationError("Pass ids, a start and/or end date, or both.")
+        if attrs.get("start") and attrs.get("end") and attrs["end"] < attrs["start"]:
+            raise serializers.ValidationError("end must not be before start.")
+        return attrs
+
+
+class ConsumptionQuerySerializer(serializers.Serializer):
+    period = serializers.ChoiceField(choices=ConsumptionRollup.PERIOD_CHOICES, default=ConsumptionRollup.MONTH)
+    start = serializers.DateField()
+    end = serializers.DateField()
+    group_by = serializers.ChoiceField(choices=GROUPINGS, default="product")
+    category = serializers.CharField(max_length=80, required=False)
+    name = serializers.CharField(max_length=120, required=False)
+    unit_of_measure = serializers.CharField(max_length=20, required=False)
+
+    def validate(self, attrs):
+        if attrs["end"] < attrs["start"]:
+            raise serializers.ValidationError("end must not be before start.")
+        return attrs
+
+
+class ConsumptionRowSerializer(serializers.Serializer):
+    period_start = serializers.DateField()
+    name = serializers.CharField(required=False)
+    package_type = serializers.CharField(required=False)
+    category = serializers.CharField(required=False)
+    unit_of_measure = serializers.CharField()
+    quantity = serializers.DecimalField(max_digits=18, decimal_places=2)
+    total = serializers.IntegerField()
+    qty_package = serializers.IntegerField()
+    lines = serializers.IntegerField()
+
+
+class MembershipChangeSerializer(serializers.Serializer):
+    add = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, default=list)
+    remove = serializers.ListField(child=serializers.IntegerField(min_value=1), required=False, default=list)
+
+    def validate(self, attrs):
+        both = set(attrs["add"]) & set(attrs["remove"])
+        if both:
+            raise serializers.ValidationError(
+                f"Ids cannot be added and removed at once: {', '.join(map(str, sorted(both)))}."
+            )
+        return attrs
+
+
+class BulkMembershipItemSerializer(MembershipChangeSerializer):
+    id = serializers.IntegerField(min_value=1)
+
+
+class BulkMembershipChangeSerializer(serializers.Serializer):
+    changes = BulkMembershipItemSerializer(many=True, allow_empty=False)
+
+    def validate_changes(self, value):
+        ids = [item["id"] for item in value]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each id can appear only once.")
+        return value
+
+
+class TemplateSerializer(TimedSerializationMixin, serializers.ModelSerializer):
+    search_rank = serializers.FloatField(read_only=True)
+
     class Meta:
         model = Template
-        fields = ["id", "title", "content"]
+        fields = ["id", "title", "content", "search_rank"]
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        request = self.context.get("request")
+        if request is not None and "content" in data:
+            data["content"] = absolute_asset_urls(data["content"], request.build_absolute_uri("/"))
+        return data
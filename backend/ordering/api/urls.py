@@ -1,8 +1,15 @@
+from django.urls import path, re_path
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
+from .analytics import AnalyticsViewSet
+from .assets import asset_view
+from .catalog_transfer import CatalogTransferViewSet
 from .views import (
     AgeGroupViewSet,
     DayViewSet,
+    HolidayViewSet,
+    MenuCycleViewSet,
     OrderViewSet,
     ProductQuantityViewSet,
     ProductViewSet,
@@ -17,7 +24,21 @@ router.register("age-groups", AgeGroupViewSet, basename="age-group")
 router.register("product-quantities", ProductQuantityViewSet, basename="product-quantity")
 router.register("recipes", RecipeViewSet, basename="recipe")
 router.register("days", DayViewSet, basename="day")
+router.register("menu-cycles", MenuCycleViewSet, basename="menu-cycle")
+router.register("holidays", HolidayViewSet, basename="holiday")
 router.register("orders", OrderViewSet, basename="order")
 router.register("templates", TemplateViewSet, basename="template")
+router.register("catalog", CatalogTransferViewSet, basename="catalog")
+router.register("analytics", AnalyticsViewSet, basename="analytics")
 
-urlpatterns = router.urls
+urlpatterns = [
+    *router.urls,
+    re_path(r"^assets/(?P<sha256>[0-9a-f]{64})/$", asset_view, name="asset"),
+    path("async/orders/generate/", async_views.generate_order, name="async-order-generate"),
+    path("async/orders/<int:pk>/", async_views.order_detail, name="async-order-detail"),
+    re_path(
+        rf"^async/(?P<resource>{'|'.join(async_views.ASYNC_LIST_VIEWSETS)})/$",
+        async_views.resource_list,
+        name="async-list",
+    ),
+]
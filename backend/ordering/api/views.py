@@ -1,68 +1,349 @@
+import hashlib
+import re
+from dataclasses import asdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Prefetch
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.text import compress_sequence
 from rest_framework import filters, mixins, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
-from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework.reverse import reverse
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view, inline_serializer
 from rest_framework import serializers as drf_serializers
 
-from ordering.application.use_cases import GenerateOrderUseCase
-from ordering.domain.entities import OrderGenerationInput
+from ordering.api.caching import VersionedCacheMixin, stream_and_cache
+from ordering.api.filters import FullTextSearchFilter
+from ordering.api.idempotency import IDEMPOTENCY_KEY_PARAMETER, idempotent
+from ordering.api.schema import field_selection_views
+from ordering.application.use_cases import GenerateOrderBatchUseCase, GenerateOrderUseCase, RefreshOrdersUseCase
+from ordering.domain.documents import DEFAULT_LANGUAGE, TABLE_HEADERS, OrderDocumentRenderer
+from ordering.domain.entities import OrderDocumentLine, OrderGenerationInput
 from ordering.domain.services import OrderGenerationService
+from ordering.infrastructure.affected_orders import affected_order_ids
+from ordering.infrastructure.assets import absolute_asset_urls
+from ordering.infrastructure.catalog_snapshot import catalog_snapshot_reader
+from ordering.infrastructure.computation_cache import order_computation_cache
+from ordering.infrastructure.idempotency import IdempotencyConflict
+from ordering.infrastructure.jobs import order_job_queue
+from ordering.infrastructure.memberships import MembershipChange, MembershipWriter
+from ordering.infrastructure.order_export import (
+    EXPORT_CONTENT_TYPES,
+    EXPORT_FORMATS,
+    export_rows,
+    order_queryset,
+    write_export,
+)
 from ordering.infrastructure.repositories import (
     DjangoDayRepository,
+    DjangoDemandMatrixRepository,
     DjangoOrderRepository,
     DjangoProductQuantityRepository,
+    PRODUCT_TOTAL_READERS,
+)
+from ordering.infrastructure.versions import catalog_version, get_versions
+from ordering.models import (
+    AgeGroup,
+    Day,
+    Holiday,
+    MenuCycle,
+    Order,
+    OrderJob,
+    OrderProduct,
+    Product,
+    ProductQuantity,
+    Recipe,
+    Template,
 )
-from ordering.models import AgeGroup, Day, Order, Product, ProductQuantity, Recipe, Template
 
 from .serializers import (
+    AffectedOrdersQuerySerializer,
     AgeGroupSerializer,
+    BulkMembershipChangeSerializer,
     DaySerializer,
+    GenerateOrderBatchSerializer,
     GenerateOrderSerializer,
+    HolidaySerializer,
+    MembershipChangeSerializer,
+    MenuCycleSerializer,
+    OrderExportFormatSerializer,
+    OrderExportQuerySerializer,
+    OrderJobSerializer,
+    OrderProductExplainSerializer,
+    OrderProductPreviewSerializer,
+    OrderProductSerializer,
+    OrderRefreshResultSerializer,
     OrderSerializer,
     ProductQuantitySerializer,
     ProductSerializer,
     RecipeSerializer,
+    RefreshOrdersSerializer,
     TemplateSerializer,
+    parse_field_selection,
 )
 
 
-class ProductViewSet(viewsets.ModelViewSet):
+DOCUMENT_LAYOUTS = ("fragment", "print")
+DOCUMENT_CONTENT_TYPE = "text/html; charset=utf-8"
+ACCEPTS_GZIP = re.compile(r"\bgzip\b")
+EXPORT_RESPONSES = {
+    (200, EXPORT_CONTENT_TYPES[file_format].split(";")[0]): OpenApiTypes.BINARY for file_format in EXPORT_FORMATS
+}
+
+
+class IdempotentCreateMixin:
+    """Honors ``Idempotency-Key`` on ``POST`` to the list endpoint."""
+
+    @extend_schema(parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+
+class FieldSelectionQuerysetMixin:
+    """Joins and prefetches only the relations behind the fields a request renders.
+
+    ``field_select_related`` and ``field_prefetches`` map serializer field paths
+    (dotted for expanded nested fields) to the lookups they need, so list pages
+    run a fixed number of queries whatever ``?fields=``/``?expand=`` asks for.
+    """
+
+    field_select_related: dict[str, list[str]] = {}
+    field_prefetches: dict[str, list[str]] = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        paths = self._selected_field_paths()
+
+        select_related = {lookup for path in paths for lookup in self.field_select_related.get(path, ())}
+        prefetches = {lookup for path in paths for lookup in self.field_prefetches.get(path, ())}
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if prefetches:
+            queryset = queryset.prefetch_related(*sorted(prefetches))
+        return queryset
+
+    def _selected_field_paths(self) -> set[str]:
+        if self.request.method not in SAFE_METHODS:
+            return {*self.field_select_related, *self.field_prefetches}
+
+        meta = self.get_serializer_class().Meta
+        requested, expand = parse_field_selection(self.request.query_params)
+        expandable = set(getattr(meta, "expandable_fields", ()))
+        fields = {
+            name
+            for name in meta.fields
+            if (requested is None or name in requested) and (name not in expandable or name in expand)
+        }
+        return fields | {path for path in expand if path.split(".")[0] in fields}
+
+
+MEMBERSHIP_RESPONSES = {
+    200: inline_serializer(
+        name="MembershipChangeResponse",
+        fields={"added": drf_serializers.IntegerField(), "removed": drf_serializers.IntegerField()},
+    ),
+    400: inline_serializer(
+        name="MembershipChangeErrorResponse",
+        fields={"detail": drf_serializers.CharField()},
+    ),
+}
+
+
+class MembershipChangeMixin:
+    """PATCH-style add/remove on one m2m relation, for one object or many at once.
+
+    Only the added and removed links are written, see ``MembershipWriter``.
+    """
+
+    def _change_memberships(self, request, relation: str, pk=None):
+        if pk is None:
+            serializer = BulkMembershipChangeSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            changes = [
+                MembershipChange(item["id"], add=item["add"], remove=item["remove"])
+                for item in serializer.validated_data["changes"]
+            ]
+        else:
+            if not self.queryset.filter(pk=pk).exists():
+                raise Http404
+            serializer = MembershipChangeSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            changes = [MembershipChange(int(pk), **serializer.validated_data)]
+
+        try:
+            result = MembershipWriter(relation).apply(changes)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(asdict(result))
+
+
+@extend_schema_view(**field_selection_views("quantities", "quantities.age_group_profiles"))
+class ProductViewSet(VersionedCacheMixin, FieldSelectionQuerysetMixin, IdempotentCreateMixin, viewsets.ModelViewSet):
     queryset = Product.objects.all().order_by("name")
     serializer_class = ProductSerializer
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["name", "category"]
+    cache_resources = ("product", "product_quantity", "age_group")
+    field_prefetches = {"quantities": ["quantities__age_groups"]}
+    filter_backends = [FullTextSearchFilter]
+    search_resource = "product"
 
 
-class AgeGroupViewSet(viewsets.ModelViewSet):
+class AgeGroupViewSet(VersionedCacheMixin, IdempotentCreateMixin, viewsets.ModelViewSet):
     queryset = AgeGroup.objects.all().order_by("name")
     serializer_class = AgeGroupSerializer
+    cache_resources = ("age_group",)
     filter_backends = [filters.SearchFilter]
     search_fields = ["name"]
 
 
-class ProductQuantityViewSet(viewsets.ModelViewSet):
-    queryset = ProductQuantity.objects.select_related("product").prefetch_related("age_groups").all().order_by("product__name")
+@extend_schema_view(**field_selection_views("age_group_profiles"))
+class ProductQuantityViewSet(
+    VersionedCacheMixin,
+    FieldSelectionQuerysetMixin,
+    MembershipChangeMixin,
+    IdempotentCreateMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = ProductQuantity.objects.all().order_by("product__name")
     serializer_class = ProductQuantitySerializer
+    cache_resources = ("product_quantity", "product", "age_group")
+    field_select_related = {"product_name": ["product"]}
+    field_prefetches = {"age_groups": ["age_groups"], "age_group_profiles": ["age_groups"]}
+
+    @extend_schema(request=MembershipChangeSerializer, responses=MEMBERSHIP_RESPONSES)
+    @action(detail=True, methods=["patch"], url_path="age-groups")
+    def change_age_groups(self, request, pk=None):
+        return self._change_memberships(request, "quantity_age_groups", pk)
+
+    @extend_schema(
+        operation_id="product_quantities_age_groups_bulk_partial_update",
+        request=BulkMembershipChangeSerializer,
+        responses=MEMBERSHIP_RESPONSES,
+    )
+    @action(detail=False, methods=["patch"], url_path="age-groups")
+    def bulk_change_age_groups(self, request):
+        return self._change_memberships(request, "quantity_age_groups")
 
 
-class RecipeViewSet(viewsets.ModelViewSet):
-    queryset = Recipe.objects.prefetch_related("products").all().order_by("name")
+@extend_schema_view(**field_selection_views("product_details"))
+class RecipeViewSet(
+    VersionedCacheMixin,
+    FieldSelectionQuerysetMixin,
+    MembershipChangeMixin,
+    IdempotentCreateMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Recipe.objects.all().order_by("name")
     serializer_class = RecipeSerializer
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["name", "products__name"]
+    cache_resources = ("recipe", "product")
+    field_prefetches = {"products": ["products"], "product_details": ["products"]}
+    filter_backends = [FullTextSearchFilter]
+    search_resource = "recipe"
 
+    @extend_schema(request=MembershipChangeSerializer, responses=MEMBERSHIP_RESPONSES)
+    @action(detail=True, methods=["patch"], url_path="products")
+    def change_products(self, request, pk=None):
+        return self._change_memberships(request, "recipe_products", pk)
 
-class DayViewSet(viewsets.ModelViewSet):
-    queryset = Day.objects.prefetch_related("recipes").all().order_by("-id")
+    @extend_schema(
+        operation_id="recipes_products_bulk_partial_update",
+        request=BulkMembershipChangeSerializer,
+        responses=MEMBERSHIP_RESPONSES,
+    )
+    @action(detail=False, methods=["patch"], url_path="products")
+    def bulk_change_products(self, request):
+        return self._change_memberships(request, "recipe_products")
+
+
+@extend_schema_view(**field_selection_views("recipe_details", "recipe_details.product_details"))
+class DayViewSet(
+    VersionedCacheMixin,
+    FieldSelectionQuerysetMixin,
+    MembershipChangeMixin,
+    IdempotentCreateMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Day.objects.all().order_by("-id")
     serializer_class = DaySerializer
+    cache_resources = ("day", "recipe", "product")
+    field_prefetches = {"recipes": ["recipes"], "recipe_details": ["recipes__products"]}
+
+    @extend_schema(request=MembershipChangeSerializer, responses=MEMBERSHIP_RESPONSES)
+    @action(detail=True, methods=["patch"], url_path="recipes")
+    def change_recipes(self, request, pk=None):
+        return self._change_memberships(request, "day_recipes", pk)
+
+    @extend_schema(
+        operation_id="days_recipes_bulk_partial_update",
+        request=BulkMembershipChangeSerializer,
+        responses=MEMBERSHIP_RESPONSES,
+    )
+    @action(detail=False, methods=["patch"], url_path="recipes")
+    def bulk_change_recipes(self, request):
+        return self._change_memberships(request, "day_recipes")
+
+
+class MenuCycleViewSet(IdempotentCreateMixin, viewsets.ModelViewSet):
+    queryset = MenuCycle.objects.prefetch_related("slots").order_by("name")
+    serializer_class = MenuCycleSerializer
+
+
+class HolidayViewSet(IdempotentCreateMixin, viewsets.ModelViewSet):
+    queryset = Holiday.objects.all().order_by("date")
+    serializer_class = HolidaySerializer
 
 
 class OrderViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet):
-    queryset = Order.objects.select_related("template").prefetch_related("products").all().order_by("-id")
+    queryset = Order.objects.select_related("template").all().order_by("-id")
     serializer_class = OrderSerializer
+    cursor_ordering_fields = ("id", "date")
+
+    def _include_detail(self) -> bool:
+        return "detail" in self.request.query_params.get("include", "").split(",")
+
+    def _products_line_queryset(self):
+        lines = OrderProduct.objects.all()
+        if self._include_detail():
+            return lines
+        return lines.defer("detail", "breakdown")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in {"list", "retrieve"}:
+            return queryset
+        requested, _ = parse_field_selection(self.request.query_params)
+        if requested is not None and "products" not in requested:
+            return queryset
+        return queryset.prefetch_related(Prefetch("products", queryset=self._products_line_queryset()))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["include_detail"] = self._include_detail()
+        return context
+
+    def perform_destroy(self, instance):
+        DjangoOrderRepository().delete_orders([instance.id])
+
+    @extend_schema(responses=OrderProductExplainSerializer(many=True))
+    @action(detail=True, methods=["get"], url_path="products")
+    def products(self, request, pk=None):
+        order = self.get_object()
+        lines = self._products_line_queryset().filter(order=order).order_by("id")
+        serializer_class = OrderProductExplainSerializer if self._include_detail() else OrderProductSerializer
+        page = self.paginate_queryset(lines)
+        if page is None:
+            return Response(serializer_class(lines, many=True).data)
+        return self.get_paginated_response(serializer_class(page, many=True).data)
 
     @extend_schema(
         request=GenerateOrderSerializer,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
         responses={
             201: inline_serializer(
                 name="GenerateOrderResponse",
@@ -75,28 +356,319 @@ class OrderViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin, mixins.Dest
         },
     )
     @action(detail=False, methods=["post"], url_path="generate")
+    @idempotent
     def generate(self, request):
         serializer = GenerateOrderSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
-        payload = OrderGenerationInput(**serializer.validated_data)
-        use_case = GenerateOrderUseCase(
-            quantity_reader=DjangoProductQuantityRepository(),
+        validated_data = dict(serializer.validated_data)
+        use_case = self._build_generate_use_case(validated_data.pop("engine"))
+        payload = OrderGenerationInput(**validated_data)
+
+        try:
+            order_id = use_case.execute(payload)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"order_id": order_id}, status=status.HTTP_201_CREATED)
+
+    @extend_schema(
+        request=GenerateOrderSerializer,
+        parameters=[
+            OpenApiParameter(
+                "Idempotency-Key",
+                str,
+                OpenApiParameter.HEADER,
+                description="Retries with the same key and body return the existing job instead of a new one.",
+            )
+        ],
+        responses={
+            202: OrderJobSerializer,
+            200: OrderJobSerializer,
+            422: inline_serializer(
+                name="OrderJobConflictResponse",
+                fields={"detail": drf_serializers.CharField()},
+            ),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="jobs")
+    def create_job(self, request):
+        serializer = GenerateOrderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            job, created = order_job_queue.enqueue(dict(serializer.data), request.headers.get("Idempotency-Key"))
+        except IdempotencyConflict as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+
+        response = Response(
+            OrderJobSerializer(job).data,
+            status=status.HTTP_202_ACCEPTED if created else status.HTTP_200_OK,
+        )
+        response["Location"] = reverse("order-job-status", kwargs={"job_id": job.id}, request=request)
+        return response
+
+    @extend_schema(responses=OrderJobSerializer)
+    @action(detail=False, methods=["get"], url_path=r"jobs/(?P<job_id>[0-9]+)", url_name="job-status")
+    def job_status(self, request, job_id=None):
+        return Response(OrderJobSerializer(get_object_or_404(OrderJob, pk=job_id)).data)
+
+    @extend_schema(
+        request=GenerateOrderSerializer,
+        responses={
+            200: inline_serializer(
+                name="PreviewOrderResponse",
+                fields={"products": OrderProductPreviewSerializer(many=True)},
+            ),
+            400: inline_serializer(
+                name="PreviewOrderErrorResponse",
+                fields={"detail": drf_serializers.CharField()},
+            ),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="preview")
+    def preview(self, request):
+        serializer = GenerateOrderSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        validated_data = dict(serializer.validated_data)
+        use_case = self._build_generate_use_case(validated_data.pop("engine"))
+        payload = OrderGenerationInput(**validated_data)
+
+        try:
+            order_products = list(use_case.compute(payload))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        products = OrderProductPreviewSerializer(order_products, many=True, context=self.get_serializer_context())
+        return Response({"products": products.data})
+
+    @extend_schema(
+        responses=inline_serializer(
+            name="PreviewCacheStatsResponse",
+            fields={
+                "size": drf_serializers.IntegerField(),
+                "max_size": drf_serializers.IntegerField(),
+                "hits": drf_serializers.IntegerField(),
+                "misses": drf_serializers.IntegerField(),
+                "evictions": drf_serializers.IntegerField(),
+            },
+        )
+    )
+    @action(detail=False, methods=["get"], url_path="preview/stats")
+    def preview_stats(self, request):
+        return Response(asdict(order_computation_cache.stats()))
+
+    @staticmethod
+    def _build_generate_use_case(engine: str) -> GenerateOrderUseCase:
+        total_reader_class = PRODUCT_TOTAL_READERS.get(engine)
+        return GenerateOrderUseCase(
+            quantity_reader=catalog_snapshot_reader or DjangoProductQuantityRepository(),
+            order_writer=DjangoOrderRepository(),
+            day_repository=DjangoDayRepository(),
+            service=OrderGenerationService(detail_mode=settings.ORDER_DETAIL_MODE),
+            total_reader=total_reader_class() if total_reader_class else None,
+            computation_cache=order_computation_cache,
+            catalog_version=catalog_version,
+            engine=engine,
+        )
+
+    @extend_schema(
+        request=GenerateOrderBatchSerializer,
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
+        responses={
+            201: inline_serializer(
+                name="GenerateOrderBatchResponse",
+                fields={"order_ids": drf_serializers.ListField(child=drf_serializers.IntegerField())},
+            ),
+            400: inline_serializer(
+                name="GenerateOrderBatchErrorResponse",
+                fields={"detail": drf_serializers.CharField()},
+            ),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="generate-batch")
+    @idempotent
+    def generate_batch(self, request):
+        serializer = GenerateOrderBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        payloads = [OrderGenerationInput(**item) for item in serializer.validated_data["orders"]]
+        use_case = GenerateOrderBatchUseCase(
+            matrix_reader=DjangoDemandMatrixRepository(),
             order_writer=DjangoOrderRepository(),
             day_repository=DjangoDayRepository(),
-            service=OrderGenerationService(),
+            service=OrderGenerationService(detail_mode=settings.ORDER_DETAIL_MODE),
         )
 
         try:
-            order_id = use_case.execute(payload)
+            order_ids = use_case.execute(payloads)
         except ValueError as exc:
             return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response({"order_id": order_id}, status=status.HTTP_201_CREATED)
+        return Response({"order_ids": order_ids}, status=status.HTTP_201_CREATED)
+
+    @extend_schema(request=None, responses={200: OrderRefreshResultSerializer})
+    @action(detail=True, methods=["post"], url_path="refresh")
+    def refresh(self, request, pk=None):
+        if not Order.objects.filter(pk=pk).exists():
+            raise Http404
+        (result,) = self._build_refresh_use_case().execute([int(pk)])
+        response_status = status.HTTP_400_BAD_REQUEST if result.error else status.HTTP_200_OK
+        return Response(OrderRefreshResultSerializer(result).data, status=response_status)
 
+    @extend_schema(
+        operation_id="orders_refresh_bulk_create",
+        request=RefreshOrdersSerializer,
+        responses={
+            200: inline_serializer(
+                name="RefreshOrdersResponse",
+                fields={"results": OrderRefreshResultSerializer(many=True)},
+            )
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="refresh")
+    def refresh_batch(self, request):
+        serializer = RefreshOrdersSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        order_ids = list(dict.fromkeys(serializer.validated_data["order_ids"]))
+        results = self._build_refresh_use_case().execute(order_ids)
+        return Response({"results": OrderRefreshResultSerializer(results, many=True).data})
 
-class TemplateViewSet(viewsets.ModelViewSet):
+    @extend_schema(
+        parameters=[AffectedOrdersQuerySerializer],
+        responses={
+            200: inline_serializer(
+                name="AffectedOrdersResponse",
+                fields={"order_ids": drf_serializers.ListField(child=drf_serializers.IntegerField())},
+            )
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="affected")
+    def affected(self, request):
+        serializer = AffectedOrdersQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return Response({"order_ids": affected_order_ids(**serializer.validated_data)})
+
+    def _build_refresh_use_case(self) -> RefreshOrdersUseCase:
+        return RefreshOrdersUseCase(
+            generate_use_case=self._build_generate_use_case(settings.ORDER_GENERATION_ENGINE),
+            order_lines=DjangoOrderRepository(),
+        )
+
+    @extend_schema(parameters=[OrderExportFormatSerializer], responses=EXPORT_RESPONSES)
+    @action(detail=True, methods=["get"], url_path="export")
+    def export(self, request, pk=None):
+        serializer = OrderExportFormatSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        order = get_object_or_404(Order.objects.only("id"), pk=pk)
+        file_format = serializer.validated_data["file_format"]
+        return self._export_response(request, order_queryset([order.id]), file_format, f"order-{order.id}")
+
+    @extend_schema(
+        operation_id="orders_bulk_export",
+        parameters=[OrderExportQuerySerializer],
+        responses=EXPORT_RESPONSES,
+    )
+    @action(detail=False, methods=["get"], url_path="export")
+    def export_many(self, request):
+        serializer = OrderExportQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        query = serializer.validated_data
+        orders = order_queryset(query.get("ids", ()), query.get("start"), query.get("end"))
+        return self._export_response(request, orders, query["file_format"], "orders")
+
+    @staticmethod
+    def _export_response(request, orders, file_format: str, filename: str) -> StreamingHttpResponse:
+        """Streams the order lines; CSV is gzipped on the fly when the client accepts it (XLSX is already zipped)."""
+        chunks = write_export(export_rows(orders), file_format)
+        compress = file_format == "csv" and ACCEPTS_GZIP.search(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        if compress:
+            chunks = compress_sequence(chunks)
+        response = StreamingHttpResponse(chunks, content_type=EXPORT_CONTENT_TYPES[file_format])
+        if compress:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ["Accept-Encoding"])
+        response["Content-Disposition"] = f'attachment; filename="{filename}.{file_format}"'
+        return response
+
+    @extend_schema(responses=OrderProductExplainSerializer(many=True))
+    @action(detail=True, methods=["get"], url_path="explain")
+    def explain(self, request, pk=None):
+        order = self.get_object()
+        lines = OrderProduct.objects.filter(order=order).order_by("id")
+        return Response(OrderProductExplainSerializer(lines, many=True).data)
+
+    @extend_schema(responses=OrderProductExplainSerializer)
+    @action(detail=True, methods=["get"], url_path=r"explain/(?P<line_id>[0-9]+)")
+    def explain_line(self, request, pk=None, line_id=None):
+        line = get_object_or_404(OrderProduct, order_id=pk, id=line_id)
+        return Response(OrderProductExplainSerializer(line).data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("layout", str, enum=list(DOCUMENT_LAYOUTS), description="fragment (default) or print."),
+            OpenApiParameter("lang", str, enum=list(TABLE_HEADERS), description="Language of the products table headers."),
+        ],
+        responses={(200, "text/html"): OpenApiTypes.STR},
+    )
+    @action(detail=True, methods=["get"], url_path="document")
+    def document(self, request, pk=None):
+        order = get_object_or_404(Order.objects.only("id", "name", "date", "template_id", "revision"), pk=pk)
+        if order.template_id is None:
+            return Response({"detail": "Order has no assigned template."}, status=status.HTTP_400_BAD_REQUEST)
+
+        layout = request.query_params.get("layout", "fragment")
+        if layout not in DOCUMENT_LAYOUTS:
+            return Response({"detail": f"Invalid layout '{layout}'."}, status=status.HTTP_400_BAD_REQUEST)
+        language = request.query_params.get("lang", DEFAULT_LANGUAGE)
+        if language not in TABLE_HEADERS:
+            language = DEFAULT_LANGUAGE
+
+        template_version, _ = get_versions(("template",))["template"]
+        fingerprint = "|".join(
+            map(str, [request.get_host(), order.id, order.revision, order.template_id, template_version, layout, language])
+        )
+        digest = hashlib.sha256(fingerprint.encode()).hexdigest()[:32]
+        etag = f'"{digest}"'
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return self._with_document_validators(not_modified, etag)
+
+        cache_key = f"order-document:{digest}"
+        cached = caches[settings.API_CACHE_ALIAS].get(cache_key)
+        if cached is not None:
+            return self._with_document_validators(HttpResponse(cached, content_type=DOCUMENT_CONTENT_TYPE), etag)
+
+        content = absolute_asset_urls(
+            Template.objects.filter(pk=order.template_id).values_list("content", flat=True).first() or "",
+            request.build_absolute_uri("/"),
+        )
+        lines = [
+            OrderDocumentLine(*row)
+            for row in order.products.order_by("id").values_list(
+                "name", "package_type", "unit_of_measure", "quantity", "qty_package"
+            )
+        ]
+        renderer = OrderDocumentRenderer(language)
+        render = renderer.render_printable if layout == "print" else renderer.render
+        chunks = render(content, order.name, order.date.isoformat(), lines)
+        response = StreamingHttpResponse(
+            stream_and_cache(chunks, cache_key, settings.ORDER_DOCUMENT_CACHE_TIMEOUT),
+            content_type=DOCUMENT_CONTENT_TYPE,
+        )
+        return self._with_document_validators(response, etag)
+
+    @staticmethod
+    def _with_document_validators(response, etag: str):
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+class TemplateViewSet(VersionedCacheMixin, IdempotentCreateMixin, viewsets.ModelViewSet):
     queryset = Template.objects.all().order_by("title")
     serializer_class = TemplateSerializer
-    filter_backends = [filters.SearchFilter]
-    search_fields = ["title", "content"]
+    cache_resources = ("template",)
+    filter_backends = [FullTextSearchFilter]
+    search_resource = "template"
@@ -1,6 +1,22 @@
-from ordering.domain.entities import OrderGenerationInput
-from ordering.domain.protocols import OrderWriter, ProductQuantityReader
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+
+from ordering.domain.entities import OrderGenerationInput, OrderProductData, OrderRefreshResult
+from ordering.domain.protocols import (
+    AsyncOrderWriter,
+    AsyncProductQuantityReader,
+    AsyncProductTotalReader,
+    BatchOrderWriter,
+    DemandMatrixReader,
+    OrderLineSynchronizer,
+    OrderWriter,
+    ProductQuantityReader,
+    ProductTotalReader,
+)
 from ordering.domain.services import OrderGenerationService
+from ordering.infrastructure.async_repositories import AsyncDjangoDayRepository
+from ordering.infrastructure.computation_cache import OrderComputationCache
+from ordering.infrastructure.metrics import record_stage, timed_iter
 from ordering.infrastructure.repositories import DjangoDayRepository
 
 
@@ -11,20 +27,179 @@ class GenerateOrderUseCase:
         order_writer: OrderWriter,
         day_repository: DjangoDayRepository,
         service: OrderGenerationService,
+        total_reader: ProductTotalReader | None = None,
+        computation_cache: OrderComputationCache | None = None,
+        catalog_version: Callable[[], Hashable] | None = None,
+        engine: str = "python",
     ) -> None:
         self._quantity_reader = quantity_reader
         self._order_writer = order_writer
         self._day_repository = day_repository
         self._service = service
+        self._total_reader = total_reader
+        self._computation_cache = computation_cache
+        self._catalog_version = catalog_version
+        self._readers = (engine, type(quantity_reader).__name__)
 
     def execute(self, payload: OrderGenerationInput) -> int:
-        if not self._day_repository.validate_ids(payload.day_ids):
-            raise ValueError("Some day IDs do not exist")
+        order_products = self.compute(payload)
+        order_date = self._service.calculate_order_date(payload)
+        with record_stage("write"):
+            return self._order_writer.create_order(payload, order_products, order_date)
 
-        product_quantities = self._quantity_reader.list_by_day_ids(payload.day_ids, payload.product_category)
-        if not product_quantities:
-            raise ValueError("No product quantities found for the selected days")
+    def compute(self, payload: OrderGenerationInput) -> Iterable[OrderProductData]:
+        """Computes the order lines without saving them, reusing a cached result when one exists."""
+        if self._computation_cache is None or self._catalog_version is None:
+            return self._compute(payload)
+
+        key = self._computation_cache.make_key(
+            payload, self._service.detail_mode, self._catalog_version(), self._readers
+        )
+        return self._computation_cache.get_or_compute(key, lambda: list(self._compute(payload)))
+
+    def _compute(self, payload: OrderGenerationInput) -> Iterable[OrderProductData]:
+        with record_stage("validate"):
+            if not self._day_repository.validate_ids(payload.day_ids):
+                raise ValueError("Some day IDs do not exist")
+
+        if self._total_reader is not None:
+            with record_stage("read"):
+                product_totals = self._total_reader.sum_by_day_ids(payload.day_ids, payload.product_category)
+            if not product_totals:
+                raise ValueError("No product quantities found for the selected days")
+        else:
+            with record_stage("read"):
+                product_quantities = self._quantity_reader.list_by_day_ids(payload.day_ids, payload.product_category)
+            if not product_quantities:
+                raise ValueError("No product quantities found for the selected days")
+            with record_stage("compute"):
+                product_totals = self._service.aggregate_product_totals(product_quantities)
+
+        with record_stage("compute"):
+            order_products = self._service.iter_order_products(payload, product_totals)
+        return timed_iter(order_products, "compute")
+
+
+class AsyncGenerateOrderUseCase:
+    """``GenerateOrderUseCase`` for async views.
+
+    The day check and the quantity (or total) read do not depend on each other,
+    so they run concurrently; both are charged to the ``read`` stage. Unknown
+    days are still reported as an error once both finish.
+    """
+
+    def __init__(
+        self,
+        quantity_reader: AsyncProductQuantityReader,
+        order_writer: AsyncOrderWriter,
+        day_repository: AsyncDjangoDayRepository,
+        service: OrderGenerationService,
+        total_reader: AsyncProductTotalReader | None = None,
+        computation_cache: OrderComputationCache | None = None,
+        catalog_version: Callable[[], Awaitable[Hashable]] | None = None,
+        engine: str = "python",
+    ) -> None:
+        self._quantity_reader = quantity_reader
+        self._order_writer = order_writer
+        self._day_repository = day_repository
+        self._service = service
+        self._total_reader = total_reader
+        self._computation_cache = computation_cache
+        self._catalog_version = catalog_version
+        self._readers = (engine, type(quantity_reader).__name__)
 
-        order_products = self._service.generate_order_products(payload, product_quantities)
+    async def execute(self, payload: OrderGenerationInput) -> int:
+        order_products = await self.compute(payload)
         order_date = self._service.calculate_order_date(payload)
-        return self._order_writer.create_order(payload, order_products, order_date)
+        with record_stage("write"):
+            return await self._order_writer.create_order(payload, order_products, order_date)
+
+    async def compute(self, payload: OrderGenerationInput) -> Iterable[OrderProductData]:
+        if self._computation_cache is None or self._catalog_version is None:
+            return await self._compute(payload)
+
+        key = self._computation_cache.make_key(
+            payload, self._service.detail_mode, await self._catalog_version(), self._readers
+        )
+
+        async def compute_list() -> list[OrderProductData]:
+            return list(await self._compute(payload))
+
+        return await self._computation_cache.aget_or_compute(key, compute_list)
+
+    async def _compute(self, payload: OrderGenerationInput) -> Iterable[OrderProductData]:
+        if self._total_reader is not None:
+            read = self._total_reader.sum_by_day_ids(payload.day_ids, payload.product_category)
+        else:
+            read = self._quantity_reader.list_by_day_ids(payload.day_ids, payload.product_category)
+        with record_stage("read"):
+            days_exist, rows = await asyncio.gather(self._day_repository.validate_ids(payload.day_ids), read)
+
+        if not days_exist:
+            raise ValueError("Some day IDs do not exist")
+        if not rows:
+            raise ValueError("No product quantities found for the selected days")
+        with record_stage("compute"):
+            product_totals = rows if self._total_reader is not None else self._service.aggregate_product_totals(rows)
+            order_products = self._service.iter_order_products(payload, product_totals)
+        return timed_iter(order_products, "compute")
+
+
+class GenerateOrderBatchUseCase:
+    def __init__(
+        self,
+        matrix_reader: DemandMatrixReader,
+        order_writer: BatchOrderWriter,
+        day_repository: DjangoDayRepository,
+        service: OrderGenerationService,
+    ) -> None:
+        self._matrix_reader = matrix_reader
+        self._order_writer = order_writer
+        self._day_repository = day_repository
+        self._service = service
+
+    def execute(self, payloads: list[OrderGenerationInput]) -> list[int]:
+        if not payloads:
+            raise ValueError("At least one order must be requested")
+
+        day_ids = sorted({day_id for payload in payloads for day_id in payload.day_ids})
+        with record_stage("validate"):
+            if not self._day_repository.validate_ids(day_ids):
+                raise ValueError("Some day IDs do not exist")
+
+        with record_stage("read"):
+            matrix = self._matrix_reader.load_matrix(day_ids)
+        with record_stage("compute"):
+            order_products = [
+                timed_iter(products, "compute")
+                for products in self._service.generate_batch_order_products(payloads, matrix)
+            ]
+        order_dates = [self._service.calculate_order_date(payload) for payload in payloads]
+        with record_stage("write"):
+            return self._order_writer.create_orders(payloads, order_products, order_dates)
+
+
+class RefreshOrdersUseCase:
+    """Recomputes saved orders from their stored inputs after catalog changes.
+
+    Lines come from ``GenerateOrderUseCase.compute``, so orders with the same
+    days and category share one computation through the computation cache, and
+    only the lines that differ are written. An order that cannot be refreshed
+    gets a result with ``error`` set and does not stop the others.
+    """
+
+    def __init__(self, generate_use_case: GenerateOrderUseCase, order_lines: OrderLineSynchronizer) -> None:
+        self._generate_use_case = generate_use_case
+        self._order_lines = order_lines
+
+    def execute(self, order_ids: list[int]) -> list[OrderRefreshResult]:
+        return [self._refresh(order_id) for order_id in order_ids]
+
+    def _refresh(self, order_id: int) -> OrderRefreshResult:
+        try:
+            payload = self._order_lines.load_input(order_id)
+            order_products = self._generate_use_case.compute(payload)
+        except ValueError as exc:
+            return OrderRefreshResult(order_id=order_id, error=str(exc))
+        with record_stage("write"):
+            return self._order_lines.sync_lines(order_id, order_products)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class OrderingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "ordering"
+
+    def ready(self) -> None:
+        from ordering import signals  # noqa: F401
@@ -0,0 +1,40 @@
+from collections import Counter
+from collections.abc import Iterable
+from datetime import date, timedelta
+
+from .entities import MenuCycleData
+
+
+def day_occurrences(day_ids: Iterable[int]) -> dict[int, int]:
+    """Counts how many times each day is served; a day listed twice contributes twice."""
+    return dict(Counter(day_ids))
+
+
+def cycle_day_ids(
+    cycle: MenuCycleData,
+    start_date: date,
+    end_date: date,
+    skip_dates: Iterable[date] = (),
+) -> list[int]:
+    """Returns the day served on each date from ``start_date`` to ``end_date``, both included.
+
+    The cycle repeats every ``len(cycle.slots)`` calendar days counted from its
+    ``start_date``, also backwards. Empty slots (e.g. weekends) and skipped
+    dates (e.g. holidays) serve nothing; a skipped date does not shift the
+    rest of the cycle.
+    """
+    if not cycle.slots:
+        raise ValueError("The menu cycle has no days")
+    if end_date < start_date:
+        raise ValueError("The end date must not be before the start date")
+
+    skipped = set(skip_dates)
+    length = len(cycle.slots)
+    day_ids = []
+    current = start_date
+    while current <= end_date:
+        day_id = cycle.slots[(current - cycle.start_date).days % length]
+        if day_id is not None and current not in skipped:
+            day_ids.append(day_id)
+        current += timedelta(days=1)
+    return day_ids
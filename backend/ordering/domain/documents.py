@@ -0,0 +1,102 @@
+import re
+from collections.abc import Iterable, Iterator
+from html import escape
+
+from .entities import OrderDocumentLine
+
+
+TOKEN_PATTERN = re.compile(
+    r"\{\{\s*(nombre_orden|fecha|nombre_producto|cantidad|unidad|categoria|tabla_productos)\s*\}\}",
+    re.IGNORECASE,
+)
+
+TABLE_HEADERS = {
+    "es": ("Cantidad por paquete", "Unidad", "Cantidad", "Producto", "valor unitario", "valor total"),
+    "en": ("Quantity per package", "Unit", "Quantity", "Product", "unit value", "total value"),
+}
+DEFAULT_LANGUAGE = "es"
+
+PRINT_STYLES = """
+body { font-family: Arial, sans-serif; margin: 24px; color: #111827; }
+h1, h2, h3 { margin-top: 0; }
+table { width: 100%; border-collapse: collapse; margin: 12px 0; }
+th, td { border: 1px solid #d1d5db; padding: 8px; text-align: left; }
+tr { break-inside: avoid; }
+img { max-width: 100%; height: auto; }
+figure.image.image_resized { display: block; box-sizing: border-box; }
+figure.image.image_resized img { width: 100%; }
+@page { size: A4; margin: 16mm; }
+@media print { body { margin: 0; } }
+"""
+
+
+class OrderDocumentRenderer:
+    """Fills a template's HTML with an order's lines.
+
+    Supports the same ``{{token}}`` placeholders as the order print preview.
+    The output is produced as a sequence of chunks, so a large template is
+    never copied into one string.
+    """
+
+    def __init__(self, language: str = DEFAULT_LANGUAGE) -> None:
+        self._headers = TABLE_HEADERS.get(language, TABLE_HEADERS[DEFAULT_LANGUAGE])
+
+    def render(
+        self,
+        content: str,
+        order_name: str,
+        order_date: str,
+        lines: list[OrderDocumentLine],
+    ) -> Iterator[str]:
+        position = 0
+        for match in TOKEN_PATTERN.finditer(content):
+            if match.start() > position:
+                yield content[position:match.start()]
+            yield from self._token_value(match.group(1).lower(), order_name, order_date, lines)
+            position = match.end()
+        if position < len(content):
+            yield content[position:]
+
+    def render_printable(
+        self,
+        content: str,
+        order_name: str,
+        order_date: str,
+        lines: list[OrderDocumentLine],
+    ) -> Iterator[str]:
+        yield (
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            f"<title>{escape(order_name)}</title>\n<style>{PRINT_STYLES}</style>\n</head>\n<body>\n"
+        )
+        yield from self.render(content, order_name, order_date, lines)
+        yield "\n</body>\n</html>\n"
+
+    def _token_value(
+        self,
+        token: str,
+        order_name: str,
+        order_date: str,
+        lines: list[OrderDocumentLine],
+    ) -> Iterable[str]:
+        if token == "nombre_orden":
+            return (escape(order_name),)
+        if token == "fecha":
+            return (escape(order_date),)
+        if token == "nombre_producto":
+            return ("<br/>".join(escape(line.name) for line in lines),)
+        if token == "cantidad":
+            return ("<br/>".join(escape(str(line.quantity)) for line in lines),)
+        if token == "unidad":
+            return ("<br/>".join(escape(line.unit_of_measure) for line in lines),)
+        if token == "categoria":
+            return ("<br/>".join("-" for _ in lines),)
+        return self._products_table(lines)
+
+    def _products_table(self, lines: list[OrderDocumentLine]) -> Iterator[str]:
+        yield "<table><thead><tr>" + "".join(f"<th>{escape(header)}</th>" for header in self._headers) + "</tr></thead><tbody>"
+        for line in lines:
+            yield (
+                f"<tr><td>{escape(line.package_type)}</td><td>{escape(line.unit_of_measure)}</td>"
+                f"<td>{line.qty_package}</td><td>{escape(line.name)}</td><td></td><td></td></tr>"
+            )
+        yield "</tbody></table>"
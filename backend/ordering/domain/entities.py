@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
 
@@ -16,6 +16,39 @@ class ProductQuantityData:
     package_type: str
     quantity: Decimal
     age_groups: list[AgeGroupData]
+    occurrences: int = 1
+
+
+@dataclass(frozen=True)
+class QuantityContribution:
+    quantity: Decimal
+    age_groups: list[AgeGroupData]
+    occurrences: int = 1
+
+
+@dataclass(frozen=True)
+class ProductTotalData:
+    product_name: str
+    package_type: str
+    unit_of_measure: str
+    quantity: Decimal
+    breakdown: list[QuantityContribution]
+
+
+@dataclass(frozen=True)
+class QuantityProfileData:
+    product_name: str
+    product_category: str
+    unit_of_measure: str
+    package_type: str
+    quantity: Decimal
+    age_groups: list[AgeGroupData]
+
+
+@dataclass(frozen=True)
+class DemandMatrix:
+    quantities: list[QuantityProfileData]
+    day_columns: dict[int, list[int]]
 
 
 @dataclass(frozen=True)
@@ -27,6 +60,17 @@ class OrderProductData:
     total: int
     qty_package: int
     detail: str
+    breakdown: list[QuantityContribution] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class OrderRefreshResult:
+    order_id: int
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    unchanged: int = 0
+    error: str | None = None
 
 
 @dataclass(frozen=True)
@@ -37,3 +81,17 @@ class OrderGenerationInput:
     product_category: str | None = None
     template_id: int | None = None
 
+
+@dataclass(frozen=True)
+class MenuCycleData:
+    start_date: date
+    slots: list[int | None]
+
+
+@dataclass(frozen=True)
+class OrderDocumentLine:
+    name: str
+    package_type: str
+    unit_of_measure: str
+    quantity: Decimal
+    qty_package: int
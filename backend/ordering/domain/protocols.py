@@ -1,7 +1,15 @@
+from collections.abc import Iterable
 from datetime import date
 from typing import Protocol
 
-from .entities import OrderGenerationInput, OrderProductData, ProductQuantityData
+from .entities import (
+    DemandMatrix,
+    OrderGenerationInput,
+    OrderProductData,
+    OrderRefreshResult,
+    ProductQuantityData,
+    ProductTotalData,
+)
 
 
 class ProductQuantityReader(Protocol):
@@ -9,11 +17,63 @@ class ProductQuantityReader(Protocol):
         ...
 
 
+class ProductTotalReader(Protocol):
+    def sum_by_day_ids(self, day_ids: list[int], product_category: str | None = None) -> list[ProductTotalData]:
+        ...
+
+
+class DemandMatrixReader(Protocol):
+    def load_matrix(self, day_ids: list[int]) -> DemandMatrix:
+        ...
+
+
 class OrderWriter(Protocol):
     def create_order(
         self,
         payload: OrderGenerationInput,
-        products: list[OrderProductData],
+        products: Iterable[OrderProductData],
+        order_date: date,
+    ) -> int:
+        ...
+
+
+class BatchOrderWriter(Protocol):
+    def create_orders(
+        self,
+        payloads: list[OrderGenerationInput],
+        products: list[Iterable[OrderProductData]],
+        order_dates: list[date],
+    ) -> list[int]:
+        ...
+
+
+class OrderLineSynchronizer(Protocol):
+    def load_input(self, order_id: int) -> OrderGenerationInput:
+        ...
+
+    def sync_lines(self, order_id: int, products: Iterable[OrderProductData]) -> OrderRefreshResult:
+        ...
+
+
+class AsyncProductQuantityReader(Protocol):
+    async def list_by_day_ids(
+        self,
+        day_ids: list[int],
+        product_category: str | None = None,
+    ) -> list[ProductQuantityData]:
+        ...
+
+
+class AsyncProductTotalReader(Protocol):
+    async def sum_by_day_ids(self, day_ids: list[int], product_category: str | None = None) -> list[ProductTotalData]:
+        ...
+
+
+class AsyncOrderWriter(Protocol):
+    async def create_order(
+        self,
+        payload: OrderGenerationInput,
+        products: Iterable[OrderProductData],
         order_date: date,
     ) -> int:
         ...
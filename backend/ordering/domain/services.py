@@ -1,10 +1,34 @@
 from collections import defaultdict
+from collections.abc import Iterator
 from decimal import ROUND_CEILING, Decimal, InvalidOperation
 
-from .entities import OrderGenerationInput, OrderProductData, ProductQuantityData
+from .calendar import day_occurrences
+from .entities import (
+    AgeGroupData,
+    DemandMatrix,
+    OrderGenerationInput,
+    OrderProductData,
+    ProductQuantityData,
+    ProductTotalData,
+    QuantityContribution,
+)
+
+
+DETAIL_MODE_TEXT = "text"
+DETAIL_MODE_STRUCTURED = "structured"
+DETAIL_MODES = (DETAIL_MODE_TEXT, DETAIL_MODE_STRUCTURED)
 
 
 class OrderGenerationService:
+    def __init__(self, detail_mode: str = DETAIL_MODE_TEXT) -> None:
+        if detail_mode not in DETAIL_MODES:
+            raise ValueError(f"Invalid detail mode '{detail_mode}'.")
+        self._detail_mode = detail_mode
+
+    @property
+    def detail_mode(self) -> str:
+        return self._detail_mode
+
     @staticmethod
     def _parse_package_size(raw_value: str) -> Decimal:
         try:
@@ -16,6 +40,17 @@ class OrderGenerationService:
             raise ValueError(f"Invalid package_type value '{raw_value}'. It must be greater than zero.")
         return package_size
 
+    @staticmethod
+    def describe_quantity(quantity: Decimal, age_groups: list[AgeGroupData]) -> list[str]:
+        if not age_groups:
+            return [f"Sin grupos etarios: {quantity} x 0 = 0"]
+
+        return [
+            f"{quantity} x {age_group.quantity} ({age_group.name}) = "
+            f"{(quantity * Decimal(age_group.quantity)).quantize(Decimal('0.01'))}"
+            for age_group in age_groups
+        ]
+
     def generate_order_products(
         self,
         payload: OrderGenerationInput,
@@ -24,8 +59,11 @@ class OrderGenerationService:
         if not payload.day_ids:
             raise ValueError("At least one day must be selected")
 
+        return self.build_order_products(payload, self.aggregate_product_totals(product_quantities))
+
+    def aggregate_product_totals(self, product_quantities: list[ProductQuantityData]) -> list[ProductTotalData]:
         totals: dict[tuple[str, str, str], Decimal] = defaultdict(lambda: Decimal("0"))
-        details: dict[tuple[str, str, str], list[str]] = defaultdict(list)
+        breakdowns: dict[tuple[str, str, str], list[QuantityContribution]] = defaultdict(list)
 
         for quantity_data in product_quantities:
             key = (
@@ -34,35 +72,173 @@ class OrderGenerationService:
                 quantity_data.unit_of_measure,
             )
 
-            if not quantity_data.age_groups:
-                totals[key] += Decimal("0")
-                details[key].append(
-                    f"Sin grupos etarios: {quantity_data.quantity} x 0 = 0"
+            totals[key] += sum(
+                (quantity_data.quantity * Decimal(age_group.quantity) for age_group in quantity_data.age_groups),
+                Decimal("0"),
+            ) * quantity_data.occurrences
+            contributions = breakdowns[key]
+            previous = contributions[-1] if contributions else None
+            if (
+                previous is not None
+                and previous.quantity == quantity_data.quantity
+                and previous.age_groups == quantity_data.age_groups
+            ):
+                contributions[-1] = QuantityContribution(
+                    previous.quantity, previous.age_groups, previous.occurrences + quantity_data.occurrences
                 )
-                continue
-
-            for age_group in quantity_data.age_groups:
-                partial_total = quantity_data.quantity * Decimal(age_group.quantity)
-                totals[key] += partial_total
-                details[key].append(
-                    f"{quantity_data.quantity} x {age_group.quantity} ({age_group.name}) = {partial_total.quantize(Decimal('0.01'))}"
+            else:
+                contributions.append(
+                    QuantityContribution(quantity_data.quantity, quantity_data.age_groups, quantity_data.occurrences)
                 )
 
         return [
-            self._build_order_product_data(name, package_type, unit, amount, details[(name, package_type, unit)])
+            ProductTotalData(
+                product_name=name,
+                package_type=package_type,
+                unit_of_measure=unit,
+                quantity=amount,
+                breakdown=breakdowns[(name, package_type, unit)],
+            )
             for (name, package_type, unit), amount in sorted(totals.items())
         ]
 
+    def build_order_products(
+        self,
+        payload: OrderGenerationInput,
+        product_totals: list[ProductTotalData],
+    ) -> list[OrderProductData]:
+        return list(self.iter_order_products(payload, product_totals))
+
+    def iter_order_products(
+        self,
+        payload: OrderGenerationInput,
+        product_totals: list[ProductTotalData],
+    ) -> Iterator[OrderProductData]:
+        if not payload.day_ids:
+            raise ValueError("At least one day must be selected")
+
+        return (
+            self._build_order_product_data(
+                item.product_name,
+                item.package_type,
+                item.unit_of_measure,
+                item.quantity,
+                item.breakdown,
+            )
+            for item in product_totals
+        )
+
+    def generate_batch_order_products(
+        self,
+        payloads: list[OrderGenerationInput],
+        matrix: DemandMatrix,
+    ) -> list[Iterator[OrderProductData]]:
+        row_count = len(matrix.quantities)
+        row_totals = [
+            sum((row.quantity * Decimal(age_group.quantity) for age_group in row.age_groups), Decimal("0"))
+            for row in matrix.quantities
+        ]
+
+        batch: list[Iterator[OrderProductData]] = []
+        for index, payload in enumerate(payloads, start=1):
+            if not payload.day_ids:
+                raise ValueError(f"Order {index}: At least one day must be selected")
+
+            occurrences = [0] * row_count
+            for day_id, times in day_occurrences(payload.day_ids).items():
+                column = matrix.day_columns.get(day_id)
+                if column:
+                    occurrences = [current + added * times for current, added in zip(occurrences, column)]
+            if payload.product_category:
+                occurrences = [
+                    count if row.product_category == payload.product_category else 0
+                    for count, row in zip(occurrences, matrix.quantities)
+                ]
+
+            totals: dict[tuple[str, str, str], Decimal] = defaultdict(lambda: Decimal("0"))
+            breakdowns: dict[tuple[str, str, str], list[QuantityContribution]] = defaultdict(list)
+            for row_index, count in enumerate(occurrences):
+                if not count:
+                    continue
+                row = matrix.quantities[row_index]
+                key = (row.product_name, row.package_type, row.unit_of_measure)
+                totals[key] += row_totals[row_index] * count
+                breakdowns[key].append(QuantityContribution(row.quantity, row.age_groups, count))
+
+            if not totals:
+                raise ValueError(f"Order {index}: No product quantities found for the selected days")
+
+            batch.append(
+                self.iter_order_products(
+                    payload,
+                    [
+                        ProductTotalData(
+                            product_name=name,
+                            package_type=package_type,
+                            unit_of_measure=unit,
+                            quantity=amount,
+                            breakdown=breakdowns[(name, package_type, unit)],
+                        )
+                        for (name, package_type, unit), amount in sorted(totals.items())
+                    ],
+                )
+            )
+        return batch
+
     def calculate_order_date(self, payload: OrderGenerationInput):
         return payload.date
 
+    def format_detail(
+        self,
+        breakdown: list[QuantityContribution],
+        quantity: Decimal,
+        total: int,
+        package_type: str,
+        qty_package: int,
+    ) -> str:
+        package_size = self._parse_package_size(package_type)
+        return "\n".join(
+            [
+                *(
+                    line
+                    for contribution in breakdown
+                    for line in self.describe_quantity(contribution.quantity, contribution.age_groups)
+                    * contribution.occurrences
+                ),
+                f"Total = {quantity}",
+                f"Qty package = ceil({total} / {package_size}) = {qty_package}",
+            ]
+        )
+
+    @staticmethod
+    def breakdown_to_primitive(breakdown: list[QuantityContribution]) -> list:
+        return [
+            [
+                str(contribution.quantity),
+                contribution.occurrences,
+                [[age_group.name, age_group.quantity] for age_group in contribution.age_groups],
+            ]
+            for contribution in breakdown
+        ]
+
+    @staticmethod
+    def breakdown_from_primitive(raw_breakdown: list) -> list[QuantityContribution]:
+        return [
+            QuantityContribution(
+                quantity=Decimal(quantity),
+                age_groups=[AgeGroupData(name=name, quantity=age_group_quantity) for name, age_group_quantity in age_groups],
+                occurrences=occurrences,
+            )
+            for quantity, occurrences, age_groups in raw_breakdown
+        ]
+
     def _build_order_product_data(
         self,
         name: str,
         package_type: str,
         unit: str,
         amount: Decimal,
-        detail_lines: list[str],
+        breakdown: list[QuantityContribution],
     ) -> OrderProductData:
         quantized_amount = amount.quantize(Decimal("0.01"))
         total = int(quantized_amount.to_integral_value(rounding=ROUND_CEILING))
@@ -70,13 +246,17 @@ class OrderGenerationService:
         qty_package_decimal = (Decimal(total) / package_size).to_integral_value(rounding=ROUND_CEILING)
         qty_package = int(qty_package_decimal)
 
-        detail = "\n".join(
-            [
-                *detail_lines,
-                f"Total = {quantized_amount}",
-                f"Qty package = ceil({total} / {package_size}) = {qty_package}",
-            ]
-        )
+        if self._detail_mode == DETAIL_MODE_STRUCTURED:
+            return OrderProductData(
+                name=name,
+                package_type=package_type,
+                unit_of_measure=unit,
+                quantity=quantized_amount,
+                total=total,
+                qty_package=qty_package,
+                detail="",
+                breakdown=breakdown,
+            )
 
         return OrderProductData(
             name=name,
@@ -85,5 +265,5 @@ class OrderGenerationService:
             quantity=quantized_amount,
             total=total,
             qty_package=qty_package,
-            detail=detail,
+            detail=self.format_detail(breakdown, quantized_amount, total, package_type, qty_package),
         )
@@ -0,0 +1,40 @@
+from collections.abc import Iterable
+
+from django.db.models import Q
+
+from ordering.infrastructure.day_demand import days_for_products, days_for_recipes
+from ordering.models import Order, Product, ProductQuantity
+
+
+def affected_order_ids(
+    products: Iterable[int] = (),
+    product_quantities: Iterable[int] = (),
+    age_groups: Iterable[int] = (),
+    recipes: Iterable[int] = (),
+    days: Iterable[int] = (),
+) -> list[int]:
+    """Returns the ids of saved orders whose lines may change with the given catalog objects.
+
+    Orders are found through their ``days`` index. Changes to products,
+    quantities or age groups only reach the days that serve those products,
+    and orders limited to another product category are skipped. Changes to
+    recipes or days reach every order of their days. Orders saved before their
+    inputs were stored are not indexed and are never returned.
+    """
+    product_ids = set(products)
+    quantity_ids = set(product_quantities)
+    if age_groups:
+        quantity_ids.update(ProductQuantity.objects.filter(age_groups__id__in=list(age_groups)).values_list("id", flat=True))
+    if quantity_ids:
+        product_ids.update(ProductQuantity.objects.filter(id__in=quantity_ids).values_list("product_id", flat=True))
+
+    conditions = Q()
+    if product_ids:
+        categories = set(Product.objects.filter(id__in=product_ids).values_list("category", flat=True))
+        conditions |= Q(days__id__in=days_for_products(product_ids), product_category__in=["", *categories])
+    day_ids = set(days) | (days_for_recipes(recipes) if recipes else set())
+    if day_ids:
+        conditions |= Q(days__id__in=day_ids)
+    if not conditions:
+        return []
+    return list(Order.objects.filter(conditions).order_by("id").values_list("id", flat=True).distinct())
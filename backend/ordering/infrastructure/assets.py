@@ -0,0 +1,78 @@
+import base64
+import binascii
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+
+from ordering.models import Asset
+
+
+ASSET_URL_PREFIX = "/api/assets/"
+
+INLINE_IMAGE_PATTERN = re.compile(
+    r"""(?P<prefix>\bsrc\s*=\s*(?P<quote>["']))data:(?P<content_type>image/[A-Za-z0-9.+-]+);base64,(?P<data>[A-Za-z0-9+/=\s]+)(?P=quote)"""
+)
+ASSET_URL_PATTERN = re.compile(r"""(?P<prefix>\bsrc\s*=\s*["'])[^"']*?/api/assets/(?P<sha>[0-9a-f]{64})/""")
+RELATIVE_ASSET_URL_PATTERN = re.compile(r"""(?P<prefix>\bsrc\s*=\s*["'])/api/assets/""")
+
+
+class AssetStore:
+    """Content-addressed blob store for template images.
+
+    Blobs live under ``ASSET_STORAGE_DIR`` at ``<first two hex chars>/<sha256>``
+    and have one ``Asset`` row each, so the same image embedded in several
+    templates is stored once.
+    """
+
+    def __init__(self, root: str | None = None) -> None:
+        self._root = Path(root or settings.ASSET_STORAGE_DIR)
+
+    def path_for(self, sha256: str) -> Path:
+        return self._root / sha256[:2] / sha256
+
+    def save(self, data: bytes, content_type: str) -> str:
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = self.path_for(sha256)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(descriptor, "wb") as blob:
+                blob.write(data)
+            os.replace(temporary, path)
+        Asset.objects.get_or_create(
+            sha256=sha256,
+            defaults={"content_type": content_type, "size": len(data)},
+        )
+        return sha256
+
+    def extract_inline_images(self, content: str) -> str:
+        """Moves base64 ``data:image/...`` sources into the store and points them at the asset endpoint."""
+
+        def replace(match: re.Match) -> str:
+            try:
+                data = base64.b64decode("".join(match.group("data").split()), validate=True)
+            except (binascii.Error, ValueError):
+                return match.group(0)
+            sha256 = self.save(data, match.group("content_type").lower())
+            return f"{match.group('prefix')}{ASSET_URL_PREFIX}{sha256}/{match.group('quote')}"
+
+        return INLINE_IMAGE_PATTERN.sub(replace, content)
+
+
+def normalize_template_content(content: str) -> str:
+    """Extracts inline images and strips the host from asset URLs, so content only stores relative references."""
+    if "data:image/" in content:
+        content = AssetStore().extract_inline_images(content)
+    return ASSET_URL_PATTERN.sub(lambda match: f"{match.group('prefix')}{ASSET_URL_PREFIX}{match.group('sha')}/", content)
+
+
+def absolute_asset_urls(content: str, base_url: str) -> str:
+    """Points relative asset references at ``base_url`` (scheme and host), for clients on another origin."""
+    if ASSET_URL_PREFIX not in content:
+        return content
+    absolute_prefix = f"{base_url.rstrip('/')}{ASSET_URL_PREFIX}"
+    return RELATIVE_ASSET_URL_PATTERN.sub(lambda match: f"{match.group('prefix')}{absolute_prefix}", content)
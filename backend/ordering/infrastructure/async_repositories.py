@@ -0,0 +1,79 @@
+from collections.abc import Callable, Iterable
+from datetime import date
+from typing import TypeVar
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from ordering.domain.entities import (
+    OrderGenerationInput,
+    OrderProductData,
+    ProductQuantityData,
+    ProductTotalData,
+)
+from ordering.domain.protocols import ProductTotalReader
+from ordering.infrastructure.repositories import DjangoOrderRepository, quantity_data, weighted_quantities
+from ordering.models import Day
+
+
+T = TypeVar("T")
+
+
+async def in_worker_thread(func: Callable[..., T], *args) -> T:
+    """Runs blocking ORM code in a pooled worker thread with its own connection.
+
+    Django's async ORM sends every query of a request to one thread, so two of
+    its awaits never overlap. Independent reads run here instead and overlap
+    with the rest of the request. The worker's connection is then closed or
+    kept according to ``CONN_MAX_AGE``, like at the end of a request.
+    """
+
+    def call() -> T:
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+
+    return await sync_to_async(call, thread_sensitive=False)()
+
+
+class AsyncDjangoProductQuantityRepository:
+    async def list_by_day_ids(self, day_ids: list[int], product_category: str | None = None) -> list[ProductQuantityData]:
+        return [quantity_data(quantity) async for quantity in weighted_quantities(day_ids, product_category)]
+
+
+class AsyncProductTotalRepository:
+    """Runs one of the ``PRODUCT_TOTAL_READERS`` in a worker thread."""
+
+    def __init__(self, reader: ProductTotalReader) -> None:
+        self._reader = reader
+
+    async def sum_by_day_ids(self, day_ids: list[int], product_category: str | None = None) -> list[ProductTotalData]:
+        return await in_worker_thread(self._reader.sum_by_day_ids, day_ids, product_category)
+
+
+class AsyncDjangoOrderRepository:
+    """Saves orders through ``DjangoOrderRepository``.
+
+    The async ORM has no transactions, so the order and its line batches are
+    written by the sync repository in the request's sync thread.
+    """
+
+    def __init__(self, batch_size: int | None = None) -> None:
+        self._writer = DjangoOrderRepository(batch_size)
+
+    async def create_order(
+        self,
+        payload: OrderGenerationInput,
+        products: Iterable[OrderProductData],
+        order_date: date,
+    ) -> int:
+        return await sync_to_async(self._writer.create_order)(payload, products, order_date)
+
+
+class AsyncDjangoDayRepository:
+    """Counts in a worker thread, so the check overlaps with the quantity read of the same request."""
+
+    async def validate_ids(self, day_ids: list[int]) -> bool:
+        existing_count = await in_worker_thread(Day.objects.filter(id__in=day_ids).count)
+        return existing_count == len(set(day_ids))
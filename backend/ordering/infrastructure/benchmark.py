@@ -0,0 +1,179 @@
+import platform
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import date
+
+import django
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ordering.domain.entities import OrderGenerationInput
+from ordering.domain.services import OrderGenerationService
+from ordering.infrastructure.catalog_snapshot import catalog_snapshot_reader
+from ordering.infrastructure.repositories import (
+    PRODUCT_TOTAL_READERS,
+    DjangoOrderRepository,
+    DjangoProductQuantityRepository,
+)
+from ordering.models import AgeGroup, Day, Product, ProductQuantity, Recipe
+
+
+DEFAULT_ENDPOINTS = (
+    "/api/products/",
+    "/api/products/?expand=quantities",
+    "/api/product-quantities/?expand=age_group_profiles",
+    "/api/recipes/?expand=product_details",
+    "/api/days/?expand=recipe_details",
+    "/api/orders/",
+)
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    runs: int
+    min_ms: float
+    median_ms: float
+    mean_ms: float
+    max_ms: float
+    queries: int
+    peak_memory_kb: float
+
+
+class _Rollback(Exception):
+    pass
+
+
+class BenchmarkRunner:
+    """Times the order generation stack and the list endpoints against the current database.
+
+    Every case runs ``repeat`` timed passes and one extra pass under
+    ``tracemalloc`` for peak memory, so tracing does not skew the timings.
+    Writes are rolled back and the response cache is cleared before each
+    request, so runs do not depend on each other.
+    """
+
+    def __init__(self, repeat: int = 5, day_limit: int | None = None) -> None:
+        self._repeat = repeat
+        self._day_limit = day_limit
+
+    def run(self, endpoints: tuple[str, ...] = DEFAULT_ENDPOINTS) -> dict:
+        day_ids = list(Day.objects.order_by("id").values_list("id", flat=True)[: self._day_limit])
+        if not day_ids:
+            raise ValueError("The catalog has no days. Seed one with seed_catalog first.")
+
+        payload = OrderGenerationInput(name="Benchmark", date=date.today(), day_ids=day_ids)
+        quantity_reader = DjangoProductQuantityRepository()
+        service = OrderGenerationService(detail_mode=settings.ORDER_DETAIL_MODE)
+        product_quantities = quantity_reader.list_by_day_ids(day_ids)
+        order_products = service.generate_order_products(payload, product_quantities)
+
+        results = [
+            self.measure(
+                "DjangoProductQuantityRepository.list_by_day_ids",
+                lambda: quantity_reader.list_by_day_ids(day_ids),
+            ),
+            *(
+                [
+                    self.measure(
+                        "SnapshotProductQuantityRepository.list_by_day_ids",
+                        lambda: catalog_snapshot_reader.list_by_day_ids(day_ids),
+                    )
+                ]
+                if catalog_snapshot_reader is not None and catalog_snapshot_reader.rebuild() is not None
+                else []
+            ),
+            self.measure(
+                "OrderGenerationService.generate_order_products",
+                lambda: service.generate_order_products(payload, product_quantities),
+            ),
+            *(
+                self.measure(f"{reader_class.__name__}.sum_by_day_ids", lambda reader=reader_class(): reader.sum_by_day_ids(day_ids))
+                for reader_class in PRODUCT_TOTAL_READERS.values()
+            ),
+            self.measure(
+                "DjangoOrderRepository.create_order",
+                lambda: self._rolled_back(
+                    lambda: DjangoOrderRepository().create_order(payload, order_products, payload.date)
+                ),
+            ),
+        ]
+
+        client = Client()
+        cache = caches[settings.API_CACHE_ALIAS]
+        for path in endpoints:
+            results.append(self.measure(f"GET {path}", lambda path=path: self._get(client, cache, path)))
+
+        return {
+            "meta": self._meta(len(day_ids), len(order_products)),
+            "results": [asdict(result) for result in results],
+        }
+
+    def measure(self, name: str, case: Callable[[], object]) -> BenchmarkResult:
+        timings = []
+        queries = 0
+        for _ in range(self._repeat):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                case()
+                timings.append((time.perf_counter() - started) * 1000)
+            queries = len(captured.captured_queries)
+
+        tracemalloc.start()
+        try:
+            case()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return BenchmarkResult(
+            name=name,
+            runs=self._repeat,
+            min_ms=round(min(timings), 3),
+            median_ms=round(statistics.median(timings), 3),
+            mean_ms=round(statistics.fmean(timings), 3),
+            max_ms=round(max(timings), 3),
+            queries=queries,
+            peak_memory_kb=round(peak / 1024, 1),
+        )
+
+    @staticmethod
+    def _rolled_back(write: Callable[[], object]) -> None:
+        try:
+            with transaction.atomic():
+                write()
+                raise _Rollback
+        except _Rollback:
+            pass
+
+    @staticmethod
+    def _get(client: Client, cache, path: str) -> None:
+        cache.clear()
+        response = client.get(path)
+        if response.status_code != 200:
+            raise ValueError(f"GET {path} returned {response.status_code}.")
+
+    def _meta(self, day_count: int, line_count: int) -> dict:
+        return {
+            "timestamp": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "repeat": self._repeat,
+            "catalog": {
+                "products": Product.objects.count(),
+                "product_quantities": ProductQuantity.objects.count(),
+                "age_groups": AgeGroup.objects.count(),
+                "recipes": Recipe.objects.count(),
+                "days": Day.objects.count(),
+            },
+            "selected_days": day_count,
+            "order_lines": line_count,
+        }
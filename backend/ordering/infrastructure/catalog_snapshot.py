@@ -0,0 +1,355 @@
+import json
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from array import array
+from collections import Counter
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from ordering.domain.calendar import day_occurrences
+from ordering.domain.entities import AgeGroupData, ProductQuantityData
+from ordering.infrastructure.expressions import from_cents
+from ordering.infrastructure.repositories import DjangoProductQuantityRepository
+from ordering.infrastructure.versions import catalog_version
+from ordering.models import AgeGroup, Day, Product, ProductQuantity, Recipe
+
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"MCSNAP01"
+PREFIX = struct.Struct("<8sI")
+ALIGNMENT = 8
+
+
+def database_identity() -> str:
+    database = settings.DATABASES["default"]
+    return f"{database['ENGINE']}:{database.get('HOST', '')}:{database.get('PORT', '')}:{database['NAME']}"
+
+
+class CatalogSnapshotBuilder:
+    """Serializes the catalog graph into the snapshot file format.
+
+    Strings are interned into one UTF-8 blob. Quantity, headcount and
+    membership data are typed arrays; the day -> recipe -> product -> quantity
+    graph and the age groups of each quantity use CSR layout (an offsets array
+    indexing into a flat array of row numbers). Rows are numbered by id order,
+    so reading them in row order gives the order of the database reader.
+    """
+
+    def build(self) -> tuple[tuple[int, ...], dict[str, array]] | None:
+        """Returns the catalog version and the arrays, or ``None`` if the catalog changed while it was read."""
+        with transaction.atomic():
+            version = catalog_version()
+            columns = self._columns()
+            if catalog_version() != version:
+                return None
+        return version, columns
+
+    def write(self, path: str) -> tuple[int, ...] | None:
+        built = self.build()
+        if built is None:
+            return None
+        version, columns = built
+
+        sections = {}
+        offset = 0
+        for name, values in columns.items():
+            sections[name] = [values.typecode, offset, len(values)]
+            offset += _aligned(len(values) * values.itemsize)
+        header = json.dumps(
+            {"version": list(version), "database": database_identity(), "sections": sections}
+        ).encode()
+        data_start = _aligned(PREFIX.size + len(header))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, prefix=".catalog-", delete=False) as output:
+            try:
+                output.write(PREFIX.pack(MAGIC, len(header)) + header)
+                output.write(bytes(data_start - PREFIX.size - len(header)))
+                for values in columns.values():
+                    size = len(values) * values.itemsize
+                    output.write(values.tobytes())
+                    output.write(bytes(_aligned(size) - size))
+                output.flush()
+                os.fsync(output.fileno())
+            except BaseException:
+                os.unlink(output.name)
+                raise
+        os.replace(output.name, path)
+        return version
+
+    @staticmethod
+    def _columns() -> dict[str, array]:
+        strings: dict[str, int] = {}
+
+        def intern(value: str) -> int:
+            return strings.setdefault(value, len(strings))
+
+        product_rows = {}
+        product_name, product_category = array("i"), array("i")
+        for row, (product_id, name, category) in enumerate(
+            Product.objects.order_by("id").values_list("id", "name", "category")
+        ):
+            product_rows[product_id] = row
+            product_name.append(intern(name))
+            product_category.append(intern(category))
+
+        age_group_rows = {}
+        age_group_name, age_group_headcount = array("i"), array("q")
+        for row, (age_group_id, name, headcount) in enumerate(
+            AgeGroup.objects.order_by("id").values_list("id", "name", "quantity")
+        ):
+            age_group_rows[age_group_id] = row
+            age_group_name.append(intern(name))
+            age_group_headcount.append(headcount)
+
+        quantity_rows = {}
+        quantity_unit, quantity_package, quantity_cents = array("i"), array("i"), array("q")
+        quantities_by_product: list[list[int]] = [[] for _ in product_rows]
+        for row, (quantity_id, product_id, unit, package, amount) in enumerate(
+            ProductQuantity.objects.order_by("id").values_list(
+                "id", "product_id", "unit_of_measure", "package_type", "quantity"
+            )
+        ):
+            quantity_rows[quantity_id] = row
+            quantity_unit.append(intern(unit))
+            quantity_package.append(intern(package))
+            quantity_cents.append(int(amount * 100))
+            quantities_by_product[product_rows[product_id]].append(row)
+
+        age_groups_by_quantity: list[list[int]] = [[] for _ in quantity_rows]
+        for quantity_id, age_group_id in ProductQuantity.age_groups.through.objects.order_by(
+            "productquantity_id", "agegroup_id"
+        ).values_list("productquantity_id", "agegroup_id"):
+            age_groups_by_quantity[quantity_rows[quantity_id]].append(age_group_rows[age_group_id])
+
+        recipe_ids = Recipe.objects.order_by("id").values_list("id", flat=True)
+        recipe_rows = {recipe_id: row for row, recipe_id in enumerate(recipe_ids)}
+        products_by_recipe: list[list[int]] = [[] for _ in recipe_rows]
+        for recipe_id, product_id in Recipe.products.through.objects.values_list("recipe_id", "product_id"):
+            products_by_recipe[recipe_rows[recipe_id]].append(product_rows[product_id])
+
+        day_ids = array("q", Day.objects.order_by("id").values_list("id", flat=True))
+        day_rows = {day_id: row for row, day_id in enumerate(day_ids)}
+        recipes_by_day: list[list[int]] = [[] for _ in day_rows]
+        for day_id, recipe_id in Day.recipes.through.objects.values_list("day_id", "recipe_id"):
+            recipes_by_day[day_rows[day_id]].append(recipe_rows[recipe_id])
+
+        encoded = [value.encode() for value in strings]
+        string_offsets = array("q", [0])
+        for value in encoded:
+            string_offsets.append(string_offsets[-1] + len(value))
+
+        product_quantity_offsets, product_quantities = _csr(quantities_by_product)
+        quantity_age_group_offsets, quantity_age_groups = _csr(age_groups_by_quantity)
+        recipe_product_offsets, recipe_products = _csr(products_by_recipe)
+        day_recipe_offsets, day_recipes = _csr(recipes_by_day)
+        return {
+            "string_offsets": string_offsets,
+            "string_data": array("B", b"".join(encoded)),
+            "product_name": product_name,
+            "product_category": product_category,
+            "product_quantity_offsets": product_quantity_offsets,
+            "product_quantities": product_quantities,
+            "age_group_name": age_group_name,
+            "age_group_headcount": age_group_headcount,
+            "quantity_unit": quantity_unit,
+            "quantity_package": quantity_package,
+            "quantity_cents": quantity_cents,
+            "quantity_age_group_offsets": quantity_age_group_offsets,
+            "quantity_age_groups": quantity_age_groups,
+            "recipe_product_offsets": recipe_product_offsets,
+            "recipe_products": recipe_products,
+            "day_ids": day_ids,
+            "day_recipe_offsets": day_recipe_offsets,
+            "day_recipes": day_recipes,
+        }
+
+
+class CatalogSnapshot:
+    """Read-only view of a snapshot file mapped into memory.
+
+    The arrays are ``memoryview`` casts over the mapping, so nothing is copied
+    and every worker process reading the same file shares its pages through
+    the OS page cache. Only the strings a read touches are decoded and kept.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as source:
+            stat = os.fstat(source.fileno())
+            self.file_id = (stat.st_ino, stat.st_mtime_ns)
+            self._buffer = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, header_size = PREFIX.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a catalog snapshot.")
+        header = json.loads(self._buffer[PREFIX.size : PREFIX.size + header_size])
+        self.version = tuple(header["version"])
+        self.database = header["database"]
+
+        data = memoryview(self._buffer)[_aligned(PREFIX.size + header_size) :]
+        self._columns = {
+            name: data[offset : offset + count * array(typecode).itemsize].cast(typecode)
+            for name, (typecode, offset, count) in header["sections"].items()
+        }
+        self._day_rows = {day_id: row for row, day_id in enumerate(self._columns["day_ids"])}
+        self._strings: dict[int, str] = {}
+
+    @property
+    def size(self) -> int:
+        return len(self._buffer)
+
+    def list_by_day_ids(self, day_ids: list[int], product_category: str | None = None) -> list[ProductQuantityData]:
+        columns = self._columns
+        day_recipe_offsets, day_recipes = columns["day_recipe_offsets"], columns["day_recipes"]
+        recipe_product_offsets, recipe_products = columns["recipe_product_offsets"], columns["recipe_products"]
+
+        paths: Counter[int] = Counter()
+        for day_id, times in day_occurrences(day_ids).items():
+            day = self._day_rows.get(day_id)
+            if day is None:
+                continue
+            for recipe in day_recipes[day_recipe_offsets[day] : day_recipe_offsets[day + 1]]:
+                for product in recipe_products[recipe_product_offsets[recipe] : recipe_product_offsets[recipe + 1]]:
+                    paths[product] += times
+
+        if product_category:
+            categories = columns["product_category"]
+            paths = Counter(
+                {
+                    product: count
+                    for product, count in paths.items()
+                    if self._string(categories[product]) == product_category
+                }
+            )
+
+        offsets, quantities = columns["product_quantity_offsets"], columns["product_quantities"]
+        rows = sorted(
+            (quantity, product, count)
+            for product, count in paths.items()
+            for quantity in quantities[offsets[product] : offsets[product + 1]]
+        )
+
+        return [self._quantity_data(quantity, product, count) for quantity, product, count in rows]
+
+    def _quantity_data(self, quantity: int, product: int, occurrences: int) -> ProductQuantityData:
+        columns = self._columns
+        offsets, age_groups = columns["quantity_age_group_offsets"], columns["quantity_age_groups"]
+        return ProductQuantityData(
+            product_name=self._string(columns["product_name"][product]),
+            unit_of_measure=self._string(columns["quantity_unit"][quantity]),
+            package_type=self._string(columns["quantity_package"][quantity]),
+            quantity=from_cents(columns["quantity_cents"][quantity]),
+            age_groups=[
+                AgeGroupData(
+                    name=self._string(columns["age_group_name"][age_group]),
+                    quantity=columns["age_group_headcount"][age_group],
+                )
+                for age_group in age_groups[offsets[quantity] : offsets[quantity + 1]]
+            ],
+            occurrences=occurrences,
+        )
+
+    def _string(self, index: int) -> str:
+        value = self._strings.get(index)
+        if value is None:
+            offsets = self._columns["string_offsets"]
+            value = bytes(self._columns["string_data"][offsets[index] : offsets[index + 1]]).decode()
+            self._strings[index] = value
+        return value
+
+
+class SnapshotProductQuantityRepository:
+    """``ProductQuantityReader`` backed by the memory-mapped catalog snapshot at ``path``.
+
+    Every read compares the snapshot with the current catalog version. A stale
+    snapshot is first reopened, in case another process already wrote a new
+    one; if it is still stale the read falls back to the database and a
+    background thread writes a fresh snapshot for the following reads.
+    """
+
+    def __init__(self, path: str, fallback: DjangoProductQuantityRepository | None = None) -> None:
+        self._path = path
+        self._fallback = fallback or DjangoProductQuantityRepository()
+        self._database = database_identity()
+        self._snapshot: CatalogSnapshot | None = None
+        self._lock = threading.Lock()
+        self._rebuilding = threading.Lock()
+
+    def list_by_day_ids(self, day_ids: list[int], product_category: str | None = None) -> list[ProductQuantityData]:
+        snapshot = self.current(catalog_version())
+        if snapshot is None:
+            return self._fallback.list_by_day_ids(day_ids, product_category)
+        return snapshot.list_by_day_ids(day_ids, product_category)
+
+    def current(self, version: tuple[int, ...]) -> CatalogSnapshot | None:
+        """Returns the snapshot if it matches ``version``, scheduling a rebuild when it does not."""
+        snapshot = self._snapshot
+        if self._is_current(snapshot, version):
+            return snapshot
+
+        with self._lock:
+            snapshot = self._reopen()
+        if self._is_current(snapshot, version):
+            return snapshot
+        self._schedule_rebuild()
+        return None
+
+    def rebuild(self) -> CatalogSnapshot | None:
+        version = CatalogSnapshotBuilder().write(self._path)
+        if version is None:
+            return None
+        with self._lock:
+            return self._reopen()
+
+    def _is_current(self, snapshot: CatalogSnapshot | None, version: tuple[int, ...]) -> bool:
+        return snapshot is not None and snapshot.version == version and snapshot.database == self._database
+
+    def _reopen(self) -> CatalogSnapshot | None:
+        try:
+            stat = os.stat(self._path)
+        except FileNotFoundError:
+            return self._snapshot
+        if self._snapshot is None or self._snapshot.file_id != (stat.st_ino, stat.st_mtime_ns):
+            try:
+                self._snapshot = CatalogSnapshot(self._path)
+            except (OSError, ValueError, KeyError):
+                logger.exception("Could not open the catalog snapshot %s", self._path)
+        return self._snapshot
+
+    def _schedule_rebuild(self) -> None:
+        if not self._rebuilding.acquire(blocking=False):
+            return
+        threading.Thread(target=self._rebuild_in_background, name="catalog-snapshot", daemon=True).start()
+
+    def _rebuild_in_background(self) -> None:
+        try:
+            self.rebuild()
+        except Exception:
+            logger.exception("Catalog snapshot rebuild failed")
+        finally:
+            self._rebuilding.release()
+            close_old_connections()
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGNMENT) * ALIGNMENT
+
+
+def _csr(rows: list[list[int]]) -> tuple[array, array]:
+    offsets, values = array("i", [0]), array("i")
+    for row in rows:
+        values.extend(row)
+        offsets.append(len(values))
+    return offsets, values
+
+
+catalog_snapshot_reader = (
+    SnapshotProductQuantityRepository(settings.CATALOG_SNAPSHOT_PATH) if settings.CATALOG_SNAPSHOT_PATH else None
+)
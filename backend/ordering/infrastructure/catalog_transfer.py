@@ -0,0 +1,325 @@
+import codecs
+import csv
+import io
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from typing import IO
+
+from django.db import transaction
+
+from ordering.infrastructure.day_demand import DayDemandRefresher, days_for_quantities, days_for_recipes
+from ordering.infrastructure.search import SearchIndex
+from ordering.infrastructure.versions import bump_version
+from ordering.models import AgeGroup, Day, Product, ProductQuantity, Recipe
+
+
+FILE_FORMATS = ("csv", "jsonl")
+LIST_SEPARATOR = "|"
+EXPORT_CHUNK_SIZE = 2000
+BULK_BATCH_SIZE = 1000
+
+RESOURCE_FIELDS = {
+    "product": ("name", "category"),
+    "product_quantity": ("product", "unit_of_measure", "quantity", "package_type", "age_groups"),
+    "recipe": ("name", "products"),
+    "day": ("name", "recipes"),
+}
+LIST_FIELDS = {"age_groups", "products", "recipes"}
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+@dataclass
+class RowError:
+    row: int
+    message: str
+
+
+@dataclass
+class ImportReport:
+    resource: str
+    dry_run: bool = False
+    created: int = 0
+    updated: int = 0
+    errors: list[RowError] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def read_rows(stream: IO[bytes], file_format: str) -> Iterator[dict]:
+    """Parses a CSV (with header) or JSON Lines byte stream one record at a time."""
+    text = codecs.getreader("utf-8-sig")(stream)
+    if file_format == "csv":
+        yield from csv.DictReader(text)
+        return
+
+    for line in text:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield {"__error__": f"Invalid JSON: {exc.msg}."}
+            continue
+        yield record if isinstance(record, dict) else {"__error__": "Each line must be a JSON object."}
+
+
+def write_rows(rows: Iterable[dict], resource: str, file_format: str) -> Iterator[str]:
+    """Serializes rows as CSV (with header) or JSON Lines, one line per yielded string."""
+    fields = RESOURCE_FIELDS[resource]
+    if file_format == "jsonl":
+        for row in rows:
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for row in rows:
+        writer.writerow(
+            [LIST_SEPARATOR.join(row[name]) if name in LIST_FIELDS else row[name] for name in fields]
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_rows(resource: str) -> Iterator[dict]:
+    """Yields every object of ``resource`` with related objects referenced by name, in id order.
+
+    Objects are read with ``iterator()`` in chunks, so memory stays flat
+    whatever the catalog size.
+    """
+    if resource == "product":
+        for name, category in Product.objects.order_by("id").values_list("name", "category").iterator(EXPORT_CHUNK_SIZE):
+            yield {"name": name, "category": category}
+    elif resource == "product_quantity":
+        quantities = ProductQuantity.objects.select_related("product").prefetch_related("age_groups").order_by("id")
+        for quantity in quantities.iterator(EXPORT_CHUNK_SIZE):
+            yield {
+                "product": quantity.product.name,
+                "unit_of_measure": quantity.unit_of_measure,
+                "quantity": str(quantity.quantity),
+                "package_type": quantity.package_type,
+                "age_groups": sorted(age_group.name for age_group in quantity.age_groups.all()),
+            }
+    elif resource == "recipe":
+        for recipe in Recipe.objects.prefetch_related("products").order_by("id").iterator(EXPORT_CHUNK_SIZE):
+            yield {"name": recipe.name, "products": sorted(product.name for product in recipe.products.all())}
+    elif resource == "day":
+        for day in Day.objects.prefetch_related("recipes").order_by("id").iterator(EXPORT_CHUNK_SIZE):
+            yield {"name": day.name, "recipes": sorted(recipe.name for recipe in day.recipes.all())}
+    else:
+        raise ValueError(f"Unknown resource '{resource}'.")
+
+
+class CatalogImporter:
+    """Creates or updates catalog objects from parsed rows in one transaction.
+
+    Rows are matched to existing objects by natural key (name, or product,
+    unit, package type and quantity for product quantities) and related
+    objects are referenced by name, resolved through lookup tables loaded
+    once. Nothing is written unless every row is valid. Related memberships
+    are replaced with bulk inserts into the m2m tables. The day demand table,
+    the search index and the catalog versions are refreshed once at the end.
+    """
+
+    def __init__(self, resource: str) -> None:
+        if resource not in RESOURCE_FIELDS:
+            raise ValueError(f"Unknown resource '{resource}'.")
+        self._resource = resource
+
+    def run(self, rows: Iterable[dict], dry_run: bool = False) -> ImportReport:
+        report = ImportReport(resource=self._resource, dry_run=dry_run)
+        parse_row = getattr(self, f"_parse_{self._resource}")
+        lookups = self._lookups()
+        parsed: dict[tuple, tuple] = {}
+
+        for number, row in enumerate(rows, start=1):
+            try:
+                if "__error__" in row:
+                    raise InvalidRow(row["__error__"])
+                key, values = parse_row(row, lookups)
+                if key in parsed:
+                    raise InvalidRow(f"Duplicate of row {parsed[key][0]}.")
+                parsed[key] = (number, values)
+            except InvalidRow as exc:
+                report.errors.append(RowError(row=number, message=str(exc)))
+
+        if report.errors:
+            return report
+        if dry_run:
+            existing = lookups["existing"]
+            report.updated = sum(
+                1 for key in parsed if (key if self._resource == "product_quantity" else key[0]) in existing
+            )
+            report.created = len(parsed) - report.updated
+            return report
+
+        with transaction.atomic():
+            getattr(self, f"_write_{self._resource}")(
+                {key: values for key, (_, values) in parsed.items()}, lookups, report
+            )
+        return report
+
+    def _lookups(self) -> dict[str, dict]:
+        if self._resource == "product":
+            return {"existing": dict(Product.objects.values_list("name", "id"))}
+        if self._resource == "product_quantity":
+            return {
+                "products": dict(Product.objects.values_list("name", "id")),
+                "age_groups": dict(AgeGroup.objects.values_list("name", "id")),
+                "existing": {
+                    (product_id, unit, package_type, quantity): quantity_id
+                    for quantity_id, product_id, unit, package_type, quantity in ProductQuantity.objects.values_list(
+                        "id", "product_id", "unit_of_measure", "package_type", "quantity"
+                    )
+                },
+            }
+        if self._resource == "recipe":
+            return {
+                "products": dict(Product.objects.values_list("name", "id")),
+                "existing": dict(Recipe.objects.values_list("name", "id")),
+            }
+        return {
+            "recipes": dict(Recipe.objects.values_list("name", "id")),
+            "existing": dict(Day.objects.values_list("name", "id")),
+        }
+
+    @staticmethod
+    def _text(row: dict, name: str, max_length: int) -> str:
+        value = str(row.get(name) or "").strip()
+        if not value:
+            raise InvalidRow(f"'{name}' is required.")
+        if len(value) > max_length:
+            raise InvalidRow(f"'{name}' must have at most {max_length} characters.")
+        return value
+
+    @staticmethod
+    def _names(row: dict, name: str, lookup: dict[str, int]) -> list[int]:
+        value = row.get(name) or []
+        names = value if isinstance(value, list) else str(value).split(LIST_SEPARATOR)
+        names = [str(item).strip() for item in names if str(item).strip()]
+        missing = sorted({item for item in names if item not in lookup})
+        if missing:
+            raise InvalidRow(f"Unknown {name.replace('_', ' ')}: {', '.join(missing)}.")
+        return sorted({lookup[item] for item in names})
+
+    def _parse_product(self, row: dict, lookups: dict) -> tuple[tuple, tuple]:
+        name = self._text(row, "name", 120)
+        return (name,), (name, self._text(row, "category", 80))
+
+    def _parse_product_quantity(self, row: dict, lookups: dict) -> tuple[tuple, tuple]:
+        product_name = self._text(row, "product", 120)
+        product_id = lookups["products"].get(product_name)
+        if product_id is None:
+            raise InvalidRow(f"Unknown product: {product_name}.")
+        unit = self._text(row, "unit_of_measure", 20)
+        package_type = self._text(row, "package_type", 50)
+        try:
+            quantity = Decimal(self._text(row, "quantity", 20))
+        except InvalidOperation:
+            raise InvalidRow("'quantity' must be a number.")
+        if not quantity.is_finite() or quantity != quantity.quantize(Decimal("0.01")) or abs(quantity) >= Decimal("1e8"):
+            raise InvalidRow("'quantity' must have at most 8 integer digits and 2 decimal places.")
+        quantity = quantity.quantize(Decimal("0.01"))
+        age_group_ids = self._names(row, "age_groups", lookups["age_groups"])
+        key = (product_id, unit, package_type, quantity)
+        return key, (key, age_group_ids)
+
+    def _parse_recipe(self, row: dict, lookups: dict) -> tuple[tuple, tuple]:
+        name = self._text(row, "name", 120)
+        return (name,), (name, self._names(row, "products", lookups["products"]))
+
+    def _parse_day(self, row: dict, lookups: dict) -> tuple[tuple, tuple]:
+        name = self._text(row, "name", 50)
+        return (name,), (name, self._names(row, "recipes", lookups["recipes"]))
+
+    def _write_product(self, parsed: dict, lookups: dict, report: ImportReport) -> None:
+        existing = lookups["existing"]
+        new = Product.objects.bulk_create(
+            [Product(name=name, category=category) for (name, category) in parsed.values() if name not in existing],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        changed = [
+            Product(id=existing[name], name=name, category=category)
+            for (name, category) in parsed.values()
+            if name in existing
+        ]
+        Product.objects.bulk_update(changed, ["category"], batch_size=BULK_BATCH_SIZE)
+        report.created, report.updated = len(new), len(changed)
+
+        SearchIndex().index("product", [product.pk for product in [*new, *changed]])
+        bump_version("product")
+
+    def _write_product_quantity(self, parsed: dict, lookups: dict, report: ImportReport) -> None:
+        existing = lookups["existing"]
+        new = ProductQuantity.objects.bulk_create(
+            [
+                ProductQuantity(product_id=product_id, unit_of_measure=unit, package_type=package_type, quantity=quantity)
+                for (product_id, unit, package_type, quantity) in parsed
+                if (product_id, unit, package_type, quantity) not in existing
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        ids = {
+            **existing,
+            **{
+                (quantity.product_id, quantity.unit_of_measure, quantity.package_type, quantity.quantity): quantity.pk
+                for quantity in new
+            },
+        }
+        memberships = {ids[key]: age_group_ids for key, age_group_ids in parsed.values()}
+        self._replace_memberships(ProductQuantity.age_groups.through, "productquantity_id", "agegroup_id", memberships)
+        report.created, report.updated = len(new), len(parsed) - len(new)
+
+        DayDemandRefresher().refresh_days(days_for_quantities(memberships))
+        bump_version("product_quantity")
+
+    def _write_recipe(self, parsed: dict, lookups: dict, report: ImportReport) -> None:
+        ids = self._create_named(Recipe, parsed, lookups["existing"], report)
+        memberships = {ids[name]: product_ids for name, product_ids in parsed.values()}
+        previous_days = days_for_recipes(memberships)
+        self._replace_memberships(Recipe.products.through, "recipe_id", "product_id", memberships)
+
+        SearchIndex().index("recipe", memberships)
+        DayDemandRefresher().refresh_days(previous_days | days_for_recipes(memberships))
+        bump_version("recipe")
+
+    def _write_day(self, parsed: dict, lookups: dict, report: ImportReport) -> None:
+        ids = self._create_named(Day, parsed, lookups["existing"], report)
+        memberships = {ids[name]: recipe_ids for name, recipe_ids in parsed.values()}
+        self._replace_memberships(Day.recipes.through, "day_id", "recipe_id", memberships)
+
+        DayDemandRefresher().refresh_days(memberships)
+        bump_version("day")
+
+    @staticmethod
+    def _create_named(model, parsed: dict, existing: dict[str, int], report: ImportReport) -> dict[str, int]:
+        new = model.objects.bulk_create(
+            [model(name=name) for (name, _) in parsed.values() if name not in existing],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        report.created, report.updated = len(new), len(parsed) - len(new)
+        return {**existing, **{instance.name: instance.pk for instance in new}}
+
+    @staticmethod
+    def _replace_memberships(through, source_field: str, target_field: str, memberships: dict[int, list[int]]) -> None:
+        source_ids = list(memberships)
+        for start in range(0, len(source_ids), BULK_BATCH_SIZE):
+            through.objects.filter(**{f"{source_field}__in": source_ids[start:start + BULK_BATCH_SIZE]}).delete()
+        through.objects.bulk_create(
+            [
+                through(**{source_field: source_id, target_field: target_id})
+                for source_id, target_ids in memberships.items()
+                for target_id in target_ids
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
@@ -0,0 +1,101 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from ordering.domain.calendar import day_occurrences
+from ordering.domain.entities import OrderGenerationInput, OrderProductData
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class OrderComputationCache:
+    """Bounded, thread-safe LRU of computed order lines.
+
+    Keys combine the selected days, the category filter, the detail mode, the
+    readers that compute the lines (engine and quantity reader) and the
+    catalog version, so each engine computes its own result and any catalog
+    write makes older entries unreachable; they age out through LRU eviction.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._max_size = max_size
+        self._entries: OrderedDict[Hashable, list[OrderProductData]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(
+        payload: OrderGenerationInput,
+        detail_mode: str,
+        catalog_version: Hashable,
+        readers: Hashable = (),
+    ) -> Hashable:
+        days = tuple(sorted(day_occurrences(payload.day_ids).items()))
+        return (days, payload.product_category or None, detail_mode, readers, catalog_version)
+
+    def get_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], list[OrderProductData]],
+    ) -> list[OrderProductData]:
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        return self._store(key, compute())
+
+    async def aget_or_compute(
+        self,
+        key: Hashable,
+        compute: Callable[[], Awaitable[list[OrderProductData]]],
+    ) -> list[OrderProductData]:
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        return self._store(key, await compute())
+
+    def _lookup(self, key: Hashable) -> list[OrderProductData] | None:
+        with self._lock:
+            if key in self._entries:
+                self._hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._misses += 1
+            return None
+
+    def _store(self, key: Hashable, value: list[OrderProductData]) -> list[OrderProductData]:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                size=len(self._entries),
+                max_size=self._max_size,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+
+order_computation_cache = OrderComputationCache(max_size=settings.ORDER_COMPUTATION_CACHE_SIZE)
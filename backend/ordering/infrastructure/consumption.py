@@ -0,0 +1,215 @@
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+
+from ordering.models import ConsumptionRollup, OrderProduct, Product
+
+
+PERIODS = (ConsumptionRollup.WEEK, ConsumptionRollup.MONTH)
+GROUPINGS = ("product", "category")
+KEY_CHUNK_SIZE = 300
+ROLLUP_BATCH_SIZE = 500
+VALUE_FIELDS = ("quantity", "total", "qty_package", "lines")
+
+RollupKey = tuple[str, date, str, str, str]
+RollupValues = tuple[Decimal, int, int, int]
+
+
+def period_start(period: str, day: date) -> date:
+    if period == ConsumptionRollup.WEEK:
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+@dataclass
+class ConsumptionDrift:
+    missing: list[RollupKey] = field(default_factory=list)
+    stale: list[RollupKey] = field(default_factory=list)
+    unexpected: list[RollupKey] = field(default_factory=list)
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.missing or self.stale or self.unexpected)
+
+
+class ConsumptionRollupWriter:
+    """Collects order line changes and applies them to ``ConsumptionRollup`` as deltas.
+
+    Every line counts towards the week and the month of its order date. Lines
+    are added with ``sign=1`` when saved and ``sign=-1`` when removed, and
+    ``save`` adds the summed deltas to the stored rows, so writing an order
+    touches one row per period and line key instead of re-reading history.
+    """
+
+    def __init__(self) -> None:
+        self._deltas: dict[RollupKey, list] = {}
+
+    def add(self, order_date: date, line: OrderProduct, sign: int = 1) -> None:
+        for period in PERIODS:
+            key = (period, period_start(period, order_date), line.name, line.package_type, line.unit_of_measure)
+            delta = self._deltas.setdefault(key, [Decimal("0"), 0, 0, 0])
+            delta[0] += sign * line.quantity
+            delta[1] += sign * line.total
+            delta[2] += sign * line.qty_package
+            delta[3] += sign
+
+    def save(self) -> None:
+        deltas = {key: values for key, values in self._deltas.items() if any(values)}
+        self._deltas = {}
+        if not deltas:
+            return
+
+        keys = sorted(deltas)
+        with transaction.atomic():
+            ConsumptionRollup.objects.bulk_create(
+                [ConsumptionRollup(**_key_fields(key)) for key in keys],
+                ignore_conflicts=True,
+                batch_size=ROLLUP_BATCH_SIZE,
+            )
+            changed, emptied = [], []
+            for start in range(0, len(keys), KEY_CHUNK_SIZE):
+                chunk = keys[start:start + KEY_CHUNK_SIZE]
+                rows = ConsumptionRollup.objects.select_for_update().filter(
+                    period__in={key[0] for key in chunk},
+                    period_start__in={key[1] for key in chunk},
+                    name__in={key[2] for key in chunk},
+                )
+                for row in rows:
+                    delta = deltas.get(_row_key(row))
+                    if delta is None:
+                        continue
+                    row.quantity += delta[0]
+                    row.total += delta[1]
+                    row.qty_package += delta[2]
+                    row.lines += delta[3]
+                    (changed if row.lines > 0 else emptied).append(row)
+            ConsumptionRollup.objects.bulk_update(changed, VALUE_FIELDS, batch_size=ROLLUP_BATCH_SIZE)
+            ConsumptionRollup.objects.filter(id__in=[row.id for row in emptied]).delete()
+
+
+class ConsumptionRollupBuilder:
+    """Recomputes ``ConsumptionRollup`` from the stored order lines."""
+
+    def rebuild(self) -> int:
+        rows = [
+            ConsumptionRollup(
+                **_key_fields(key),
+                quantity=quantity,
+                total=total,
+                qty_package=qty_package,
+                lines=lines,
+            )
+            for key, (quantity, total, qty_package, lines) in self._compute().items()
+        ]
+        with transaction.atomic():
+            ConsumptionRollup.objects.all().delete()
+            ConsumptionRollup.objects.bulk_create(rows, batch_size=ROLLUP_BATCH_SIZE)
+        return len(rows)
+
+    def check(self) -> ConsumptionDrift:
+        expected = self._compute()
+        stored = {
+            _row_key(row): (row.quantity, row.total, row.qty_package, row.lines)
+            for row in ConsumptionRollup.objects.all()
+        }
+        return ConsumptionDrift(
+            missing=sorted(expected.keys() - stored.keys()),
+            stale=sorted(key for key in expected.keys() & stored.keys() if expected[key] != stored[key]),
+            unexpected=sorted(stored.keys() - expected.keys()),
+        )
+
+    def _compute(self) -> dict[RollupKey, RollupValues]:
+        truncations = {
+            ConsumptionRollup.WEEK: TruncWeek("order__date"),
+            ConsumptionRollup.MONTH: TruncMonth("order__date"),
+        }
+        result = {}
+        for period, truncation in truncations.items():
+            rows = (
+                OrderProduct.objects.annotate(period_start=truncation)
+                .values("period_start", "name", "package_type", "unit_of_measure")
+                .annotate(
+                    sum_quantity=Sum("quantity"),
+                    sum_total=Sum("total"),
+                    sum_qty_package=Sum("qty_package"),
+                    line_count=Count("id"),
+                )
+                .order_by()
+            )
+            for row in rows:
+                key = (period, row["period_start"], row["name"], row["package_type"], row["unit_of_measure"])
+                result[key] = (row["sum_quantity"], row["sum_total"], row["sum_qty_package"], row["line_count"])
+        return result
+
+
+def consumption_rows(
+    period: str,
+    start: date,
+    end: date,
+    group_by: str = "product",
+    category: str | None = None,
+    name: str | None = None,
+    unit_of_measure: str | None = None,
+) -> list[dict]:
+    """Sums the rollups of the periods that overlap ``start``..``end``, one row per period and group.
+
+    The category of a line is the current category of the product with the
+    same name; lines of deleted products have an empty category.
+    """
+    queryset = ConsumptionRollup.objects.filter(
+        period=period,
+        period_start__gte=period_start(period, start),
+        period_start__lte=end,
+    )
+    if name:
+        queryset = queryset.filter(name=name)
+    if unit_of_measure:
+        queryset = queryset.filter(unit_of_measure=unit_of_measure)
+    if category is not None:
+        queryset = queryset.filter(name__in=Product.objects.filter(category=category).values("name"))
+
+    if group_by == "product":
+        fields = ["period_start", "name", "package_type", "unit_of_measure"]
+    else:
+        product_category = Product.objects.filter(name=OuterRef("name")).values("category")[:1]
+        queryset = queryset.annotate(category=Coalesce(Subquery(product_category), Value("")))
+        fields = ["period_start", "category", "unit_of_measure"]
+    rows = (
+        queryset.values(*fields)
+        .annotate(
+            sum_quantity=Sum("quantity"),
+            sum_total=Sum("total"),
+            sum_qty_package=Sum("qty_package"),
+            sum_lines=Sum("lines"),
+        )
+        .order_by(*fields)
+    )
+    return [
+        {
+            **{name: row[name] for name in fields},
+            "quantity": row["sum_quantity"],
+            "total": row["sum_total"],
+            "qty_package": row["sum_qty_package"],
+            "lines": row["sum_lines"],
+        }
+        for row in rows
+    ]
+
+
+def _key_fields(key: RollupKey) -> dict:
+    period, start, name, package_type, unit = key
+    return {
+        "period": period,
+        "period_start": start,
+        "name": name,
+        "package_type": package_type,
+        "unit_of_measure": unit,
+    }
+
+
+def _row_key(row: ConsumptionRollup) -> RollupKey:
+    return (row.period, row.period_start, row.name, row.package_type, row.unit_of_measure)
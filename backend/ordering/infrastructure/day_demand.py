@@ -0,0 +1,137 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, Sum
+from django.db.models.functions import Coalesce
+
+from ordering.infrastructure.expressions import cents, from_cents
+from ordering.models import Day, DayDemand, ProductQuantity
+
+
+DAY_CHUNK_SIZE = 500
+
+DemandKey = tuple[int, int]
+DemandValues = tuple[int, str, str, int, object]
+
+
+@dataclass
+class DayDemandDrift:
+    missing: list[DemandKey] = field(default_factory=list)
+    stale: list[DemandKey] = field(default_factory=list)
+    unexpected: list[DemandKey] = field(default_factory=list)
+
+    @property
+    def has_drift(self) -> bool:
+        return bool(self.missing or self.stale or self.unexpected)
+
+
+class DayDemandRefresher:
+    """Keeps ``DayDemand`` in sync with the Day -> Recipe -> Product -> ProductQuantity graph.
+
+    A row holds, for one day and one product quantity, how many recipe paths
+    reach the quantity that day and the resulting ``quantity x age group``
+    total, so order generation only has to sum rows of the selected days.
+    """
+
+    def refresh_days(self, day_ids: Iterable[int]) -> None:
+        day_ids = sorted(set(day_ids))
+        for start in range(0, len(day_ids), DAY_CHUNK_SIZE):
+            chunk = day_ids[start:start + DAY_CHUNK_SIZE]
+            rows = [
+                DayDemand(
+                    day_id=day_id,
+                    product_quantity_id=quantity_id,
+                    product_id=product_id,
+                    package_type=package_type,
+                    unit_of_measure=unit,
+                    occurrences=occurrences,
+                    quantity=quantity,
+                )
+                for (day_id, quantity_id), (product_id, package_type, unit, occurrences, quantity) in self._compute(
+                    chunk
+                ).items()
+            ]
+            with transaction.atomic():
+                DayDemand.objects.filter(day_id__in=chunk).delete()
+                DayDemand.objects.bulk_create(rows, batch_size=DAY_CHUNK_SIZE)
+
+    def rebuild(self) -> None:
+        with transaction.atomic():
+            DayDemand.objects.all().delete()
+            self.refresh_days(Day.objects.values_list("id", flat=True))
+
+    def check(self) -> DayDemandDrift:
+        drift = DayDemandDrift()
+        day_ids = list(Day.objects.order_by("id").values_list("id", flat=True))
+        for start in range(0, len(day_ids), DAY_CHUNK_SIZE):
+            chunk = day_ids[start:start + DAY_CHUNK_SIZE]
+            expected = self._compute(chunk)
+            stored = {
+                (row[0], row[1]): row[2:]
+                for row in DayDemand.objects.filter(day_id__in=chunk).values_list(
+                    "day_id",
+                    "product_quantity_id",
+                    "product_id",
+                    "package_type",
+                    "unit_of_measure",
+                    "occurrences",
+                    "quantity",
+                )
+            }
+            drift.missing.extend(sorted(expected.keys() - stored.keys()))
+            drift.unexpected.extend(sorted(stored.keys() - expected.keys()))
+            drift.stale.extend(sorted(key for key in expected.keys() & stored.keys() if expected[key] != stored[key]))
+        drift.unexpected.extend(
+            DayDemand.objects.exclude(day_id__in=day_ids).values_list("day_id", "product_quantity_id")
+        )
+        return drift
+
+    def _compute(self, day_ids: list[int]) -> dict[DemandKey, DemandValues]:
+        paths = list(
+            ProductQuantity.objects.filter(product__recipes__days__id__in=day_ids)
+            .values("id", "product_id", "package_type", "unit_of_measure", day_id=F("product__recipes__days__id"))
+            .annotate(occurrences=Count("*"))
+            .order_by()
+        )
+        base_cents = dict(
+            ProductQuantity.objects.filter(id__in={row["id"] for row in paths})
+            .values("id")
+            .annotate(
+                base=Coalesce(Sum(cents("quantity") * F("age_groups__quantity"), output_field=IntegerField()), 0)
+            )
+            .order_by()
+            .values_list("id", "base")
+        )
+        return {
+            (row["day_id"], row["id"]): (
+                row["product_id"],
+                row["package_type"],
+                row["unit_of_measure"],
+                row["occurrences"],
+                from_cents(base_cents[row["id"]] * row["occurrences"]),
+            )
+            for row in paths
+        }
+
+
+def days_for_recipes(recipe_ids: Iterable[int]) -> set[int]:
+    return set(Day.objects.filter(recipes__id__in=list(recipe_ids)).values_list("id", flat=True))
+
+
+def days_for_products(product_ids: Iterable[int]) -> set[int]:
+    return set(Day.objects.filter(recipes__products__id__in=list(product_ids)).values_list("id", flat=True))
+
+
+def days_for_quantities(quantity_ids: Iterable[int]) -> set[int]:
+    quantity_ids = list(quantity_ids)
+    product_ids = ProductQuantity.objects.filter(id__in=quantity_ids).values_list("product_id", flat=True)
+    return days_for_products(product_ids) | set(
+        DayDemand.objects.filter(product_quantity_id__in=quantity_ids).values_list("day_id", flat=True)
+    )
+
+
+def days_for_age_groups(age_group_ids: Iterable[int]) -> set[int]:
+    return days_for_quantities(
+        ProductQuantity.objects.filter(age_groups__id__in=list(age_group_ids)).values_list("id", flat=True)
+    )
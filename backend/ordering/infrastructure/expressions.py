@@ -0,0 +1,21 @@
+from decimal import Decimal
+
+from django.db.models import Case, F, IntegerField, Value, When
+from django.db.models.functions import Cast, Round
+
+
+def cents(field_name: str) -> Cast:
+    """Exact integer cents for a two-decimal ``DecimalField`` on SQLite and PostgreSQL."""
+    return Cast(Round(F(field_name) * Value(Decimal("100"))), IntegerField())
+
+
+def from_cents(value: int | None) -> Decimal:
+    return Decimal(value or 0).scaleb(-2)
+
+
+def day_weight(day_field: str, occurrences: dict[int, int]) -> Case | Value:
+    """How many times the day in ``day_field`` is served, for days listed more than once in an order."""
+    repeated = [When(**{day_field: day_id}, then=Value(times)) for day_id, times in occurrences.items() if times != 1]
+    if not repeated:
+        return Value(1, output_field=IntegerField())
+    return Case(*repeated, default=Value(1), output_field=IntegerField())
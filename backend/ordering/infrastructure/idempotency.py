@@ -0,0 +1,144 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.utils import timezone
+
+from ordering.models import IdempotencyKey
+
+
+logger = logging.getLogger(__name__)
+
+SWEEP_INTERVAL_SECONDS = 300
+SWEEP_BATCH_SIZE = 1000
+WAIT_POLL_SECONDS = 0.1
+
+
+class IdempotencyConflict(ValueError):
+    pass
+
+
+class IdempotencyInProgress(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    data: object
+    headers: dict[str, str]
+
+
+def request_fingerprint(method: str, path: str, data: object) -> str:
+    if hasattr(data, "lists"):
+        data = dict(data.lists())
+    body = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{method} {path}\n{body}".encode()).hexdigest()
+
+
+class IdempotencyStore:
+    """Remembers the response to each ``Idempotency-Key`` for ``ttl`` seconds.
+
+    ``begin`` inserts a locked row for a new key, so of several concurrent
+    requests with the same key only one runs the view. The others poll until
+    its response is stored and then replay it. A lock older than
+    ``lock_timeout`` seconds is taken over, since its request most likely died.
+    Expired rows are deleted in batches by a background thread at most every
+    ``SWEEP_INTERVAL_SECONDS``.
+    """
+
+    def __init__(self, ttl: int, lock_timeout: int) -> None:
+        self._ttl = ttl
+        self._lock_timeout = lock_timeout
+        self._sweep_lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def begin(self, key: str, scope: str, fingerprint: str) -> StoredResponse | None:
+        """Returns the stored response for a repeat, or ``None`` when the caller must run the request."""
+        self._schedule_sweep()
+        deadline = time.monotonic() + self._lock_timeout
+        while True:
+            now = timezone.now()
+            try:
+                with transaction.atomic():
+                    IdempotencyKey.objects.create(
+                        key=key,
+                        scope=scope,
+                        fingerprint=fingerprint,
+                        locked_until=now + timedelta(seconds=self._lock_timeout),
+                        expires_at=now + timedelta(seconds=self._ttl),
+                    )
+                return None
+            except IntegrityError:
+                pass
+
+            record = IdempotencyKey.objects.filter(key=key, scope=scope).first()
+            if record is None:
+                continue
+            if record.expires_at <= now:
+                IdempotencyKey.objects.filter(id=record.id, expires_at__lte=now).delete()
+                continue
+            if record.fingerprint != fingerprint:
+                raise IdempotencyConflict("The Idempotency-Key was already used with a different request.")
+            if record.status_code is not None:
+                return StoredResponse(record.status_code, record.response_data, record.response_headers)
+            if record.locked_until is not None and record.locked_until <= now:
+                if IdempotencyKey.objects.filter(id=record.id, locked_until=record.locked_until).update(
+                    locked_until=now + timedelta(seconds=self._lock_timeout)
+                ):
+                    return None
+                continue
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgress("A request with this Idempotency-Key is still being processed.")
+            time.sleep(WAIT_POLL_SECONDS)
+
+    def complete(self, key: str, scope: str, response: StoredResponse) -> None:
+        IdempotencyKey.objects.filter(key=key, scope=scope).update(
+            status_code=response.status_code,
+            response_data=response.data,
+            response_headers=response.headers,
+            locked_until=None,
+        )
+
+    def release(self, key: str, scope: str) -> None:
+        """Forgets a key whose request failed, so a retry runs it again."""
+        IdempotencyKey.objects.filter(key=key, scope=scope, status_code__isnull=True).delete()
+
+    def sweep(self) -> int:
+        deleted = 0
+        while True:
+            expired = list(
+                IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).values_list("id", flat=True)[
+                    :SWEEP_BATCH_SIZE
+                ]
+            )
+            if not expired:
+                return deleted
+            deleted += IdempotencyKey.objects.filter(id__in=expired).delete()[0]
+
+    def _schedule_sweep(self) -> None:
+        now = time.monotonic()
+        with self._sweep_lock:
+            if now - self._last_sweep < SWEEP_INTERVAL_SECONDS:
+                return
+            self._last_sweep = now
+        threading.Thread(target=self._sweep_in_background, name="idempotency-sweep", daemon=True).start()
+
+    def _sweep_in_background(self) -> None:
+        try:
+            deleted = self.sweep()
+            if deleted:
+                logger.info("Deleted %d expired idempotency keys", deleted)
+        except Exception:
+            logger.exception("Idempotency key sweep failed")
+        finally:
+            close_old_connections()
+
+
+idempotency_store = IdempotencyStore(ttl=settings.IDEMPOTENCY_KEY_TTL, lock_timeout=settings.IDEMPOTENCY_LOCK_TIMEOUT)
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date, timedelta
+from uuid import uuid4
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from ordering.application.use_cases import GenerateOrderUseCase
+from ordering.domain.entities import OrderGenerationInput, OrderProductData
+from ordering.domain.services import OrderGenerationService
+from ordering.infrastructure.catalog_snapshot import catalog_snapshot_reader
+from ordering.infrastructure.computation_cache import order_computation_cache
+from ordering.infrastructure.idempotency import IdempotencyConflict
+from ordering.infrastructure.metrics import RequestMetrics, end_request_metrics, start_request_metrics
+from ordering.infrastructure.repositories import (
+    PRODUCT_TOTAL_READERS,
+    DjangoDayRepository,
+    DjangoOrderRepository,
+    DjangoProductQuantityRepository,
+)
+from ordering.infrastructure.versions import catalog_version
+from ordering.models import OrderJob
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 3
+
+
+class JobLost(Exception):
+    """The job was claimed again by another worker while this one was running it."""
+
+
+def job_fingerprint(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+class JobProgress(RequestMetrics):
+    """Stage timings of a job run; each stage is saved on the job row when it first starts, for polling."""
+
+    def __init__(self, job_id: int) -> None:
+        super().__init__()
+        self._job_id = job_id
+        self._reported: set[str] = set()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if name not in self._reported:
+            self._reported.add(name)
+            OrderJob.objects.filter(id=self._job_id).update(stage=name)
+        with super().stage(name):
+            yield
+
+    def timings_ms(self) -> dict[str, float]:
+        return {stage: round(seconds * 1000, 1) for stage, seconds in self.stages.items()}
+
+
+class JobOrderWriter:
+    """Saves the order and marks the job as succeeded in one transaction.
+
+    The update only matches while the job still carries this run's claim
+    token. If a stale job was claimed again meanwhile, the order is rolled back,
+    so a job never creates more than one order.
+    """
+
+    def __init__(self, job: OrderJob) -> None:
+        self._job = job
+        self._writer = DjangoOrderRepository()
+
+    def create_order(self, payload: OrderGenerationInput, products: Iterable[OrderProductData], order_date: date) -> int:
+        with transaction.atomic():
+            order_id = self._writer.create_order(payload, products, order_date)
+            claimed = OrderJob.objects.filter(
+                id=self._job.id,
+                claim_token=self._job.claim_token,
+                status=OrderJob.RUNNING,
+            ).update(status=OrderJob.SUCCEEDED, order_id=order_id, stage="", finished_at=timezone.now())
+            if not claimed:
+                raise JobLost
+        return order_id
+
+
+class OrderJobQueue:
+    """Order generation jobs stored as ``OrderJob`` rows and run by a local thread pool.
+
+    The table is the queue, so no broker is needed: workers claim the oldest
+    pending row with a conditional update on its claim token, and any process
+    can run jobs, be it the pool of an API process (``ORDER_JOB_WORKERS``) or
+    the ``run_order_jobs`` command. A job still running after ``stale_after``
+    seconds, e.g. because its worker died, is claimed again, up to
+    ``MAX_ATTEMPTS`` runs.
+    """
+
+    def __init__(self, workers: int, stale_after: int) -> None:
+        self._workers = workers
+        self._stale_after = stale_after
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, payload: dict, idempotency_key: str | None = None) -> tuple[OrderJob, bool]:
+        """Returns the job and whether it was created; a known key returns its job instead."""
+        fingerprint = job_fingerprint(payload)
+        if idempotency_key:
+            existing = OrderJob.objects.filter(idempotency_key=idempotency_key).first()
+            if existing is None:
+                try:
+                    with transaction.atomic():
+                        job = OrderJob.objects.create(
+                            idempotency_key=idempotency_key, fingerprint=fingerprint, payload=payload
+                        )
+                except IntegrityError:
+                    existing = OrderJob.objects.get(idempotency_key=idempotency_key)
+            if existing is not None:
+                if existing.fingerprint != fingerprint:
+                    raise IdempotencyConflict("The Idempotency-Key was already used with a different request.")
+                return existing, False
+        else:
+            job = OrderJob.objects.create(fingerprint=fingerprint, payload=payload)
+
+        transaction.on_commit(self.wake)
+        return job, True
+
+    def wake(self) -> None:
+        if self._workers < 1:
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="order-job")
+        self._executor.submit(self._drain)
+
+    def _drain(self) -> None:
+        try:
+            while self.run_next():
+                pass
+        except Exception:
+            logger.exception("Order job worker stopped")
+        finally:
+            close_old_connections()
+
+    def run_next(self) -> bool:
+        job = self._claim()
+        if job is None:
+            return False
+        self._run(job)
+        return True
+
+    def purge(self, older_than: timedelta) -> int:
+        deleted, _ = OrderJob.objects.filter(
+            status__in=[OrderJob.SUCCEEDED, OrderJob.FAILED],
+            finished_at__lt=timezone.now() - older_than,
+        ).delete()
+        return deleted
+
+    def _claim(self) -> OrderJob | None:
+        now = timezone.now()
+        stale = Q(status=OrderJob.RUNNING, started_at__lt=now - timedelta(seconds=self._stale_after))
+        OrderJob.objects.filter(stale, attempts__gte=MAX_ATTEMPTS).update(
+            status=OrderJob.FAILED,
+            error="The job was interrupted too many times.",
+            finished_at=now,
+        )
+
+        candidates = (
+            OrderJob.objects.filter(Q(status=OrderJob.PENDING) | stale)
+            .order_by("created_at", "id")
+            .values_list("id", "claim_token")[: self._workers + 1]
+        )
+        for job_id, claim_token in candidates:
+            claimed = OrderJob.objects.filter(
+                id=job_id,
+                claim_token=claim_token,
+                status__in=[OrderJob.PENDING, OrderJob.RUNNING],
+            ).update(
+                status=OrderJob.RUNNING,
+                claim_token=uuid4().hex,
+                stage="",
+                attempts=F("attempts") + 1,
+                started_at=now,
+            )
+            if claimed:
+                return OrderJob.objects.get(id=job_id)
+        return None
+
+    def _run(self, job: OrderJob) -> None:
+        progress = JobProgress(job.id)
+        _, token = start_request_metrics(progress)
+        try:
+            self._build_use_case(job).execute(self._generation_input(job.payload))
+        except JobLost:
+            logger.warning("Order job %s was claimed by another worker; its order was rolled back", job.id)
+            return
+        except ValueError as exc:
+            self._finish(job, progress, OrderJob.FAILED, error=str(exc))
+            return
+        except Exception:
+            logger.exception("Order job %s failed", job.id)
+            self._finish(job, progress, OrderJob.FAILED, error="Order generation failed.")
+            return
+        finally:
+            end_request_metrics(token)
+        OrderJob.objects.filter(id=job.id, claim_token=job.claim_token).update(stage_timings=progress.timings_ms())
+
+    @staticmethod
+    def _finish(job: OrderJob, progress: JobProgress, status: str, error: str = "") -> None:
+        OrderJob.objects.filter(id=job.id, claim_token=job.claim_token).update(
+            status=status,
+            stage="",
+            error=error,
+            stage_timings=progress.timings_ms(),
+            finished_at=timezone.now(),
+        )
+
+    @staticmethod
+    def _build_use_case(job: OrderJob) -> GenerateOrderUseCase:
+        engine = job.payload.get("engine", settings.ORDER_GENERATION_ENGINE)
+        total_reader_class = PRODUCT_TOTAL_READERS.get(engine)
+        return GenerateOrderUseCase(
+            quantity_reader=catalog_snapshot_reader or DjangoProductQuantityRepository(),
+            order_writer=JobOrderWriter(job),
+            day_repository=DjangoDayRepository(),
+            service=OrderGenerationService(detail_mode=settings.ORDER_DETAIL_MODE),
+            total_reader=total_reader_class() if total_reader_class else None,
+            computation_cache=order_computation_cache,
+            catalog_version=catalog_version,
+            engine=engine,
+        )
+
+    @staticmethod
+    def _generation_input(payload: dict) -> OrderGenerationInput:
+        return OrderGenerationInput(
+            name=payload["name"],
+            date=date.fromisoformat(payload["date"]),
+            day_ids=payload["day_ids"],
+            product_category=payload.get("product_category") or None,
+            template_id=payload.get("template_id"),
+        )
+
+
+order_job_queue = OrderJobQueue(workers=settings.ORDER_JOB_WORKERS, stale_after=settings.ORDER_JOB_STALE_AFTER)
@@ -0,0 +1,132 @@
+import asyncio
+import json
+import random
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test import AsyncClient
+from django.utils import timezone
+
+from ordering.infrastructure.repositories import DjangoOrderRepository
+from ordering.models import Day
+
+
+DEFAULT_CASES = (
+    ("sync", "POST", "/api/orders/generate/"),
+    ("async", "POST", "/api/async/orders/generate/"),
+    ("sync", "GET", "/api/days/"),
+    ("async", "GET", "/api/async/days/"),
+)
+
+
+@dataclass
+class LoadTestResult:
+    name: str
+    clients: int
+    requests: int
+    errors: int
+    seconds: float
+    requests_per_second: float
+    median_ms: float
+    p95_ms: float
+    max_ms: float
+
+
+class LoadTestRunner:
+    """Compares the sync and async endpoints under concurrent clients.
+
+    Requests go through the ASGI handler in process with ``AsyncClient``, the
+    way an ASGI server calls it: sync views run in a thread per request and
+    async views on the event loop. ``clients`` coroutines send requests back to
+    back until ``requests`` have been sent. Every GET has a distinct query
+    string and every generated order a random set of days, so neither the
+    response cache nor the computation cache answers. Orders created by the
+    run are deleted at the end.
+    """
+
+    def __init__(self, clients: int = 10, requests: int = 200, days_per_order: int = 3, seed: int = 0) -> None:
+        self._clients = clients
+        self._requests = requests
+        self._days_per_order = days_per_order
+        self._random = random.Random(seed)
+
+    def run(self, cases: tuple[tuple[str, str, str], ...] = DEFAULT_CASES) -> dict:
+        day_ids = list(Day.objects.order_by("id").values_list("id", flat=True))
+        if not day_ids:
+            raise ValueError("The catalog has no days. Seed one with seed_catalog first.")
+
+        created_order_ids: list[int] = []
+        try:
+            results = [
+                asyncio.run(self._run_case(mode, method, path, day_ids, created_order_ids))
+                for mode, method, path in cases
+            ]
+        finally:
+            DjangoOrderRepository().delete_orders(created_order_ids)
+
+        return {
+            "meta": {
+                "timestamp": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "clients": self._clients,
+                "requests": self._requests,
+                "days": len(day_ids),
+                "days_per_order": min(self._days_per_order, len(day_ids)),
+            },
+            "results": [asdict(result) for result in results],
+        }
+
+    async def _run_case(
+        self,
+        mode: str,
+        method: str,
+        path: str,
+        day_ids: list[int],
+        created_order_ids: list[int],
+    ) -> LoadTestResult:
+        await sync_to_async(caches[settings.API_CACHE_ALIAS].clear)()
+        remaining = iter(range(self._requests))
+        timings: list[float] = []
+        errors = 0
+
+        async def client_loop() -> None:
+            nonlocal errors
+            client = AsyncClient()
+            for number in remaining:
+                started = time.perf_counter()
+                if method == "POST":
+                    response = await client.post(path, self._order_payload(day_ids), content_type="application/json")
+                else:
+                    response = await client.get(path, {"loadtest": number})
+                timings.append((time.perf_counter() - started) * 1000)
+                if response.status_code >= 400:
+                    errors += 1
+                elif method == "POST":
+                    created_order_ids.append(json.loads(response.content)["order_id"])
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client_loop() for _ in range(self._clients)))
+        seconds = time.perf_counter() - started
+
+        timings.sort()
+        return LoadTestResult(
+            name=f"{mode} {method} {path}",
+            clients=self._clients,
+            requests=len(timings),
+            errors=errors,
+            seconds=round(seconds, 3),
+            requests_per_second=round(len(timings) / seconds, 1),
+            median_ms=round(statistics.median(timings), 3),
+            p95_ms=round(timings[max(0, int(len(timings) * 0.95) - 1)], 3),
+            max_ms=round(timings[-1], 3),
+        )
+
+    def _order_payload(self, day_ids: list[int]) -> dict:
+        selected = self._random.sample(day_ids, min(self._days_per_order, len(day_ids)))
+        return {"name": "Load test", "date": date.today().isoformat(), "day_ids": selected}
@@ -0,0 +1,160 @@
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Model, Q
+
+from ordering.infrastructure.day_demand import DayDemandRefresher, days_for_quantities, days_for_recipes
+from ordering.infrastructure.search import SearchIndex
+from ordering.infrastructure.versions import bump_version
+from ordering.models import AgeGroup, Day, Product, ProductQuantity, Recipe
+
+
+BULK_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class MembershipRelation:
+    source_model: type[Model]
+    target_model: type[Model]
+    through: type[Model]
+    source_field: str
+    target_field: str
+    resource: str
+    affected_days: Callable[[Iterable[int]], set[int]]
+    search_resource: str | None = None
+
+
+MEMBERSHIP_RELATIONS = {
+    "day_recipes": MembershipRelation(
+        Day,
+        Recipe,
+        Day.recipes.through,
+        "day_id",
+        "recipe_id",
+        "day",
+        affected_days=set,
+    ),
+    "recipe_products": MembershipRelation(
+        Recipe,
+        Product,
+        Recipe.products.through,
+        "recipe_id",
+        "product_id",
+        "recipe",
+        affected_days=days_for_recipes,
+        search_resource="recipe",
+    ),
+    "quantity_age_groups": MembershipRelation(
+        ProductQuantity,
+        AgeGroup,
+        ProductQuantity.age_groups.through,
+        "productquantity_id",
+        "agegroup_id",
+        "product_quantity",
+        affected_days=days_for_quantities,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class MembershipChange:
+    source_id: int
+    add: list[int] = field(default_factory=list)
+    remove: list[int] = field(default_factory=list)
+
+
+@dataclass
+class MembershipResult:
+    added: int = 0
+    removed: int = 0
+
+
+class MembershipWriter:
+    """Adds and removes m2m links by writing only the delta rows of the through table.
+
+    Unlike ``instance.relation.set()``, which is what a full serializer update
+    ends up doing, the current links are never rewritten. Existence of every id
+    is checked with one query per model. Bulk writes skip ``m2m_changed``, so the
+    day demand table, the search index and the version are refreshed once for
+    all the changed objects.
+    """
+
+    def __init__(self, relation: str) -> None:
+        self._relation = MEMBERSHIP_RELATIONS[relation]
+
+    def apply(self, changes: Iterable[MembershipChange]) -> MembershipResult:
+        relation = self._relation
+        changes = list(changes)
+        self._check_exists(relation.source_model, {change.source_id for change in changes})
+        self._check_exists(relation.target_model, {target_id for change in changes for target_id in change.add})
+
+        result = MembershipResult()
+        with transaction.atomic():
+            removed_sources = self._remove(changes, result)
+            added_sources = self._add(changes, result)
+
+            changed_sources = removed_sources | added_sources
+            if not changed_sources:
+                return result
+            DayDemandRefresher().refresh_days(relation.affected_days(changed_sources))
+            if relation.search_resource:
+                SearchIndex().index(relation.search_resource, changed_sources)
+            bump_version(relation.resource)
+        return result
+
+    @staticmethod
+    def _check_exists(model: type[Model], ids: set[int]) -> None:
+        if not ids:
+            return
+        missing = ids - set(model.objects.filter(id__in=ids).values_list("id", flat=True))
+        if missing:
+            listed = ", ".join(map(str, sorted(missing)))
+            raise ValueError(f"{model._meta.verbose_name.capitalize()} not found: {listed}.")
+
+    def _remove(self, changes: list[MembershipChange], result: MembershipResult) -> set[int]:
+        relation = self._relation
+        removals = [change for change in changes if change.remove]
+        if not removals:
+            return set()
+
+        links = relation.through.objects.filter(
+            reduce(
+                or_,
+                (
+                    Q(**{relation.source_field: change.source_id, f"{relation.target_field}__in": change.remove})
+                    for change in removals
+                ),
+            )
+        )
+        changed_sources = set(links.values_list(relation.source_field, flat=True))
+        result.removed, _ = links.delete()
+        return changed_sources
+
+    def _add(self, changes: list[MembershipChange], result: MembershipResult) -> set[int]:
+        relation = self._relation
+        requested = {(change.source_id, target_id) for change in changes for target_id in change.add}
+        if not requested:
+            return set()
+
+        existing = set(
+            relation.through.objects.filter(
+                **{
+                    f"{relation.source_field}__in": {source_id for source_id, _ in requested},
+                    f"{relation.target_field}__in": {target_id for _, target_id in requested},
+                }
+            ).values_list(relation.source_field, relation.target_field)
+        )
+        missing = sorted(requested - existing)
+        relation.through.objects.bulk_create(
+            [
+                relation.through(**{relation.source_field: source_id, relation.target_field: target_id})
+                for source_id, target_id in missing
+            ],
+            batch_size=BULK_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        result.added = len(missing)
+        return {source_id for source_id, _ in missing}
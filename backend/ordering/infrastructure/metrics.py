@@ -0,0 +1,222 @@
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TypeVar
+
+
+T = TypeVar("T")
+
+
+class RequestMetrics:
+    """Query count, DB time and stage timings of one request.
+
+    Stages are exclusive: when a stage starts inside another one, the outer
+    stage stops accumulating until the inner one ends, so the stage durations
+    of a request add up to at most its total time.
+    """
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.stages: dict[str, float] = defaultdict(float)
+        self._active: list[str] = []
+        self._resumed_at = 0.0
+
+    def query_wrapper(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_seconds += time.perf_counter() - started
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if name in self._active:
+            yield
+            return
+
+        self._charge_active()
+        self._active.append(name)
+        try:
+            yield
+        finally:
+            self._charge_active()
+            self._active.pop()
+
+    def _charge_active(self) -> None:
+        now = time.perf_counter()
+        if self._active:
+            self.stages[self._active[-1]] += now - self._resumed_at
+        self._resumed_at = now
+
+
+_current_metrics: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+def start_request_metrics(metrics: RequestMetrics | None = None) -> tuple[RequestMetrics, object]:
+    metrics = metrics or RequestMetrics()
+    return metrics, _current_metrics.set(metrics)
+
+
+def end_request_metrics(token) -> None:
+    _current_metrics.reset(token)
+
+
+def count_query(execute, sql, params, many, context):
+    """Execute wrapper charging the query to the request metrics of the current context.
+
+    The metrics are looked up through the context variable rather than the
+    connection, so queries run by ``sync_to_async`` in other threads, each with
+    its own connection, are charged to the request that awaited them.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics.query_wrapper(execute, sql, params, many, context)
+
+
+def install_query_counter(connection) -> None:
+    if count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, count_query)
+
+
+@contextmanager
+def record_stage(name: str) -> Iterator[None]:
+    """Times the block as ``name`` in the current request; a no-op outside instrumented requests."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.stage(name):
+        yield
+
+
+def timed_iter(items: Iterable[T], name: str) -> Iterator[T]:
+    """Yields ``items``, charging the time spent producing each one to ``name``.
+
+    Used for lazily built order lines, whose computation happens while the
+    writer consumes them.
+    """
+    iterator = iter(items)
+    while True:
+        with record_stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+class MetricsRegistry:
+    """Per-process request metrics aggregated by view name, rendered in Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._requests: dict[tuple[str, str, str], int] = defaultdict(int)
+        self._durations: dict[tuple[str, str], float] = defaultdict(float)
+        self._counts: dict[tuple[str, str], int] = defaultdict(int)
+        self._queries: dict[tuple[str, str], int] = defaultdict(int)
+        self._db_seconds: dict[tuple[str, str], float] = defaultdict(float)
+        self._stages: dict[tuple[str, str], float] = defaultdict(float)
+        self._budget_exceeded: dict[str, int] = defaultdict(int)
+
+    def observe(
+        self,
+        view: str,
+        method: str,
+        status: int,
+        seconds: float,
+        metrics: RequestMetrics,
+        budget_exceeded: bool,
+    ) -> None:
+        with self._lock:
+            self._requests[(view, method, str(status))] += 1
+            self._durations[(view, method)] += seconds
+            self._counts[(view, method)] += 1
+            self._queries[(view, method)] += metrics.queries
+            self._db_seconds[(view, method)] += metrics.db_seconds
+            for stage, stage_seconds in metrics.stages.items():
+                self._stages[(view, stage)] += stage_seconds
+            if budget_exceeded:
+                self._budget_exceeded[view] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            for samples in (
+                self._requests,
+                self._durations,
+                self._counts,
+                self._queries,
+                self._db_seconds,
+                self._stages,
+                self._budget_exceeded,
+            ):
+                samples.clear()
+
+    def render(self) -> str:
+        with self._lock:
+            families = [
+                (
+                    "ordering_http_requests_total",
+                    "counter",
+                    "Requests by view, method and status.",
+                    [("", {"view": v, "method": m, "status": s}, n) for (v, m, s), n in self._requests.items()],
+                ),
+                (
+                    "ordering_http_request_duration_seconds",
+                    "summary",
+                    "Request time by view and method.",
+                    [
+                        sample
+                        for (v, m), seconds in self._durations.items()
+                        for sample in (
+                            ("_sum", {"view": v, "method": m}, seconds),
+                            ("_count", {"view": v, "method": m}, self._counts[(v, m)]),
+                        )
+                    ],
+                ),
+                (
+                    "ordering_db_queries_total",
+                    "counter",
+                    "SQL queries by view and method.",
+                    [("", {"view": v, "method": m}, n) for (v, m), n in self._queries.items()],
+                ),
+                (
+                    "ordering_db_query_duration_seconds_total",
+                    "counter",
+                    "Time spent in SQL queries by view and method.",
+                    [("", {"view": v, "method": m}, seconds) for (v, m), seconds in self._db_seconds.items()],
+                ),
+                (
+                    "ordering_stage_duration_seconds_total",
+                    "counter",
+                    "Exclusive time per instrumented stage by view.",
+                    [("", {"view": v, "stage": s}, seconds) for (v, s), seconds in self._stages.items()],
+                ),
+                (
+                    "ordering_query_budget_exceeded_total",
+                    "counter",
+                    "Requests that ran more queries than the view budget.",
+                    [("", {"view": v}, n) for v, n in self._budget_exceeded.items()],
+                ),
+            ]
+
+        lines: list[str] = []
+        for name, kind, help_text, samples in families:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in sorted(samples, key=lambda sample: (sorted(sample[1].items()), sample[0])):
+                rendered = ",".join(f'{key}="{_escape(label)}"' for key, label in labels.items())
+                lines.append(f"{name}{suffix}{{{rendered}}} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics_registry = MetricsRegistry()
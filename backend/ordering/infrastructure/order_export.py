@@ -0,0 +1,203 @@
+import csv
+import io
+import re
+import string
+import zipfile
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from xml.sax.saxutils import escape
+
+from django.db.models import QuerySet
+
+from ordering.models import Order, OrderProduct
+
+
+EXPORT_FORMATS = ("csv", "xlsx")
+EXPORT_CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+EXPORT_FIELDS = (
+    "order_id",
+    "order_name",
+    "order_date",
+    "product",
+    "package_type",
+    "unit_of_measure",
+    "quantity",
+    "total",
+    "qty_package",
+)
+NUMERIC_FIELDS = {"order_id", "quantity", "total", "qty_package"}
+COLUMNS = string.ascii_uppercase[:len(EXPORT_FIELDS)]
+NUMERIC_COLUMNS = {index for index, name in enumerate(EXPORT_FIELDS) if name in NUMERIC_FIELDS}
+ORDER_CHUNK_SIZE = 200
+LINE_CHUNK_SIZE = 2000
+WRITE_BUFFER_SIZE = 64 * 1024
+
+# Characters XML 1.0 does not allow, even escaped.
+ILLEGAL_XML_CHARACTERS = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+SHEET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+)
+SHEET_FOOTER = "</sheetData></worksheet>"
+XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Order lines" sheetId="1" r:id="rId1"/></sheets>'
+        "</workbook>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        "</Relationships>"
+    ),
+}
+
+
+def export_rows(orders: QuerySet) -> Iterator[tuple]:
+    """Yields one tuple of ``EXPORT_FIELDS`` per order line, ordered by order date, order and line.
+
+    Orders are read with ``iterator()`` in ``(date, id)`` order, which the
+    order index serves without a sort, and their lines are read a chunk of
+    orders at a time, so memory stays flat whatever the date range.
+    """
+    order_rows = orders.order_by("date", "id").values_list("id", "name", "date").iterator(ORDER_CHUNK_SIZE)
+    while chunk := list(islice(order_rows, ORDER_CHUNK_SIZE)):
+        headers = {order_id: (name, order_date.isoformat()) for order_id, name, order_date in chunk}
+        lines = (
+            OrderProduct.objects.filter(order_id__in=headers)
+            .order_by("order_id", "id")
+            .values_list("order_id", "name", "package_type", "unit_of_measure", "quantity", "total", "qty_package")
+            .iterator(LINE_CHUNK_SIZE)
+        )
+        by_order: dict[int, list[tuple]] = {}
+        for order_id, *values in lines:
+            by_order.setdefault(order_id, []).append(values)
+        for order_id, _, _ in chunk:
+            for name, package_type, unit, quantity, total, qty_package in by_order.get(order_id, ()):
+                yield (order_id, *headers[order_id], name, package_type, unit, quantity, total, qty_package)
+
+
+def order_queryset(order_ids: Iterable[int] = (), start=None, end=None) -> QuerySet:
+    orders = Order.objects.all()
+    order_ids = list(order_ids)
+    if order_ids:
+        orders = orders.filter(id__in=order_ids)
+    if start is not None:
+        orders = orders.filter(date__gte=start)
+    if end is not None:
+        orders = orders.filter(date__lte=end)
+    return orders
+
+
+def write_export(rows: Iterable[tuple], file_format: str) -> Iterator[bytes]:
+    if file_format == "csv":
+        return write_csv(rows)
+    if file_format == "xlsx":
+        return write_xlsx(rows)
+    raise ValueError(f"Unknown export format '{file_format}'.")
+
+
+def write_csv(rows: Iterable[tuple]) -> Iterator[bytes]:
+    """Writes a header and the rows as UTF-8 CSV in buffers of about 64 KB; the header is sent at once."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield _drain(buffer).encode()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= WRITE_BUFFER_SIZE:
+            yield _drain(buffer).encode()
+    yield _drain(buffer).encode()
+
+
+def write_xlsx(rows: Iterable[tuple]) -> Iterator[bytes]:
+    """Writes a single-sheet XLSX workbook while the rows are read.
+
+    Cells are written as inline strings and numbers, so no shared string
+    table has to be held, and ``zipfile`` writes to a non-seekable stream
+    with data descriptors, so each compressed chunk is yielded as soon as it
+    is produced. Memory stays constant whatever the number of rows.
+    """
+    stream = _ChunkStream()
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        yield stream.drain()
+
+        with workbook.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            buffer = io.StringIO()
+            buffer.write(SHEET_HEADER)
+            buffer.write(_xlsx_row(1, EXPORT_FIELDS, numeric=False))
+            for number, row in enumerate(rows, start=2):
+                buffer.write(_xlsx_row(number, row))
+                if buffer.tell() >= WRITE_BUFFER_SIZE:
+                    sheet.write(_drain(buffer).encode())
+                    yield stream.drain()
+            buffer.write(SHEET_FOOTER)
+            sheet.write(_drain(buffer).encode())
+    yield stream.drain()
+
+
+class _ChunkStream(io.RawIOBase):
+    """Write-only stream that hands what was written to the caller through ``drain``."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _drain(buffer: io.StringIO) -> str:
+    value = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return value
+
+
+def _xlsx_row(number: int, values: Iterable, numeric: bool = True) -> str:
+    cells = []
+    for index, value in enumerate(values):
+        reference = f"{COLUMNS[index]}{number}"
+        if numeric and index in NUMERIC_COLUMNS:
+            cells.append(f'<c r="{reference}"><v>{value}</v></c>')
+        else:
+            text = escape(ILLEGAL_XML_CHARACTERS.sub("", str(value)))
+            cells.append(f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{number}">{"".join(cells)}</row>'
@@ -0,0 +1,168 @@
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.db import connection, transaction
+from django.db.models import Count, F, IntegerField, QuerySet, Sum
+from django.db.models.functions import Coalesce
+
+from ordering.infrastructure.expressions import cents
+from ordering.models import (
+    ConsumptionRollup,
+    Day,
+    DayDemand,
+    Order,
+    OrderProduct,
+    Product,
+    ProductQuantity,
+    Recipe,
+)
+
+
+SAMPLE_IDS = [1, 2, 3]
+SAMPLE_CATEGORY = "Almacen"
+
+SQLITE_FULL_SCAN = re.compile(r"\bSCAN (?!CONSTANT ROW)(?P<table>\w+)")
+SQLITE_SORT = re.compile(r"USE TEMP B-TREE FOR .*ORDER BY")
+POSTGRESQL_FULL_SCAN = re.compile(r"Seq Scan on (?P<table>\w+)")
+POSTGRESQL_SORT = re.compile(r"^\s*(?:->\s*)?(?:Incremental )?Sort\b", re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class PlanCase:
+    name: str
+    build: Callable[[], QuerySet]
+    allowed_scans: tuple[str, ...] = ()
+    index_order: bool = False
+
+
+@dataclass
+class PlanResult:
+    name: str
+    plan: str
+    full_scans: list[str] = field(default_factory=list)
+    sorts: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return not self.full_scans and not self.sorts
+
+
+def _quantities_by_days() -> QuerySet:
+    return ProductQuantity.objects.filter(product__recipes__days__id__in=SAMPLE_IDS)
+
+
+PLAN_CASES = (
+    PlanCase(
+        "quantities_by_days",
+        lambda: _quantities_by_days().select_related("product").order_by("id"),
+    ),
+    PlanCase(
+        "quantities_by_days_and_category",
+        lambda: _quantities_by_days().filter(product__category=SAMPLE_CATEGORY).order_by("id"),
+    ),
+    PlanCase(
+        "totals_by_days",
+        lambda: _quantities_by_days()
+        .values("product__name", "package_type", "unit_of_measure")
+        .annotate(cents=Coalesce(Sum(cents("quantity") * F("age_groups__quantity"), output_field=IntegerField()), 0))
+        .order_by(),
+    ),
+    PlanCase(
+        "day_demand_by_days_and_category",
+        lambda: DayDemand.objects.filter(day_id__in=SAMPLE_IDS, product__category=SAMPLE_CATEGORY)
+        .values("product__name", "package_type", "unit_of_measure")
+        .annotate(cents=Sum(cents("quantity"), output_field=IntegerField()))
+        .order_by(),
+    ),
+    PlanCase(
+        "quantity_paths_by_days",
+        lambda: _quantities_by_days()
+        .values("id", day_id=F("product__recipes__days__id"))
+        .annotate(paths=Count("*"))
+        .order_by(),
+    ),
+    PlanCase("products_by_category", lambda: Product.objects.filter(category=SAMPLE_CATEGORY).order_by("name")),
+    # Pages walk an index in the requested order from the start and stop after the page, so the scan is
+    # fine as long as no sort of the whole table is needed.
+    PlanCase(
+        "quantity_list",
+        lambda: ProductQuantity.objects.order_by("product__name")[:20],
+        allowed_scans=("ordering_product",),
+        index_order=True,
+    ),
+    PlanCase("recipes_for_products", lambda: Recipe.objects.filter(products__id__in=SAMPLE_IDS).values("id")),
+    PlanCase("days_for_recipes", lambda: Day.objects.filter(recipes__id__in=SAMPLE_IDS).values("id")),
+    PlanCase(
+        "quantities_for_age_groups",
+        lambda: ProductQuantity.objects.filter(age_groups__id__in=SAMPLE_IDS).values("id"),
+    ),
+    PlanCase(
+        "orders_by_id",
+        lambda: Order.objects.order_by("-id")[:20],
+        allowed_scans=("ordering_order",),
+        index_order=True,
+    ),
+    PlanCase(
+        "orders_by_date",
+        lambda: Order.objects.order_by("date", "id")[:20],
+        allowed_scans=("ordering_order",),
+        index_order=True,
+    ),
+    PlanCase(
+        "orders_by_date_cursor",
+        lambda: Order.objects.filter(date__lt=date(2000, 1, 1)).order_by("-date", "-id")[:20],
+        index_order=True,
+    ),
+    PlanCase("orders_for_days", lambda: Order.objects.filter(days__id__in=SAMPLE_IDS).values("id")),
+    PlanCase("order_lines", lambda: OrderProduct.objects.filter(order_id=SAMPLE_IDS[0]).order_by("id")),
+    PlanCase(
+        "consumption_by_period",
+        lambda: ConsumptionRollup.objects.filter(
+            period=ConsumptionRollup.MONTH,
+            period_start__gte=date(2000, 1, 1),
+            period_start__lte=date(2000, 12, 31),
+        )
+        .values("period_start", "name", "package_type", "unit_of_measure")
+        .annotate(quantity_sum=Sum("quantity"))
+        .order_by("period_start", "name", "package_type", "unit_of_measure"),
+        index_order=True,
+    ),
+)
+
+
+class QueryPlanInspector:
+    """Captures ``EXPLAIN`` plans of the hot queries and reports full table scans.
+
+    Small development databases make the planner prefer sequential scans even
+    where an index exists, so on PostgreSQL the plans are taken with
+    ``enable_seqscan`` off: a ``Seq Scan`` left in the plan means no index can
+    serve the query. SQLite reports ``SCAN <table>`` for a walk over a whole
+    table or index, which is only fine where a case allows it. Cases read in
+    index order also fail when the plan has to sort the rows itself.
+    """
+
+    def inspect(self, cases: tuple[PlanCase, ...] = PLAN_CASES) -> list[PlanResult]:
+        if connection.vendor not in {"sqlite", "postgresql"}:
+            raise ValueError(f"Query plans are only checked on SQLite and PostgreSQL, not {connection.vendor}.")
+        return [self._inspect(case) for case in cases]
+
+    def _inspect(self, case: PlanCase) -> PlanResult:
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = case.build().explain()
+
+        if connection.vendor == "postgresql":
+            scan_pattern, sort_pattern = POSTGRESQL_FULL_SCAN, POSTGRESQL_SORT
+        else:
+            scan_pattern, sort_pattern = SQLITE_FULL_SCAN, SQLITE_SORT
+        scanned = sorted({match.group("table") for match in scan_pattern.finditer(plan)})
+        return PlanResult(
+            name=case.name,
+            plan=plan,
+            full_scans=[table for table in scanned if table not in case.allowed_scans],
+            sorts=case.index_order and bool(sort_pattern.search(plan)),
+        )
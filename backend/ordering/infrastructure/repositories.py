@@ -1,61 +1,478 @@
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
 from datetime import date
+from itertools import islice
 
-from django.db.models import QuerySet
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Prefetch, QuerySet, Sum, Value
+from django.db.models.functions import Coalesce
 
-from ordering.domain.entities import AgeGroupData, OrderGenerationInput, OrderProductData, ProductQuantityData
-from ordering.models import Day, Order, OrderProduct, ProductQuantity
+from ordering.domain.calendar import day_occurrences
+from ordering.domain.entities import (
+    AgeGroupData,
+    DemandMatrix,
+    MenuCycleData,
+    OrderGenerationInput,
+    OrderProductData,
+    OrderRefreshResult,
+    ProductQuantityData,
+    ProductTotalData,
+    QuantityContribution,
+    QuantityProfileData,
+)
+from ordering.domain.services import OrderGenerationService
+from ordering.infrastructure.consumption import ConsumptionRollupWriter
+from ordering.infrastructure.expressions import cents, day_weight, from_cents
+from ordering.models import AgeGroup, Day, DayDemand, Holiday, MenuCycle, Order, OrderProduct, ProductQuantity
+
+
+logger = logging.getLogger(__name__)
+
+
+def weighted_quantities(day_ids: list[int], product_category: str | None = None) -> QuerySet[ProductQuantity]:
+    """Product quantities of the selected days, each once, annotated with how many times it is served.
+
+    ``occurrences`` counts every recipe path from a selected day to the
+    quantity, times the number of times that day is listed, so a day repeated
+    across a date range is read once and weighted instead of joined again.
+    """
+    occurrences = day_occurrences(day_ids)
+    quantities = ProductQuantity.objects.filter(product__recipes__days__id__in=occurrences)
+    if product_category:
+        quantities = quantities.filter(product__category=product_category)
+    return (
+        quantities.annotate(occurrences=Sum(day_weight("product__recipes__days__id", occurrences)))
+        .select_related("product")
+        .prefetch_related(Prefetch("age_groups", queryset=AgeGroup.objects.order_by("id")))
+        .order_by("id")
+    )
+
+
+def quantity_data(quantity: ProductQuantity) -> ProductQuantityData:
+    return ProductQuantityData(
+        product_name=quantity.product.name,
+        unit_of_measure=quantity.unit_of_measure,
+        package_type=quantity.package_type,
+        quantity=quantity.quantity,
+        age_groups=[
+            AgeGroupData(name=age_group.name, quantity=age_group.quantity) for age_group in quantity.age_groups.all()
+        ],
+        occurrences=quantity.occurrences,
+    )
 
 
 class DjangoProductQuantityRepository:
     def list_by_day_ids(self, day_ids: list[int], product_category: str | None = None) -> list[ProductQuantityData]:
+        return [quantity_data(quantity) for quantity in weighted_quantities(day_ids, product_category)]
+
+
+class DjangoProductTotalRepository:
+    """Aggregates order totals in the database instead of in Python.
+
+    Amounts are summed as integer cents so SQLite (which has no exact decimal
+    type) and PostgreSQL produce the same totals as the Python path. Each join
+    row counts as many times as its day is listed, exactly like the occurrences
+    of ``DjangoProductQuantityRepository.list_by_day_ids``; the breakdown groups
+    identical join rows into one contribution with an occurrence count.
+    """
+
+    def sum_by_day_ids(self, day_ids: list[int], product_category: str | None = None) -> list[ProductTotalData]:
+        occurrences = day_occurrences(day_ids)
         quantities: QuerySet[ProductQuantity] = ProductQuantity.objects.filter(
-            product__recipes__days__id__in=day_ids
-        ).select_related("product").prefetch_related("age_groups")
+            product__recipes__days__id__in=occurrences
+        )
         if product_category:
             quantities = quantities.filter(product__category=product_category)
 
+        weight = day_weight("product__recipes__days__id", occurrences)
+        amount = cents("quantity") * F("age_groups__quantity") * weight
+        totals = {
+            (row["product__name"], row["package_type"], row["unit_of_measure"]): from_cents(row["cents"])
+            for row in quantities.values("product__name", "package_type", "unit_of_measure")
+            .annotate(cents=Coalesce(Sum(amount, output_field=IntegerField()), 0))
+            .order_by()
+        }
+        if not totals:
+            return []
+
+        breakdowns = self._breakdowns(quantities, weight)
+        return [
+            ProductTotalData(
+                product_name=name,
+                package_type=package_type,
+                unit_of_measure=unit,
+                quantity=amount,
+                breakdown=breakdowns[(name, package_type, unit)],
+            )
+            for (name, package_type, unit), amount in sorted(totals.items())
+        ]
+
+    def _breakdowns(
+        self,
+        quantities: QuerySet[ProductQuantity],
+        weight: Case | Value,
+    ) -> dict[tuple[str, str, str], list[QuantityContribution]]:
+        rows = (
+            quantities.values(
+                "id",
+                "product__name",
+                "package_type",
+                "unit_of_measure",
+                "quantity",
+                "age_groups__name",
+                "age_groups__quantity",
+            )
+            .annotate(occurrences=Sum(weight))
+            .order_by("id", "age_groups__id")
+        )
+
+        grouped: dict[int, dict] = {}
+        for row in rows:
+            entry = grouped.setdefault(
+                row["id"],
+                {
+                    "key": (row["product__name"], row["package_type"], row["unit_of_measure"]),
+                    "quantity": row["quantity"],
+                    "occurrences": row["occurrences"],
+                    "age_groups": [],
+                },
+            )
+            if row["age_groups__name"] is not None:
+                entry["age_groups"].append(AgeGroupData(name=row["age_groups__name"], quantity=row["age_groups__quantity"]))
+
+        breakdowns: dict[tuple[str, str, str], list[QuantityContribution]] = defaultdict(list)
+        for entry in grouped.values():
+            breakdowns[entry["key"]].append(
+                QuantityContribution(entry["quantity"], entry["age_groups"], entry["occurrences"])
+            )
+        return breakdowns
+
+
+class DjangoDemandMatrixRepository:
+    """Loads the quantity x day occurrence matrix shared by a batch of orders.
+
+    Rows are product quantities ordered by id; each day column counts how many
+    recipe paths reach a quantity on that day, which is the number of times the
+    Python path would see that quantity for the day.
+    """
+
+    def load_matrix(self, day_ids: list[int]) -> DemandMatrix:
+        quantities = list(
+            ProductQuantity.objects.filter(product__recipes__days__id__in=day_ids)
+            .distinct()
+            .select_related("product")
+            .prefetch_related(Prefetch("age_groups", queryset=AgeGroup.objects.order_by("id")))
+            .order_by("id")
+        )
+        row_indexes = {quantity.id: index for index, quantity in enumerate(quantities)}
+
+        day_columns: dict[int, list[int]] = {}
+        occurrences = (
+            ProductQuantity.objects.filter(product__recipes__days__id__in=day_ids)
+            .values("id", day_id=F("product__recipes__days__id"))
+            .annotate(paths=Count("*"))
+            .order_by()
+        )
+        for row in occurrences:
+            column = day_columns.setdefault(row["day_id"], [0] * len(quantities))
+            column[row_indexes[row["id"]]] = row["paths"]
+
+        return DemandMatrix(
+            quantities=[
+                QuantityProfileData(
+                    product_name=quantity.product.name,
+                    product_category=quantity.product.category,
+                    unit_of_measure=quantity.unit_of_measure,
+                    package_type=quantity.package_type,
+                    quantity=quantity.quantity,
+                    age_groups=[
+                        AgeGroupData(name=age_group.name, quantity=age_group.quantity)
+                        for age_group in quantity.age_groups.all()
+                    ],
+                )
+                for quantity in quantities
+            ],
+            day_columns=day_columns,
+        )
+
+
+class DjangoDayDemandRepository:
+    """Reads order totals from the precomputed ``DayDemand`` rows of each day.
+
+    The rows are kept current by ``ordering.infrastructure.day_demand``; only
+    the breakdown still looks at the age groups of the contributing quantities.
+    """
+
+    def sum_by_day_ids(self, day_ids: list[int], product_category: str | None = None) -> list[ProductTotalData]:
+        day_counts = day_occurrences(day_ids)
+        demands: QuerySet[DayDemand] = DayDemand.objects.filter(day_id__in=day_counts)
+        if product_category:
+            demands = demands.filter(product__category=product_category)
+
+        weight = day_weight("day_id", day_counts)
+        totals = {
+            (row["product__name"], row["package_type"], row["unit_of_measure"]): from_cents(row["cents"])
+            for row in demands.values("product__name", "package_type", "unit_of_measure")
+            .annotate(cents=Sum(cents("quantity") * weight, output_field=IntegerField()))
+            .order_by()
+        }
+        if not totals:
+            return []
+
+        occurrences = dict(
+            demands.values("product_quantity_id")
+            .annotate(total_occurrences=Sum(F("occurrences") * weight))
+            .order_by()
+            .values_list("product_quantity_id", "total_occurrences")
+        )
+        quantities = (
+            ProductQuantity.objects.filter(id__in=occurrences)
+            .select_related("product")
+            .prefetch_related(Prefetch("age_groups", queryset=AgeGroup.objects.order_by("id")))
+            .order_by("id")
+        )
+        breakdowns: dict[tuple[str, str, str], list[QuantityContribution]] = defaultdict(list)
+        for quantity in quantities:
+            breakdowns[(quantity.product.name, quantity.package_type, quantity.unit_of_measure)].append(
+                QuantityContribution(
+                    quantity.quantity,
+                    [AgeGroupData(name=age_group.name, quantity=age_group.quantity) for age_group in quantity.age_groups.all()],
+                    occurrences[quantity.id],
+                )
+            )
+
         return [
-            ProductQuantityData(
-                product_name=quantity.product.name,
-                unit_of_measure=quantity.unit_of_measure,
-                package_type=quantity.package_type,
-                quantity=quantity.quantity,
-                age_groups=[
-                    AgeGroupData(name=age_group.name, quantity=age_group.quantity)
-                    for age_group in quantity.age_groups.all()
-                ],
-            )
-            for quantity in quantities
+            ProductTotalData(
+                product_name=name,
+                package_type=package_type,
+                unit_of_measure=unit,
+                quantity=amount,
+                breakdown=breakdowns[(name, package_type, unit)],
+            )
+            for (name, package_type, unit), amount in sorted(totals.items())
         ]
 
 
+PRODUCT_TOTAL_READERS = {
+    "sql": DjangoProductTotalRepository,
+    "materialized": DjangoDayDemandRepository,
+}
+
+
+LINE_VALUE_FIELDS = ["quantity", "total", "qty_package", "detail", "breakdown"]
+
+
+@dataclass(frozen=True)
+class BatchTiming:
+    batch: int
+    rows: int
+    seconds: float
+
+
 class DjangoOrderRepository:
+    """Persists orders, inserting their lines in batches inside one transaction.
+
+    Lines are consumed lazily from the iterable passed in, so only one batch of
+    ``OrderProduct`` instances is alive at a time. Timings for the last write
+    are kept in ``batch_timings``. Every line write is applied to the
+    consumption rollups in the same transaction.
+    """
+
+    def __init__(self, batch_size: int | None = None) -> None:
+        self._batch_size = batch_size or settings.ORDER_PRODUCT_BATCH_SIZE
+        self.batch_timings: list[BatchTiming] = []
+
     def create_order(
         self,
         payload: OrderGenerationInput,
-        products: list[OrderProductData],
+        products: Iterable[OrderProductData],
         order_date: date,
     ) -> int:
-        order = Order.objects.create(name=payload.name, date=order_date, template_id=payload.template_id)
-        OrderProduct.objects.bulk_create(
+        self.batch_timings = []
+        with transaction.atomic():
+            order = Order.objects.create(**self._order_fields(payload, order_date))
+            self._index_days([order], [payload])
+            rollups = ConsumptionRollupWriter()
+            self._insert_products(((order, item) for item in products), rollups)
+            rollups.save()
+        return order.id
+
+    def create_orders(
+        self,
+        payloads: list[OrderGenerationInput],
+        products: list[Iterable[OrderProductData]],
+        order_dates: list[date],
+    ) -> list[int]:
+        self.batch_timings = []
+        with transaction.atomic():
+            orders = Order.objects.bulk_create(
+                [Order(**self._order_fields(payload, order_date)) for payload, order_date in zip(payloads, order_dates)]
+            )
+            self._index_days(orders, payloads)
+            rollups = ConsumptionRollupWriter()
+            self._insert_products(
+                ((order, item) for order, order_products in zip(orders, products) for item in order_products),
+                rollups,
+            )
+            rollups.save()
+        return [order.id for order in orders]
+
+    def delete_orders(self, order_ids: Iterable[int]) -> int:
+        """Deletes orders with their lines, taking the lines out of the consumption rollups."""
+        order_ids = list(order_ids)
+        with transaction.atomic():
+            order_dates = dict(Order.objects.select_for_update().filter(id__in=order_ids).values_list("id", "date"))
+            rollups = ConsumptionRollupWriter()
+            for line in OrderProduct.objects.filter(order_id__in=order_dates).only(
+                "order_id", "name", "package_type", "unit_of_measure", "quantity", "total", "qty_package"
+            ):
+                rollups.add(order_dates[line.order_id], line, sign=-1)
+            rollups.save()
+            Order.objects.filter(id__in=order_dates).delete()
+        return len(order_dates)
+
+    def _insert_products(
+        self,
+        rows: Iterator[tuple[Order, OrderProductData]],
+        rollups: ConsumptionRollupWriter,
+    ) -> None:
+        batch_number = 0
+        while True:
+            started = time.perf_counter()
+            batch = [
+                OrderProduct(order=order, **self._line_fields(item)) for order, item in islice(rows, self._batch_size)
+            ]
+            if not batch:
+                return
+
+            batch_number += 1
+            OrderProduct.objects.bulk_create(batch)
+            for line in batch:
+                rollups.add(line.order.date, line)
+            timing = BatchTiming(batch=batch_number, rows=len(batch), seconds=time.perf_counter() - started)
+            self.batch_timings.append(timing)
+            logger.debug("Inserted order product batch %s (%s rows) in %.4fs", timing.batch, timing.rows, timing.seconds)
+
+    def load_input(self, order_id: int) -> OrderGenerationInput:
+        """Returns the stored generation inputs of an order, raising ``ValueError`` when it cannot be refreshed."""
+        order = (
+            Order.objects.filter(id=order_id)
+            .values("name", "date", "day_ids", "product_category", "template_id")
+            .first()
+        )
+        if order is None:
+            raise ValueError("Order not found.")
+        if not order["day_ids"]:
+            raise ValueError("The order was generated before its inputs were stored and cannot be refreshed.")
+        return OrderGenerationInput(
+            name=order["name"],
+            date=order["date"],
+            day_ids=order["day_ids"],
+            product_category=order["product_category"] or None,
+            template_id=order["template_id"],
+        )
+
+    def sync_lines(self, order_id: int, products: Iterable[OrderProductData]) -> OrderRefreshResult:
+        """Makes the lines of an order match ``products``, writing only the lines that differ.
+
+        Lines are matched by product name, package type and unit, which are
+        unique within an order. Changed lines are saved with ``bulk_update``,
+        new ones are appended and missing ones deleted. The order revision is
+        bumped when anything changed, so cached documents are not reused.
+        """
+        with transaction.atomic():
+            order_date = Order.objects.filter(id=order_id).values_list("date", flat=True).get()
+            existing = {
+                (line.name, line.package_type, line.unit_of_measure): line
+                for line in OrderProduct.objects.select_for_update().filter(order_id=order_id)
+            }
+            rollups = ConsumptionRollupWriter()
+            changed, created = [], []
+            unchanged = 0
+            for item in products:
+                fields = self._line_fields(item)
+                line = existing.pop((item.name, item.package_type, item.unit_of_measure), None)
+                if line is None:
+                    created.append(OrderProduct(order_id=order_id, **fields))
+                    rollups.add(order_date, created[-1])
+                elif any(getattr(line, name) != value for name, value in fields.items()):
+                    rollups.add(order_date, line, sign=-1)
+                    for name, value in fields.items():
+                        setattr(line, name, value)
+                    rollups.add(order_date, line)
+                    changed.append(line)
+                else:
+                    unchanged += 1
+            for line in existing.values():
+                rollups.add(order_date, line, sign=-1)
+
+            OrderProduct.objects.bulk_update(changed, LINE_VALUE_FIELDS, batch_size=self._batch_size)
+            OrderProduct.objects.bulk_create(created, batch_size=self._batch_size)
+            OrderProduct.objects.filter(id__in=[line.id for line in existing.values()]).delete()
+            rollups.save()
+            if changed or created or existing:
+                Order.objects.filter(id=order_id).update(revision=F("revision") + 1)
+
+        return OrderRefreshResult(
+            order_id=order_id,
+            created=len(created),
+            updated=len(changed),
+            deleted=len(existing),
+            unchanged=unchanged,
+        )
+
+    @staticmethod
+    def _order_fields(payload: OrderGenerationInput, order_date: date) -> dict:
+        return {
+            "name": payload.name,
+            "date": order_date,
+            "template_id": payload.template_id,
+            "day_ids": payload.day_ids,
+            "product_category": payload.product_category or "",
+        }
+
+    @staticmethod
+    def _index_days(orders: list[Order], payloads: list[OrderGenerationInput]) -> None:
+        OrderDays = Order.days.through
+        OrderDays.objects.bulk_create(
             [
-                OrderProduct(
-                    order=order,
-                    name=item.name,
-                    package_type=item.package_type,
-                    unit_of_measure=item.unit_of_measure,
-                    quantity=item.quantity,
-                    total=item.total,
-                    qty_package=item.qty_package,
-                    detail=item.detail,
-                )
-                for item in products
+                OrderDays(order_id=order.id, day_id=day_id)
+                for order, payload in zip(orders, payloads)
+                for day_id in set(payload.day_ids)
             ]
         )
-        return order.id
+
+    @staticmethod
+    def _line_fields(item: OrderProductData) -> dict:
+        return {
+            "name": item.name,
+            "package_type": item.package_type,
+            "unit_of_measure": item.unit_of_measure,
+            "quantity": item.quantity,
+            "total": item.total,
+            "qty_package": item.qty_package,
+            "detail": item.detail,
+            "breakdown": OrderGenerationService.breakdown_to_primitive(item.breakdown),
+        }
 
 
 class DjangoDayRepository:
     def validate_ids(self, day_ids: list[int]) -> bool:
         existing_count = Day.objects.filter(id__in=day_ids).count()
         return existing_count == len(set(day_ids))
+
+
+class DjangoMenuCycleRepository:
+    def get_cycle(self, cycle_id: int) -> MenuCycleData | None:
+        cycle = MenuCycle.objects.filter(id=cycle_id).prefetch_related("slots").first()
+        if cycle is None:
+            return None
+        slots = sorted(cycle.slots.all(), key=lambda slot: slot.position)
+        return MenuCycleData(start_date=cycle.start_date, slots=[slot.day_id for slot in slots])
+
+    def holidays_between(self, start_date: date, end_date: date) -> set[date]:
+        return set(Holiday.objects.filter(date__range=(start_date, end_date)).values_list("date", flat=True))
@@ -0,0 +1,142 @@
+import re
+import unicodedata
+from collections.abc import Iterable
+from html import unescape
+
+from django.db import connection, transaction
+from django.db.models import FloatField, QuerySet
+from django.db.models.expressions import RawSQL
+from django.utils.html import strip_tags
+
+from ordering.models import Product, Recipe, SearchEntry, Template
+
+
+FTS_TABLE = "ordering_searchentry_fts"
+TERM_PATTERN = re.compile(r"\w+")
+
+
+def normalize_search_text(value: str) -> str:
+    """Lowercases and strips accents, so ``Azúcar`` and ``azucar`` index and match the same way."""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return " ".join("".join(char for char in decomposed if not unicodedata.combining(char)).lower().split())
+
+
+def html_to_text(content: str) -> str:
+    return unescape(strip_tags(content))
+
+
+def search_terms(query: str) -> list[str]:
+    return TERM_PATTERN.findall(normalize_search_text(query))
+
+
+def product_document(product: Product) -> tuple[str, str]:
+    return product.name, product.category
+
+
+def recipe_document(recipe: Recipe) -> tuple[str, str]:
+    return recipe.name, " ".join(product.name for product in recipe.products.all())
+
+
+def template_document(template: Template) -> tuple[str, str]:
+    return template.title, html_to_text(template.content)
+
+
+class SearchIndex:
+    """Full-text index over products, recipes and templates.
+
+    One ``SearchEntry`` row per object holds its accent-free title and body.
+    PostgreSQL matches them through a generated ``tsvector`` column with a GIN
+    index and ranks with ``ts_rank``; SQLite uses an external-content FTS5
+    table kept in sync by triggers and ranks with ``bm25``. Titles weigh more
+    than bodies on both. Every term is matched as a prefix.
+    """
+
+    documents = {
+        "product": (Product.objects.all(), product_document),
+        "recipe": (Recipe.objects.prefetch_related("products"), recipe_document),
+        "template": (Template.objects.all(), template_document),
+    }
+
+    def index(self, resource: str, object_ids: Iterable[int]) -> None:
+        queryset, build_document = self.documents[resource]
+        object_ids = set(object_ids)
+        if not object_ids:
+            return
+
+        entries = []
+        for instance in queryset.filter(id__in=object_ids):
+            title, body = build_document(instance)
+            entries.append(
+                SearchEntry(
+                    resource=resource,
+                    object_id=instance.pk,
+                    title=normalize_search_text(title),
+                    body=normalize_search_text(body),
+                )
+            )
+        with transaction.atomic():
+            SearchEntry.objects.filter(resource=resource, object_id__in=object_ids).delete()
+            SearchEntry.objects.bulk_create(entries, batch_size=500)
+
+    def remove(self, resource: str, object_ids: Iterable[int]) -> None:
+        SearchEntry.objects.filter(resource=resource, object_id__in=list(object_ids)).delete()
+
+    def rebuild(self) -> None:
+        with transaction.atomic():
+            SearchEntry.objects.all().delete()
+            for resource, (queryset, _) in self.documents.items():
+                self.index(resource, queryset.values_list("id", flat=True))
+
+    def filter_queryset(self, queryset: QuerySet, resource: str, query: str) -> QuerySet:
+        """Keeps the objects matching every term of ``query`` and annotates them with ``search_rank``."""
+        terms = search_terms(query)
+        if not terms:
+            return queryset
+
+        table = queryset.model._meta.db_table
+        pk_column = f'{connection.ops.quote_name(table)}.{connection.ops.quote_name(queryset.model._meta.pk.column)}'
+        matching_sql, matching_params = self._matching_sql(resource, terms)
+        rank_sql, rank_params = self._rank_sql(resource, terms, pk_column)
+        return queryset.filter(id__in=RawSQL(matching_sql, matching_params)).annotate(
+            search_rank=RawSQL(rank_sql, rank_params, output_field=FloatField())
+        )
+
+    @staticmethod
+    def _matching_sql(resource: str, terms: list[str]) -> tuple[str, list]:
+        if connection.vendor == "postgresql":
+            return (
+                "SELECT object_id FROM ordering_searchentry "
+                "WHERE resource = %s AND search_vector @@ to_tsquery('simple', %s)",
+                [resource, " & ".join(f"{term}:*" for term in terms)],
+            )
+        if connection.vendor == "sqlite":
+            return (
+                f"SELECT entry.object_id FROM {FTS_TABLE} JOIN ordering_searchentry entry ON entry.id = {FTS_TABLE}.rowid "
+                f"WHERE {FTS_TABLE} MATCH %s AND entry.resource = %s",
+                [" ".join(f'"{term}"*' for term in terms), resource],
+            )
+        return (
+            "SELECT object_id FROM ordering_searchentry WHERE resource = %s"
+            + " AND (title LIKE %s OR body LIKE %s)" * len(terms),
+            [resource, *(pattern for term in terms for pattern in (f"%{term}%", f"%{term}%"))],
+        )
+
+    @staticmethod
+    def _rank_sql(resource: str, terms: list[str], pk_column: str) -> tuple[str, list]:
+        if connection.vendor == "postgresql":
+            return (
+                "SELECT ts_rank(search_vector, to_tsquery('simple', %s)) FROM ordering_searchentry "
+                f"WHERE resource = %s AND object_id = {pk_column}",
+                [" & ".join(f"{term}:*" for term in terms), resource],
+            )
+        if connection.vendor == "sqlite":
+            return (
+                f"SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = "
+                f"(SELECT id FROM ordering_searchentry WHERE resource = %s AND object_id = {pk_column})",
+                [" ".join(f'"{term}"*' for term in terms), resource],
+            )
+        return "SELECT 0.0", []
+
+
+def recipes_for_products(product_ids: Iterable[int]) -> set[int]:
+    return set(Recipe.objects.filter(products__id__in=list(product_ids)).values_list("id", flat=True))
@@ -0,0 +1,122 @@
+import random
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.db import transaction
+
+from ordering.infrastructure.day_demand import DayDemandRefresher
+from ordering.infrastructure.search import SearchIndex
+from ordering.infrastructure.versions import CATALOG_RESOURCES, bump_version
+from ordering.models import AgeGroup, Day, Product, ProductQuantity, Recipe
+
+
+BULK_BATCH_SIZE = 1000
+CATEGORIES = ("Almacen", "Lacteos", "Verduras", "Frutas", "Carnes", "Panificados")
+UNITS = ("g", "ml", "u")
+PACKAGE_TYPES = ("1", "2.5", "6", "12", "1000")
+
+
+@dataclass(frozen=True)
+class CatalogSize:
+    products: int = 200
+    quantities_per_product: int = 3
+    age_groups: int = 5
+    recipes: int = 60
+    days: int = 20
+    products_per_recipe: int = 8
+    recipes_per_day: int = 4
+    age_groups_per_quantity: int = 3
+
+
+class SyntheticCatalogGenerator:
+    """Seeds a reproducible random catalog with bulk inserts.
+
+    ``bulk_create`` skips the model signals, so the day demand table, the
+    search index and the catalog versions are refreshed once at the end
+    instead of per row.
+    """
+
+    def __init__(self, size: CatalogSize, seed: int = 0, prefix: str = "Bench") -> None:
+        self._size = size
+        self._random = random.Random(seed)
+        self._prefix = prefix
+
+    def generate(self) -> dict[str, int]:
+        size = self._size
+        rnd = self._random
+        with transaction.atomic():
+            age_groups = AgeGroup.objects.bulk_create(
+                [AgeGroup(name=f"{self._prefix} group {i}", quantity=rnd.randint(1, 60)) for i in range(size.age_groups)],
+                batch_size=BULK_BATCH_SIZE,
+            )
+            products = Product.objects.bulk_create(
+                [
+                    Product(name=f"{self._prefix} product {i}", category=rnd.choice(CATEGORIES))
+                    for i in range(size.products)
+                ],
+                batch_size=BULK_BATCH_SIZE,
+            )
+            quantities = ProductQuantity.objects.bulk_create(
+                [
+                    ProductQuantity(
+                        product=product,
+                        unit_of_measure=rnd.choice(UNITS),
+                        quantity=Decimal(rnd.randint(1, 50000)) / 100 + index,
+                        package_type=rnd.choice(PACKAGE_TYPES),
+                    )
+                    for product in products
+                    for index in range(size.quantities_per_product)
+                ],
+                batch_size=BULK_BATCH_SIZE,
+            )
+            recipes = Recipe.objects.bulk_create(
+                [Recipe(name=f"{self._prefix} recipe {i}") for i in range(size.recipes)],
+                batch_size=BULK_BATCH_SIZE,
+            )
+            days = Day.objects.bulk_create(
+                [Day(name=f"{self._prefix} day {i}") for i in range(size.days)],
+                batch_size=BULK_BATCH_SIZE,
+            )
+
+            self._link(
+                ProductQuantity.age_groups.through,
+                "productquantity_id",
+                "agegroup_id",
+                quantities,
+                age_groups,
+                size.age_groups_per_quantity,
+            )
+            self._link(Recipe.products.through, "recipe_id", "product_id", recipes, products, size.products_per_recipe)
+            self._link(Day.recipes.through, "day_id", "recipe_id", days, recipes, size.recipes_per_day)
+
+            DayDemandRefresher().refresh_days(day.pk for day in days)
+            search_index = SearchIndex()
+            search_index.index("product", (product.pk for product in products))
+            search_index.index("recipe", (recipe.pk for recipe in recipes))
+            for resource in CATALOG_RESOURCES:
+                bump_version(resource)
+
+        return {
+            "products": len(products),
+            "product_quantities": len(quantities),
+            "age_groups": len(age_groups),
+            "recipes": len(recipes),
+            "days": len(days),
+        }
+
+    def _link(self, through, source_field: str, target_field: str, sources: list, targets: list, per_source: int) -> None:
+        count = min(per_source, len(targets))
+        through.objects.bulk_create(
+            [
+                through(**{source_field: source.pk, target_field: target.pk})
+                for source in sources
+                for target in self._random.sample(targets, count)
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+
+
+def clear_catalog() -> None:
+    with transaction.atomic():
+        for model in (Day, Recipe, ProductQuantity, Product, AgeGroup):
+            model.objects.all().delete()
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from ordering.models import ResourceVersion
+
+
+CATALOG_RESOURCES = ("product", "age_group", "product_quantity", "recipe", "day")
+
+
+def bump_version(resource: str) -> None:
+    now = timezone.now()
+    if ResourceVersion.objects.filter(resource=resource).update(version=F("version") + 1, updated_at=now):
+        return
+    try:
+        with transaction.atomic():
+            ResourceVersion.objects.create(resource=resource, updated_at=now)
+    except IntegrityError:
+        ResourceVersion.objects.filter(resource=resource).update(version=F("version") + 1, updated_at=now)
+
+
+def get_versions(resources: tuple[str, ...]) -> dict[str, tuple[int, datetime | None]]:
+    """Returns ``(version, updated_at)`` per resource; never written resources are at version 0."""
+    stored = {
+        resource: (version, updated_at)
+        for resource, version, updated_at in ResourceVersion.objects.filter(resource__in=resources).values_list(
+            "resource", "version", "updated_at"
+        )
+    }
+    return {resource: stored.get(resource, (0, None)) for resource in resources}
+
+
+def catalog_version() -> tuple[int, ...]:
+    versions = get_versions(CATALOG_RESOURCES)
+    return tuple(versions[resource][0] for resource in CATALOG_RESOURCES)
@@ -0,0 +1,40 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ordering.infrastructure.benchmark import DEFAULT_ENDPOINTS, BenchmarkRunner
+
+
+class Command(BaseCommand):
+    help = "Times order generation, the repositories and the list endpoints and prints the results as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case.")
+        parser.add_argument("--days", type=int, default=None, help="Number of days to generate the order for (default all).")
+        parser.add_argument(
+            "--endpoint",
+            action="append",
+            dest="endpoints",
+            help="Endpoint path to time; can be repeated. Defaults to the main list endpoints.",
+        )
+        parser.add_argument("--label", default="", help="Free text stored in the output, e.g. a commit hash.")
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1.")
+
+        runner = BenchmarkRunner(repeat=options["repeat"], day_limit=options["days"])
+        try:
+            report = runner.run(tuple(options["endpoints"] or DEFAULT_ENDPOINTS))
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        report["meta"]["label"] = options["label"]
+
+        content = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                output.write(content + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Benchmark report written to {options['output']}."))
+            return
+        self.stdout.write(content)
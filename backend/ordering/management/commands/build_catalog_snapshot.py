@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ordering.infrastructure.catalog_snapshot import CatalogSnapshot, CatalogSnapshotBuilder
+
+
+class Command(BaseCommand):
+    help = "Writes the memory-mapped catalog snapshot read by order generation, e.g. on deploy."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--path", help="Snapshot file to write. Defaults to CATALOG_SNAPSHOT_PATH.")
+
+    def handle(self, *args, **options):
+        path = options["path"] or settings.CATALOG_SNAPSHOT_PATH
+        if not path:
+            raise CommandError("CATALOG_SNAPSHOT_PATH is empty; pass --path or set it to enable snapshots.")
+
+        version = CatalogSnapshotBuilder().write(path)
+        if version is None:
+            raise CommandError("The catalog changed while the snapshot was built; run the command again.")
+
+        snapshot = CatalogSnapshot(path)
+        self.stdout.write(
+            self.style.SUCCESS(f"Catalog snapshot {path} written ({snapshot.size} bytes, version {list(version)}).")
+        )
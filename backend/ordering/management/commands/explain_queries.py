@@ -0,0 +1,44 @@
+import json
+import textwrap
+from dataclasses import asdict
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from ordering.infrastructure.query_plans import QueryPlanInspector
+
+
+class Command(BaseCommand):
+    help = "Captures EXPLAIN plans of the hot queries and fails when one needs a full table scan or a sort."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", help="Write the plans as JSON to this file.")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan, not only failing ones.")
+
+    def handle(self, *args, **options):
+        try:
+            results = QueryPlanInspector().inspect()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        for result in results:
+            if result.ok:
+                self.stdout.write(f"ok    {result.name}")
+            else:
+                problems = [f"full scan of {table}" for table in result.full_scans]
+                if result.sorts:
+                    problems.append("sorts instead of reading in index order")
+                self.stdout.write(self.style.ERROR(f"FAIL  {result.name}: {', '.join(problems)}"))
+            if options["verbose_plans"] or not result.ok:
+                self.stdout.write(textwrap.indent(result.plan, "      "))
+
+        if options["output"]:
+            report = {"database": connection.vendor, "plans": [asdict(result) for result in results]}
+            with open(options["output"], "w", encoding="utf-8") as output:
+                output.write(json.dumps(report, indent=2) + "\n")
+            self.stdout.write(f"Plans written to {options['output']}.")
+
+        failed = [result.name for result in results if not result.ok]
+        if failed:
+            raise CommandError(f"{len(failed)} query plan(s) regressed: {', '.join(failed)}.")
+        self.stdout.write(self.style.SUCCESS(f"All {len(results)} query plans use indexes."))
@@ -0,0 +1,21 @@
+import sys
+from contextlib import nullcontext
+
+from django.core.management.base import BaseCommand
+
+from ordering.infrastructure.catalog_transfer import FILE_FORMATS, RESOURCE_FIELDS, export_rows, write_rows
+
+
+class Command(BaseCommand):
+    help = "Streams products, product quantities, recipes or days to CSV or JSON Lines."
+
+    def add_arguments(self, parser):
+        parser.add_argument("resource", choices=list(RESOURCE_FIELDS))
+        parser.add_argument("--format", dest="file_format", choices=FILE_FORMATS, default="csv")
+        parser.add_argument("--output", help="File to write; defaults to standard output.")
+
+    def handle(self, *args, **options):
+        output = options["output"]
+        with nullcontext(sys.stdout) if not output else open(output, "w", encoding="utf-8", newline="") as stream:
+            for chunk in write_rows(export_rows(options["resource"]), options["resource"], options["file_format"]):
+                stream.write(chunk)
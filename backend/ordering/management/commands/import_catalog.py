@@ -0,0 +1,39 @@
+import csv
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ordering.infrastructure.catalog_transfer import FILE_FORMATS, RESOURCE_FIELDS, CatalogImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = "Imports products, product quantities, recipes or days from a CSV or JSON Lines file in one transaction."
+
+    def add_arguments(self, parser):
+        parser.add_argument("resource", choices=list(RESOURCE_FIELDS))
+        parser.add_argument("path", help="File to import; '-' reads standard input.")
+        parser.add_argument("--format", dest="file_format", choices=FILE_FORMATS, help="Defaults to the file extension.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate the rows without saving them.")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["file_format"] or ("jsonl" if path.endswith((".jsonl", ".ndjson")) else "csv")
+        importer = CatalogImporter(options["resource"])
+
+        try:
+            with nullcontext(sys.stdin.buffer) if path == "-" else Path(path).open("rb") as stream:
+                report = importer.run(read_rows(stream, file_format), dry_run=options["dry_run"])
+        except (OSError, csv.Error, UnicodeDecodeError) as exc:
+            raise CommandError(f"Could not read {path}: {exc}")
+
+        for error in report.errors:
+            self.stdout.write(f"row {error.row}: {error.message}")
+        if not report.ok:
+            raise CommandError(f"{len(report.errors)} invalid rows; nothing was imported.")
+
+        label = "Dry run" if report.dry_run else "Imported"
+        self.stdout.write(
+            self.style.SUCCESS(f"{label} {report.resource} rows: {report.created} created, {report.updated} updated.")
+        )
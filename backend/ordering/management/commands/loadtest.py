@@ -0,0 +1,33 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ordering.infrastructure.loadtest import LoadTestRunner
+
+
+class Command(BaseCommand):
+    help = "Sends concurrent requests to the sync and async endpoints through the ASGI handler and prints throughput as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=10, help="Concurrent clients.")
+        parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint.")
+        parser.add_argument("--days", type=int, default=3, help="Days per generated order.")
+        parser.add_argument("--output", help="Write the JSON report to this file instead of stdout.")
+
+    def handle(self, *args, **options):
+        if options["clients"] < 1 or options["requests"] < 1:
+            raise CommandError("--clients and --requests must be at least 1.")
+
+        runner = LoadTestRunner(clients=options["clients"], requests=options["requests"], days_per_order=options["days"])
+        try:
+            report = runner.run()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        content = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                output.write(content + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Load test report written to {options['output']}."))
+            return
+        self.stdout.write(content)
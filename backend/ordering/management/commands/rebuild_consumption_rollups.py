@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ordering.infrastructure.consumption import ConsumptionRollupBuilder
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the weekly and monthly consumption rollups from the order lines, or checks them with --check."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Compare the stored rollups with the order lines without writing and fail if they differ.",
+        )
+
+    def handle(self, *args, **options):
+        builder = ConsumptionRollupBuilder()
+        if not options["check"]:
+            count = builder.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Consumption rollups rebuilt ({count} rows)."))
+            return
+
+        drift = builder.check()
+        if not drift.has_drift:
+            self.stdout.write(self.style.SUCCESS("Consumption rollups are up to date."))
+            return
+
+        for label, keys in (("missing", drift.missing), ("stale", drift.stale), ("unexpected", drift.unexpected)):
+            for period, start, name, package_type, unit in keys:
+                self.stdout.write(f"{label}: {period} {start} {name} / {package_type} / {unit}")
+        raise CommandError(
+            f"Consumption rollup drift: {len(drift.missing)} missing, {len(drift.stale)} stale, "
+            f"{len(drift.unexpected)} unexpected rows. Run rebuild_consumption_rollups to fix it."
+        )
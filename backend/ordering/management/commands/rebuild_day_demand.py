@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ordering.infrastructure.day_demand import DayDemandRefresher
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the precomputed per-day demand table, or checks it for drift with --check."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Compare the stored rows with the catalog without writing and fail if they differ.",
+        )
+
+    def handle(self, *args, **options):
+        refresher = DayDemandRefresher()
+        if not options["check"]:
+            refresher.rebuild()
+            self.stdout.write(self.style.SUCCESS("Day demand table rebuilt."))
+            return
+
+        drift = refresher.check()
+        if not drift.has_drift:
+            self.stdout.write(self.style.SUCCESS("Day demand table is up to date."))
+            return
+
+        for label, keys in (("missing", drift.missing), ("stale", drift.stale), ("unexpected", drift.unexpected)):
+            for day_id, quantity_id in keys:
+                self.stdout.write(f"{label}: day={day_id} product_quantity={quantity_id}")
+        raise CommandError(
+            f"Day demand drift: {len(drift.missing)} missing, {len(drift.stale)} stale, "
+            f"{len(drift.unexpected)} unexpected rows. Run rebuild_day_demand to fix it."
+        )
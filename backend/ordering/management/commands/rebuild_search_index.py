@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from ordering.infrastructure.search import SearchIndex
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the full-text search index of products, recipes and templates."
+
+    def handle(self, *args, **options):
+        SearchIndex().rebuild()
+        self.stdout.write(self.style.SUCCESS("Search index rebuilt."))
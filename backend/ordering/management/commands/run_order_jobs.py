@@ -0,0 +1,41 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ordering.infrastructure.jobs import order_job_queue
+
+
+class Command(BaseCommand):
+    help = "Runs queued order generation jobs, polling the job table until stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Run the jobs queued now and exit.")
+        parser.add_argument("--interval", type=float, default=1.0, help="Seconds between polls when the queue is empty.")
+        parser.add_argument(
+            "--purge-days",
+            type=int,
+            default=None,
+            help="First delete finished jobs older than this many days.",
+        )
+
+    def handle(self, *args, **options):
+        if options["interval"] <= 0:
+            raise CommandError("--interval must be positive.")
+
+        if options["purge_days"] is not None:
+            purged = order_job_queue.purge(timedelta(days=options["purge_days"]))
+            self.stdout.write(f"Purged {purged} finished jobs.")
+
+        processed = 0
+        try:
+            while True:
+                if order_job_queue.run_next():
+                    processed += 1
+                    continue
+                if options["once"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Ran {processed} order jobs."))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ordering.infrastructure.synthetic_catalog import CatalogSize, SyntheticCatalogGenerator, clear_catalog
+
+
+class Command(BaseCommand):
+    help = "Seeds a synthetic catalog of configurable size for benchmarking."
+
+    def add_arguments(self, parser):
+        defaults = CatalogSize()
+        parser.add_argument("--products", type=int, default=defaults.products)
+        parser.add_argument("--quantities-per-product", type=int, default=defaults.quantities_per_product)
+        parser.add_argument("--age-groups", type=int, default=defaults.age_groups)
+        parser.add_argument("--recipes", type=int, default=defaults.recipes)
+        parser.add_argument("--days", type=int, default=defaults.days)
+        parser.add_argument("--products-per-recipe", type=int, default=defaults.products_per_recipe)
+        parser.add_argument("--recipes-per-day", type=int, default=defaults.recipes_per_day)
+        parser.add_argument("--age-groups-per-quantity", type=int, default=defaults.age_groups_per_quantity)
+        parser.add_argument("--seed", type=int, default=0, help="Random seed, so the same catalog can be rebuilt.")
+        parser.add_argument("--prefix", default="Bench", help="Prefix for the generated names.")
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete every product, age group, recipe and day before seeding.",
+        )
+
+    def handle(self, *args, **options):
+        size = CatalogSize(
+            products=options["products"],
+            quantities_per_product=options["quantities_per_product"],
+            age_groups=options["age_groups"],
+            recipes=options["recipes"],
+            days=options["days"],
+            products_per_recipe=options["products_per_recipe"],
+            recipes_per_day=options["recipes_per_day"],
+            age_groups_per_quantity=options["age_groups_per_quantity"],
+        )
+        if any(value < 0 for value in vars(size).values()):
+            raise CommandError("Catalog sizes cannot be negative.")
+
+        if options["clear"]:
+            clear_catalog()
+        counts = SyntheticCatalogGenerator(size, seed=options["seed"], prefix=options["prefix"]).generate()
+        summary = ", ".join(f"{count} {label.replace('_', ' ')}" for label, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded {summary}."))
@@ -0,0 +1,76 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:22
+
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F, IntegerField, Sum, Value
+from django.db.models.functions import Cast, Coalesce, Round
+
+
+def populate_day_demand(apps, schema_editor):
+    DayDemand = apps.get_model("ordering", "DayDemand")
+    ProductQuantity = apps.get_model("ordering", "ProductQuantity")
+
+    paths = list(
+        ProductQuantity.objects.filter(product__recipes__days__isnull=False)
+        .values("id", "product_id", "package_type", "unit_of_measure", day_id=F("product__recipes__days__id"))
+        .annotate(occurrences=Count("*"))
+        .order_by()
+    )
+    base_cents = dict(
+        ProductQuantity.objects.values("id")
+        .annotate(
+            base=Coalesce(
+                Sum(
+                    Cast(Round(F("quantity") * Value(Decimal("100"))), IntegerField()) * F("age_groups__quantity"),
+                    output_field=IntegerField(),
+                ),
+                0,
+            )
+        )
+        .order_by()
+        .values_list("id", "base")
+    )
+    DayDemand.objects.bulk_create(
+        [
+            DayDemand(
+                day_id=row["day_id"],
+                product_quantity_id=row["id"],
+                product_id=row["product_id"],
+                package_type=row["package_type"],
+                unit_of_measure=row["unit_of_measure"],
+                occurrences=row["occurrences"],
+                quantity=Decimal(base_cents[row["id"]] * row["occurrences"]).scaleb(-2),
+            )
+            for row in paths
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0007_order_template'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DayDemand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('package_type', models.CharField(max_length=50)),
+                ('unit_of_measure', models.CharField(max_length=20)),
+                ('occurrences', models.PositiveIntegerField()),
+                ('quantity', models.DecimalField(decimal_places=2, max_digits=14)),
+                ('day', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='demands', to='ordering.day')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='day_demands', to='ordering.product')),
+                ('product_quantity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='day_demands', to='ordering.productquantity')),
+            ],
+            options={
+                'unique_together': {('day', 'product_quantity')},
+            },
+        ),
+        migrations.RunPython(populate_day_demand, migrations.RunPython.noop),
+    ]
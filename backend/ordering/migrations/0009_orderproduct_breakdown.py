@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0008_daydemand'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='orderproduct',
+            name='breakdown',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:37
+
+import base64
+import binascii
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+INLINE_IMAGE_PATTERN = re.compile(
+    r"""(?P<prefix>\bsrc\s*=\s*(?P<quote>["']))data:(?P<content_type>image/[A-Za-z0-9.+-]+);base64,(?P<data>[A-Za-z0-9+/=\s]+)(?P=quote)"""
+)
+
+
+def extract_template_assets(apps, schema_editor):
+    Asset = apps.get_model("ordering", "Asset")
+    Template = apps.get_model("ordering", "Template")
+    root = Path(settings.ASSET_STORAGE_DIR)
+
+    def save(data: bytes, content_type: str) -> str:
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = root / sha256[:2] / sha256
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=path.parent)
+            with os.fdopen(descriptor, "wb") as blob:
+                blob.write(data)
+            os.replace(temporary, path)
+        Asset.objects.get_or_create(sha256=sha256, defaults={"content_type": content_type, "size": len(data)})
+        return sha256
+
+    def replace(match: re.Match) -> str:
+        try:
+            data = base64.b64decode("".join(match.group("data").split()), validate=True)
+        except (binascii.Error, ValueError):
+            return match.group(0)
+        sha256 = save(data, match.group("content_type").lower())
+        return f"{match.group('prefix')}/api/assets/{sha256}/{match.group('quote')}"
+
+    for template_id in Template.objects.filter(content__contains="data:image/").values_list("id", flat=True):
+        content = Template.objects.filter(id=template_id).values_list("content", flat=True).get()
+        Template.objects.filter(id=template_id).update(content=INLINE_IMAGE_PATTERN.sub(replace, content))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0010_resourceversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Asset',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sha256', models.CharField(max_length=64, unique=True)),
+                ('content_type', models.CharField(max_length=100)),
+                ('size', models.PositiveBigIntegerField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.RunPython(extract_template_assets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:38
+
+import unicodedata
+from html import unescape
+
+from django.db import migrations, models
+from django.utils.html import strip_tags
+
+
+POSTGRESQL_FORWARD = [
+    "ALTER TABLE ordering_searchentry ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', title), 'A') || setweight(to_tsvector('simple', body), 'B')) STORED",
+    "CREATE INDEX ordering_searchentry_vector_gin ON ordering_searchentry USING GIN (search_vector)",
+]
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE ordering_searchentry_fts USING fts5("
+    "title, body, content='ordering_searchentry', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER ordering_searchentry_ai AFTER INSERT ON ordering_searchentry BEGIN "
+    "INSERT INTO ordering_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER ordering_searchentry_ad AFTER DELETE ON ordering_searchentry BEGIN "
+    "INSERT INTO ordering_searchentry_fts(ordering_searchentry_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER ordering_searchentry_au AFTER UPDATE ON ordering_searchentry BEGIN "
+    "INSERT INTO ordering_searchentry_fts(ordering_searchentry_fts, rowid, title, body) "
+    "VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO ordering_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS ordering_searchentry_ai",
+    "DROP TRIGGER IF EXISTS ordering_searchentry_ad",
+    "DROP TRIGGER IF EXISTS ordering_searchentry_au",
+    "DROP TABLE IF EXISTS ordering_searchentry_fts",
+]
+
+
+def normalize_search_text(value):
+    decomposed = unicodedata.normalize("NFKD", value)
+    return " ".join("".join(char for char in decomposed if not unicodedata.combining(char)).lower().split())
+
+
+def html_to_text(content):
+    return unescape(strip_tags(content))
+
+
+def create_search_backend(apps, schema_editor):
+    statements = {"postgresql": POSTGRESQL_FORWARD, "sqlite": SQLITE_FORWARD}.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_backend(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in SQLITE_BACKWARD:
+            schema_editor.execute(statement)
+
+
+def populate_search_entries(apps, schema_editor):
+    SearchEntry = apps.get_model("ordering", "SearchEntry")
+    Product = apps.get_model("ordering", "Product")
+    Recipe = apps.get_model("ordering", "Recipe")
+    Template = apps.get_model("ordering", "Template")
+
+    documents = [
+        *(("product", product.id, product.name, product.category) for product in Product.objects.all()),
+        *(
+            ("recipe", recipe.id, recipe.name, " ".join(product.name for product in recipe.products.all()))
+            for recipe in Recipe.objects.prefetch_related("products")
+        ),
+        *(
+            ("template", template.id, template.title, html_to_text(template.content))
+            for template in Template.objects.all()
+        ),
+    ]
+    SearchEntry.objects.bulk_create(
+        [
+            SearchEntry(
+                resource=resource,
+                object_id=object_id,
+                title=normalize_search_text(title),
+                body=normalize_search_text(body),
+            )
+            for resource, object_id, title, body in documents
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0011_asset'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=20)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('title', models.TextField()),
+                ('body', models.TextField(blank=True, default='')),
+            ],
+            options={
+                'unique_together': {('resource', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_search_backend, drop_search_backend),
+        migrations.RunPython(populate_search_entries, migrations.RunPython.noop),
+    ]
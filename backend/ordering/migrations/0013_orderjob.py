@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0012_searchentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('idempotency_key', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+                ('fingerprint', models.CharField(max_length=64)),
+                ('payload', models.JSONField()),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('stage', models.CharField(blank=True, default='', max_length=20)),
+                ('stage_timings', models.JSONField(blank=True, default=dict)),
+                ('claim_token', models.CharField(blank=True, default='', max_length=32)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='ordering.order')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='ordering_or_status_a7faee_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:54
+
+from django.db import migrations, models
+
+
+# Auto-created many-to-many tables take no Meta.indexes. Their unique (source, target) index serves lookups
+# from the source side; these cover the reverse direction, which otherwise reads every matching row.
+THROUGH_INDEXES = [
+    ("ordering_day_recipes_recipe_day_idx", "ordering_day_recipes", "recipe_id, day_id"),
+    ("ordering_recipe_products_product_recipe_idx", "ordering_recipe_products", "product_id, recipe_id"),
+    (
+        "ordering_productquantity_age_groups_agegroup_quantity_idx",
+        "ordering_productquantity_age_groups",
+        "agegroup_id, productquantity_id",
+    ),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0014_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['date', 'id'], name='ordering_or_date_8a2e81_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['category', 'name'], name='ordering_pr_categor_d13d7d_idx'),
+        ),
+        migrations.RunSQL(
+            [f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})" for name, table, columns in THROUGH_INDEXES],
+            [f"DROP INDEX IF EXISTS {name}" for name, _, _ in THROUGH_INDEXES],
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0015_query_plan_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='order',
+            name='day_ids',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='days',
+            field=models.ManyToManyField(blank=True, related_name='orders', to='ordering.day'),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='product_category',
+            field=models.CharField(blank=True, default='', max_length=80),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='revision',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        # Covers the day -> orders lookup of the affected orders endpoint, like the indexes of 0015.
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS ordering_order_days_day_order_idx ON ordering_order_days (day_id, order_id)",
+            "DROP INDEX IF EXISTS ordering_order_days_day_order_idx",
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0016_order_generation_inputs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Holiday',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('name', models.CharField(blank=True, default='', max_length=120)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MenuCycle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=120, unique=True)),
+                ('start_date', models.DateField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MenuCycleSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField()),
+                ('cycle', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='ordering.menucycle')),
+                ('day', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='cycle_slots', to='ordering.day')),
+            ],
+            options={
+                'unique_together': {('cycle', 'position')},
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:09
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth, TruncWeek
+
+
+def build_rollups(apps, schema_editor):
+    ConsumptionRollup = apps.get_model("ordering", "ConsumptionRollup")
+    OrderProduct = apps.get_model("ordering", "OrderProduct")
+
+    rollups = []
+    for period, truncation in (("week", TruncWeek("order__date")), ("month", TruncMonth("order__date"))):
+        rows = (
+            OrderProduct.objects.annotate(period_start=truncation)
+            .values("period_start", "name", "package_type", "unit_of_measure")
+            .annotate(
+                sum_quantity=Sum("quantity"),
+                sum_total=Sum("total"),
+                sum_qty_package=Sum("qty_package"),
+                line_count=Count("id"),
+            )
+            .order_by()
+        )
+        rollups.extend(
+            ConsumptionRollup(
+                period=period,
+                period_start=row["period_start"],
+                name=row["name"],
+                package_type=row["package_type"],
+                unit_of_measure=row["unit_of_measure"],
+                quantity=row["sum_quantity"],
+                total=row["sum_total"],
+                qty_package=row["sum_qty_package"],
+                lines=row["line_count"],
+            )
+            for row in rows
+        )
+    ConsumptionRollup.objects.bulk_create(rollups, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ordering', '0017_menu_cycles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConsumptionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('week', 'Week'), ('month', 'Month')], max_length=10)),
+                ('period_start', models.DateField()),
+                ('name', models.CharField(max_length=120)),
+                ('package_type', models.CharField(max_length=50)),
+                ('unit_of_measure', models.CharField(max_length=20)),
+                ('quantity', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('total', models.BigIntegerField(default=0)),
+                ('qty_package', models.BigIntegerField(default=0)),
+                ('lines', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'unique_together': {('period', 'period_start', 'name', 'package_type', 'unit_of_measure')},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
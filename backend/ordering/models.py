@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
 
@@ -5,6 +6,9 @@ class Product(models.Model):
     name = models.CharField(max_length=120, unique=True)
     category = models.CharField(max_length=80)
 
+    class Meta:
+        indexes = [models.Index(fields=["category", "name"])]
+
     def __str__(self) -> str:
         return self.name
 
@@ -47,10 +51,61 @@ class Day(models.Model):
         return self.name
 
 
+class MenuCycle(models.Model):
+    name = models.CharField(max_length=120, unique=True)
+    start_date = models.DateField()
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class MenuCycleSlot(models.Model):
+    cycle = models.ForeignKey(MenuCycle, on_delete=models.CASCADE, related_name="slots")
+    position = models.PositiveSmallIntegerField()
+    day = models.ForeignKey(Day, on_delete=models.SET_NULL, null=True, blank=True, related_name="cycle_slots")
+
+    class Meta:
+        unique_together = ("cycle", "position")
+
+    def __str__(self) -> str:
+        return f"{self.cycle.name} #{self.position}"
+
+
+class Holiday(models.Model):
+    date = models.DateField(unique=True)
+    name = models.CharField(max_length=120, blank=True, default="")
+
+    def __str__(self) -> str:
+        return f"{self.date} {self.name}".strip()
+
+
+class DayDemand(models.Model):
+    day = models.ForeignKey(Day, on_delete=models.CASCADE, related_name="demands")
+    product_quantity = models.ForeignKey(ProductQuantity, on_delete=models.CASCADE, related_name="day_demands")
+    product = models.ForeignKey(Product, on_delete=models.CASCADE, related_name="day_demands")
+    package_type = models.CharField(max_length=50)
+    unit_of_measure = models.CharField(max_length=20)
+    occurrences = models.PositiveIntegerField()
+    quantity = models.DecimalField(max_digits=14, decimal_places=2)
+
+    class Meta:
+        unique_together = ("day", "product_quantity")
+
+    def __str__(self) -> str:
+        return f"{self.day.name} - {self.product_quantity_id} x {self.occurrences}"
+
+
 class Order(models.Model):
     name = models.CharField(max_length=120)
     date = models.DateField()
     template = models.ForeignKey("Template", on_delete=models.SET_NULL, null=True, blank=True, related_name="orders")
+    day_ids = models.JSONField(null=True, blank=True)
+    product_category = models.CharField(max_length=80, blank=True, default="")
+    days = models.ManyToManyField(Day, related_name="orders", blank=True)
+    revision = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [models.Index(fields=["date", "id"])]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.date})"
@@ -65,14 +120,115 @@ class OrderProduct(models.Model):
     total = models.PositiveIntegerField(default=0)
     qty_package = models.PositiveIntegerField(default=0)
     detail = models.TextField(blank=True, default="")
+    breakdown = models.JSONField(blank=True, default=list)
 
     def __str__(self) -> str:
         return f"{self.name} - {self.quantity} {self.unit_of_measure}"
 
 
+class ConsumptionRollup(models.Model):
+    WEEK = "week"
+    MONTH = "month"
+    PERIOD_CHOICES = [(WEEK, "Week"), (MONTH, "Month")]
+
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+    name = models.CharField(max_length=120)
+    package_type = models.CharField(max_length=50)
+    unit_of_measure = models.CharField(max_length=20)
+    quantity = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total = models.BigIntegerField(default=0)
+    qty_package = models.BigIntegerField(default=0)
+    lines = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("period", "period_start", "name", "package_type", "unit_of_measure")
+
+    def __str__(self) -> str:
+        return f"{self.period} {self.period_start} - {self.name} {self.quantity} {self.unit_of_measure}"
+
+
 class Template(models.Model):
     title = models.CharField(max_length=120, unique=True)
     content = models.TextField()
 
     def __str__(self) -> str:
         return self.title
+
+
+class Asset(models.Model):
+    sha256 = models.CharField(max_length=64, unique=True)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.sha256[:12]} ({self.content_type}, {self.size} bytes)"
+
+
+class SearchEntry(models.Model):
+    resource = models.CharField(max_length=20)
+    object_id = models.PositiveBigIntegerField()
+    title = models.TextField()
+    body = models.TextField(blank=True, default="")
+
+    class Meta:
+        unique_together = ("resource", "object_id")
+
+    def __str__(self) -> str:
+        return f"{self.resource} {self.object_id}"
+
+
+class ResourceVersion(models.Model):
+    resource = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=1)
+    updated_at = models.DateTimeField()
+
+    def __str__(self) -> str:
+        return f"{self.resource} v{self.version}"
+
+
+class OrderJob(models.Model):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [(PENDING, "Pending"), (RUNNING, "Running"), (SUCCEEDED, "Succeeded"), (FAILED, "Failed")]
+
+    idempotency_key = models.CharField(max_length=255, unique=True, null=True, blank=True)
+    fingerprint = models.CharField(max_length=64)
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    stage = models.CharField(max_length=20, blank=True, default="")
+    stage_timings = models.JSONField(blank=True, default=dict)
+    claim_token = models.CharField(max_length=32, blank=True, default="")
+    attempts = models.PositiveIntegerField(default=0)
+    order = models.ForeignKey(Order, on_delete=models.SET_NULL, null=True, blank=True, related_name="jobs")
+    error = models.TextField(blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self) -> str:
+        return f"Order job {self.pk} ({self.status})"
+
+
+class IdempotencyKey(models.Model):
+    key = models.CharField(max_length=255)
+    scope = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_data = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    response_headers = models.JSONField(blank=True, default=dict)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        unique_together = ("key", "scope")
+
+    def __str__(self) -> str:
+        return f"{self.scope} {self.key}"
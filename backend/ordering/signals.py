@@ -0,0 +1,218 @@
+from collections.abc import Callable, Iterable
+
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from ordering.infrastructure.assets import normalize_template_content
+from ordering.infrastructure.day_demand import (
+    DayDemandRefresher,
+    days_for_age_groups,
+    days_for_quantities,
+    days_for_recipes,
+)
+from ordering.infrastructure.search import SearchIndex, recipes_for_products
+from ordering.infrastructure.versions import bump_version
+from ordering.models import AgeGroup, Day, Product, ProductQuantity, Recipe, Template
+
+
+PENDING_DAYS_ATTRIBUTE = "_day_demand_pending_days"
+
+
+def _refresh(day_ids: set[int]) -> None:
+    if day_ids:
+        DayDemandRefresher().refresh_days(day_ids)
+
+
+def _stash_days(instance, day_ids: set[int]) -> None:
+    setattr(instance, PENDING_DAYS_ATTRIBUTE, day_ids)
+
+
+def _pop_stashed_days(instance) -> set[int]:
+    return instance.__dict__.pop(PENDING_DAYS_ATTRIBUTE, set())
+
+
+def _handle_membership_change(
+    instance,
+    action: str,
+    reverse: bool,
+    pk_set: set[int] | None,
+    affected_days: Callable[[Iterable[int]], set[int]],
+    related_source_ids: Callable[[], Iterable[int]],
+) -> None:
+    """Refreshes the days touched by an m2m change.
+
+    ``affected_days`` maps ids of the model declaring the m2m field to day ids.
+    A reverse ``clear()`` does not report which of those objects were unlinked,
+    so they are looked up before the rows disappear.
+    """
+    if action == "pre_clear" and reverse:
+        _stash_days(instance, affected_days(related_source_ids()))
+        return
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+
+    source_ids = (pk_set or ()) if reverse else (instance.pk,)
+    _refresh(affected_days(source_ids) | _pop_stashed_days(instance))
+
+
+@receiver(m2m_changed, sender=Day.recipes.through)
+def refresh_demand_on_day_recipes_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    _handle_membership_change(
+        instance,
+        action,
+        reverse,
+        pk_set,
+        affected_days=set,
+        related_source_ids=lambda: instance.days.values_list("id", flat=True),
+    )
+
+
+@receiver(m2m_changed, sender=Recipe.products.through)
+def refresh_demand_on_recipe_products_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    _handle_membership_change(
+        instance,
+        action,
+        reverse,
+        pk_set,
+        affected_days=days_for_recipes,
+        related_source_ids=lambda: instance.recipes.values_list("id", flat=True),
+    )
+
+
+@receiver(m2m_changed, sender=ProductQuantity.age_groups.through)
+def refresh_demand_on_quantity_age_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    _handle_membership_change(
+        instance,
+        action,
+        reverse,
+        pk_set,
+        affected_days=days_for_quantities,
+        related_source_ids=lambda: instance.product_quantities.values_list("id", flat=True),
+    )
+
+
+@receiver(post_save, sender=ProductQuantity)
+def refresh_demand_on_quantity_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _refresh(days_for_quantities([instance.pk]))
+
+
+@receiver(post_save, sender=AgeGroup)
+def refresh_demand_on_age_group_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        _refresh(days_for_age_groups([instance.pk]))
+
+
+@receiver(pre_delete, sender=AgeGroup)
+def stash_demand_days_on_age_group_delete(sender, instance, **kwargs):
+    _stash_days(instance, days_for_age_groups([instance.pk]))
+
+
+@receiver(pre_delete, sender=Recipe)
+def stash_demand_days_on_recipe_delete(sender, instance, **kwargs):
+    _stash_days(instance, days_for_recipes([instance.pk]))
+
+
+@receiver(post_delete, sender=AgeGroup)
+@receiver(post_delete, sender=Recipe)
+def refresh_demand_on_delete(sender, instance, **kwargs):
+    _refresh(_pop_stashed_days(instance))
+
+
+@receiver(pre_save, sender=Template)
+def extract_template_assets(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance.content = normalize_template_content(instance.content)
+
+
+PENDING_RECIPES_ATTRIBUTE = "_search_pending_recipes"
+
+
+@receiver(post_save, sender=Product)
+def index_product(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index = SearchIndex()
+        index.index("product", [instance.pk])
+        index.index("recipe", recipes_for_products([instance.pk]))
+
+
+@receiver(pre_delete, sender=Product)
+def stash_recipes_on_product_delete(sender, instance, **kwargs):
+    setattr(instance, PENDING_RECIPES_ATTRIBUTE, recipes_for_products([instance.pk]))
+
+
+@receiver(post_delete, sender=Product)
+def unindex_product(sender, instance, **kwargs):
+    index = SearchIndex()
+    index.remove("product", [instance.pk])
+    index.index("recipe", instance.__dict__.pop(PENDING_RECIPES_ATTRIBUTE, set()))
+
+
+@receiver(post_save, sender=Recipe)
+def index_recipe(sender, instance, raw=False, **kwargs):
+    if not raw:
+        SearchIndex().index("recipe", [instance.pk])
+
+
+@receiver(m2m_changed, sender=Recipe.products.through)
+def index_recipes_on_products_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        setattr(instance, PENDING_RECIPES_ATTRIBUTE, set(instance.recipes.values_list("id", flat=True)))
+        return
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+
+    recipe_ids = set(pk_set or ()) if reverse else {instance.pk}
+    SearchIndex().index("recipe", recipe_ids | instance.__dict__.pop(PENDING_RECIPES_ATTRIBUTE, set()))
+
+
+@receiver(post_save, sender=Template)
+def index_template(sender, instance, raw=False, **kwargs):
+    if not raw:
+        SearchIndex().index("template", [instance.pk])
+
+
+@receiver(post_delete, sender=Recipe)
+@receiver(post_delete, sender=Template)
+def unindex_on_delete(sender, instance, **kwargs):
+    SearchIndex().remove("recipe" if sender is Recipe else "template", [instance.pk])
+
+
+VERSIONED_RESOURCES = {
+    Product: "product",
+    AgeGroup: "age_group",
+    ProductQuantity: "product_quantity",
+    Recipe: "recipe",
+    Day: "day",
+    Template: "template",
+}
+
+VERSIONED_MEMBERSHIPS = {
+    Day.recipes.through: "day",
+    Recipe.products.through: "recipe",
+    ProductQuantity.age_groups.through: "product_quantity",
+}
+
+
+def bump_version_on_write(sender, raw=False, **kwargs):
+    if not raw:
+        bump_version(VERSIONED_RESOURCES[sender])
+
+
+def bump_version_on_membership_changed(sender, action, **kwargs):
+    if action in {"post_add", "post_remove", "post_clear"}:
+        bump_version(VERSIONED_MEMBERSHIPS[sender])
+
+
+for versioned_model in VERSIONED_RESOURCES:
+    post_save.connect(bump_version_on_write, sender=versioned_model, dispatch_uid=f"bump-version-save-{versioned_model.__name__}")
+    post_delete.connect(
+        bump_version_on_write, sender=versioned_model, dispatch_uid=f"bump-version-delete-{versioned_model.__name__}"
+    )
+
+for membership_model in VERSIONED_MEMBERSHIPS:
+    m2m_changed.connect(
+        bump_version_on_membership_changed,
+        sender=membership_model,
+        dispatch_uid=f"bump-version-m2m-{membership_model.__name__}",
+    )
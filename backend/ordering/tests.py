@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase
+
+from ordering.models import AgeGroup, Day, Product, ProductQuantity, Recipe
+
+
+PAGE_SIZES = (2, 5)
+
+
+class ListQueryCountTests(TestCase):
+    """Catalog list pages run a fixed number of queries whatever the page size and ``?expand=``.
+
+    The counts cover the version lookup of the response cache, the page count
+    and the page itself, plus one query per prefetched relation. A missing
+    ``field_prefetches``/``field_select_related`` entry adds queries per row,
+    so the larger page fails.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        age_groups = [AgeGroup.objects.create(name=f"Group {index}", quantity=10 + index) for index in range(3)]
+        products = []
+        for index in range(6):
+            product = Product.objects.create(name=f"Product {index}", category="A" if index % 2 else "B")
+            products.append(product)
+            for offset in range(2):
+                quantity = ProductQuantity.objects.create(
+                    product=product,
+                    unit_of_measure="g",
+                    quantity=offset + 1,
+                    package_type=str(offset + 1),
+                )
+                quantity.age_groups.set(age_groups[:offset + 2])
+        recipes = []
+        for index in range(6):
+            recipe = Recipe.objects.create(name=f"Recipe {index}")
+            recipe.products.set(products[index:index + 3])
+            recipes.append(recipe)
+        for index in range(6):
+            day = Day.objects.create(name=f"Day {index}")
+            day.recipes.set(recipes[index:index + 2])
+
+    def assertListQueries(self, num: int, path: str, expand: str | None = None) -> None:
+        for limit in PAGE_SIZES:
+            params = {"limit": limit, **({"expand": expand} if expand else {})}
+            # Rendered pages are cached by catalog version; measure the queryset and serializers.
+            caches[settings.API_CACHE_ALIAS].clear()
+            with self.subTest(path=path, expand=expand, limit=limit), self.assertNumQueries(num):
+                response = self.client.get(path, params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()["results"]), limit)
+
+    def test_products(self):
+        self.assertListQueries(3, "/api/products/")
+        self.assertListQueries(5, "/api/products/", expand="quantities")
+        self.assertListQueries(5, "/api/products/", expand="quantities.age_group_profiles")
+
+    def test_product_quantities(self):
+        self.assertListQueries(4, "/api/product-quantities/")
+        self.assertListQueries(4, "/api/product-quantities/", expand="age_group_profiles")
+
+    def test_recipes(self):
+        self.assertListQueries(4, "/api/recipes/")
+        self.assertListQueries(4, "/api/recipes/", expand="product_details")
+
+    def test_days(self):
+        self.assertListQueries(4, "/api/days/")
+        self.assertListQueries(5, "/api/days/", expand="recipe_details")
+        self.assertListQueries(5, "/api/days/", expand="recipe_details.product_details")
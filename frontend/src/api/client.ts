@@ -23,8 +23,21 @@ async function request<T>(path: string, options?: RequestInit): Promise<T> {
   return response.json() as Promise<T>;
 }
 
+async function requestText(path: string): Promise<string> {
+  const response = await fetch(`${API_BASE_URL}${path.startsWith("/") ? path : `/${path}`}`);
+
+  if (!response.ok) {
+    const errorBody = await response.json().catch(() => ({}));
+    const detail = errorBody?.detail ?? "Request failed";
+    throw new Error(detail);
+  }
+
+  return response.text();
+}
+
 export const apiClient = {
   get: <T>(path: string) => request<T>(path),
+  getText: (path: string) => requestText(path),
   post: <T>(path: string, body: unknown) =>
     request<T>(path, {
       method: "POST",
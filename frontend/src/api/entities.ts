@@ -19,6 +19,7 @@ interface ListParams {
   limit: number;
   offset: number;
   search?: string;
+  expand?: string[];
 }
 
 function toQuery(params: ListParams): string {
@@ -28,6 +29,9 @@ function toQuery(params: ListParams): string {
   if (params.search && params.search.trim() !== "") {
     query.set("search", params.search.trim());
   }
+  if (params.expand && params.expand.length > 0) {
+    query.set("expand", params.expand.join(","));
+  }
   return `?${query.toString()}`;
 }
 
@@ -64,7 +68,9 @@ export function deleteAgeGroup(id: number): Promise<void> {
 }
 
 export function listProductQuantities(params: ListParams): Promise<PaginatedResponse<ProductQuantity>> {
-  return apiClient.get<PaginatedResponse<ProductQuantity>>(`/product-quantities/${toQuery(params)}`);
+  return apiClient.get<PaginatedResponse<ProductQuantity>>(
+    `/product-quantities/${toQuery({ expand: ["age_group_profiles"], ...params })}`
+  );
 }
 
 export function createProductQuantity(payload: ProductQuantityPayload): Promise<ProductQuantity> {
@@ -83,7 +89,7 @@ export function deleteProductQuantity(id: number): Promise<void> {
 }
 
 export function listRecipes(params: ListParams): Promise<PaginatedResponse<Recipe>> {
-  return apiClient.get<PaginatedResponse<Recipe>>(`/recipes/${toQuery(params)}`);
+  return apiClient.get<PaginatedResponse<Recipe>>(`/recipes/${toQuery({ expand: ["product_details"], ...params })}`);
 }
 
 export function createRecipe(payload: RecipePayload): Promise<Recipe> {
@@ -99,7 +105,7 @@ export function deleteRecipe(id: number): Promise<void> {
 }
 
 export function listDays(params: ListParams): Promise<PaginatedResponse<Day>> {
-  return apiClient.get<PaginatedResponse<Day>>(`/days/${toQuery(params)}`);
+  return apiClient.get<PaginatedResponse<Day>>(`/days/${toQuery({ expand: ["recipe_details"], ...params })}`);
 }
 
 export function createDay(payload: DayPayload): Promise<Day> {
@@ -28,6 +28,11 @@ export async function generateOrder(payload: GenerateOrderPayload): Promise<{ or
   return apiClient.post<{ order_id: number }>("/orders/generate/", payload);
 }
 
+export async function getOrderDocument(id: number, language: string): Promise<string> {
+  const query = new URLSearchParams({ lang: language });
+  return apiClient.getText(`/orders/${id}/document/?${query.toString()}`);
+}
+
 export async function deleteOrder(id: number): Promise<void> {
   return apiClient.delete(`/orders/${id}/`);
 }
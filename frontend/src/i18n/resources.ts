@@ -122,7 +122,6 @@ export const resources = {
         viewDetail: "Previsualizar e imprimir",
         print: "Imprimir",
         printMissingTemplate: "La orden no tiene una minuta asignada.",
-        printTemplateNotFound: "No se encontro la minuta asignada para esta orden.",
         orderDetailTitle: "Detalle de orden",
         orderDetailWithName: "Detalle de orden: {{name}}",
         previewTitle: "Previsualizar minuta",
@@ -285,7 +284,6 @@ export const resources = {
         viewDetail: "Preview and print",
         print: "Print",
         printMissingTemplate: "Order has no assigned template.",
-        printTemplateNotFound: "Assigned template for this order was not found.",
         orderDetailTitle: "Order detail",
         orderDetailWithName: "Order detail: {{name}}",
         previewTitle: "Preview minuta",
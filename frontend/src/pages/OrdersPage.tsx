@@ -24,16 +24,16 @@ import {
 } from "@mui/material";
 import { useTranslation } from "react-i18next";
 
-import { deleteOrder, getDaysForSelection, generateOrder, getOrders } from "../api/orders";
+import { deleteOrder, getDaysForSelection, generateOrder, getOrderDocument, getOrders } from "../api/orders";
 import { listProducts, listTemplates } from "../api/entities";
 import { useAppSnackbar } from "../components/AppSnackbarProvider";
 import { PaginationControls } from "../components/PaginationControls";
-import { GenerateOrderPayload, Order, Template } from "../types/domain";
+import { GenerateOrderPayload, Order } from "../types/domain";
 
 const LIMIT = 10;
 
 export function OrdersPage() {
-  const { t } = useTranslation();
+  const { t, i18n } = useTranslation();
   const { showSnackbar } = useAppSnackbar();
   const queryClient = useQueryClient();
   const [offset, setOffset] = useState(0);
@@ -142,94 +142,19 @@ export function OrdersPage() {
       .replace(/'/g, "&#39;");
   }
 
-  function replaceAllTokens(content: string, token: string, value: string): string {
-    const pattern = new RegExp(`\\{\\{\\s*${token}\\s*\\}\\}`, "gi");
-    return content.replace(pattern, value);
-  }
-
-  function buildProductsTableHtml(order: Order): string {
-    const rows = order.products
-      // .map(
-      //   (product) => `
-      //     <tr>
-      //       <td>${escapeHtml(product.name)}</td>
-      //       <td>${escapeHtml(product.quantity)}</td>
-      //       <td>${escapeHtml(product.unit_of_measure)}</td>
-      //       <td>${escapeHtml(product.package_type)}</td>
-      //       <td>${product.total}</td>
-      //       <td>${product.qty_package}</td>
-      //     </tr>
-      //   `
-      // )
-      .map(
-        (product) => `
-          <tr>
-            <td>${product.package_type}</td>
-            <td>${escapeHtml(product.unit_of_measure)}</td>
-            <td>${product.qty_package}</td>
-            <td>${escapeHtml(product.name)}</td>
-            <td></td>
-            <td></td>
-          </tr>
-        `
-      )
-      .join("");
-
-    return `
-      <table>
-        <thead>
-          <tr>
-            <th>${escapeHtml(t("ordersPage.packageQuantity"))}</th>
-            <th>${escapeHtml(t("common.unit"))}</th>
-            <th>${escapeHtml(t("common.quantity"))}</th>
-            <th>${escapeHtml(t("common.product"))}</th>
-            <th>${escapeHtml(t("ordersPage.unitValue"))}</th>
-            <th>${escapeHtml(t("ordersPage.totalValue"))}</th>
-          </tr>
-        </thead>
-        <tbody>${rows}</tbody>
-      </table>
-    `;
-  }
-
-  function renderOrderTemplate(order: Order, template: Template): string {
-    const productNames = order.products.map((product) => escapeHtml(product.name)).join("<br/>");
-    const quantities = order.products.map((product) => escapeHtml(product.quantity)).join("<br/>");
-    const units = order.products.map((product) => escapeHtml(product.unit_of_measure)).join("<br/>");
-    const categories = order.products.map(() => "-").join("<br/>");
-    const productsTable = buildProductsTableHtml(order);
-
-    let rendered = template.content;
-    rendered = replaceAllTokens(rendered, "nombre_orden", escapeHtml(order.name));
-    rendered = replaceAllTokens(rendered, "fecha", escapeHtml(order.date));
-    rendered = replaceAllTokens(rendered, "nombre_producto", productNames);
-    rendered = replaceAllTokens(rendered, "cantidad", quantities);
-    rendered = replaceAllTokens(rendered, "unidad", units);
-    rendered = replaceAllTokens(rendered, "categoria", categories);
-    rendered = replaceAllTokens(rendered, "tabla_productos", productsTable);
-    return rendered;
-  }
-
-  function getRenderedOrderTemplate(order: Order): string | null {
+  async function openOrderPreview(order: Order) {
     if (!order.template) {
       showSnackbar(t("ordersPage.printMissingTemplate"), "error");
-      return null;
-    }
-    const selectedTemplate = (templatesData?.results ?? []).find((template) => template.id === order.template);
-    if (!selectedTemplate) {
-      showSnackbar(t("ordersPage.printTemplateNotFound"), "error");
-      return null;
+      return;
     }
 
-    return renderOrderTemplate(order, selectedTemplate);
-  }
-
-  function openOrderPreview(order: Order) {
-    const renderedContent = getRenderedOrderTemplate(order);
-    if (!renderedContent) return;
-
-    setPreviewOrder(order);
-    setPreviewContent(renderedContent);
+    try {
+      const renderedContent = await getOrderDocument(order.id, i18n.language);
+      setPreviewOrder(order);
+      setPreviewContent(renderedContent);
+    } catch (error) {
+      showSnackbar(getErrorMessage(error), "error");
+    }
   }
 
   function printHtml(title: string, htmlContent: string) {
@@ -19,7 +19,7 @@ export interface Product {
   id: number;
   name: string;
   category: string;
-  quantities: ProductQuantity[];
+  quantities?: ProductQuantity[];
 }
 
 export interface ProductSummary {
@@ -50,7 +50,7 @@ export interface OrderProduct {
   quantity: string;
   total: number;
   qty_package: number;
-  detail: string;
+  detail?: string;
 }
 
 export interface Order {